@@ -0,0 +1,107 @@
+import pygame
+
+# numpy is only needed for the fast surfarray fill; without it gradients are
+# still cached, they are just rendered line by line the first time
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy = None
+    numpy_available = False
+
+# Rendered gradients, keyed by (size, colour stops, direction)
+_gradient_cache = {}
+
+
+def _gradient_colors(length, stops):
+    """
+    Return a list of `length` RGB tuples running through the colour stops.
+
+    Row y gets the colour at position y / length, matching the int() truncation of
+    the per-line gradients the screens used to draw.
+    """
+    segments = len(stops) - 1
+    colors = []
+    for i in range(length):
+        position = i / length * segments
+        index = min(int(position), segments - 1)
+        frac = position - index
+        start, end = stops[index], stops[index + 1]
+        colors.append(tuple(int(start[c] + (end[c] - start[c]) * frac) for c in range(3)))
+    return colors
+
+
+def _gradient_array(length, stops):
+    """
+    Vectorised version of _gradient_colors(): returns a (length, 3) uint8 array.
+    """
+    segments = len(stops) - 1
+    stops_array = numpy.array(stops, dtype=numpy.float64)
+    position = numpy.arange(length, dtype=numpy.float64) / length * segments
+    index = numpy.minimum(position.astype(numpy.int64), segments - 1)
+    frac = (position - index)[:, numpy.newaxis]
+    colors = stops_array[index] + (stops_array[index + 1] - stops_array[index]) * frac
+    return colors.astype(numpy.uint8)
+
+
+def _render_gradient(size, stops, direction):
+    width, height = size
+    vertical = direction == "vertical"
+    length = height if vertical else width
+    surface = pygame.Surface(size)
+
+    if numpy_available:
+        colors = _gradient_array(length, stops)
+        pixels = pygame.surfarray.pixels3d(surface)
+        if vertical:
+            pixels[:, :, :] = colors[numpy.newaxis, :, :]
+        else:
+            pixels[:, :, :] = colors[:, numpy.newaxis, :]
+        del pixels  # Release the surface lock
+    else:
+        for i, color in enumerate(_gradient_colors(length, stops)):
+            if vertical:
+                pygame.draw.line(surface, color, (0, i), (width, i))
+            else:
+                pygame.draw.line(surface, color, (i, 0), (i, height))
+
+    # Match the display format so blitting the background is a straight copy
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+
+def get_gradient(size, stops, direction="vertical"):
+    """
+    Return a pre-rendered gradient background, rendering it only on first use.
+
+    The same Surface is handed to every caller asking for the same gradient, so it
+    must be treated as read-only: blit it, never draw onto it.
+
+    Parameters:
+    - size: (width, height) of the background
+    - stops: sequence of two or more RGB colours, evenly spaced from top to bottom
+      (or left to right)
+    - direction: "vertical" or "horizontal"
+
+    Returns:
+    - pygame.Surface with the gradient
+    """
+    if direction not in ("vertical", "horizontal"):
+        raise ValueError(f"Unknown gradient direction: {direction}")
+    if len(stops) < 2:
+        raise ValueError("A gradient needs at least two colour stops")
+
+    key = (tuple(size), tuple(tuple(color[:3]) for color in stops), direction)
+    surface = _gradient_cache.get(key)
+    if surface is None:
+        surface = _render_gradient(key[0], key[1], direction)
+        _gradient_cache[key] = surface
+    return surface
+
+
+def clear_cache():
+    """
+    Drop every cached gradient (e.g. after the display mode changed).
+    """
+    _gradient_cache.clear()
@@ -0,0 +1,111 @@
+import time
+import threading
+
+
+class BackgroundJob:
+    """
+    BackgroundJob runs a screen's slow preparation steps (file reads, database
+    queries, chart rendering) on a background thread, so the screen can show its
+    first frame at once and fill in each result as it arrives.
+
+    Steps run in order. Each is called with the results of the steps before it, and
+    its return value is published in `results` as soon as it completes. A failing
+    step is reported and recorded in `errors`; the steps after it still run and see
+    no result for it. cancel() skips the steps not started yet, except the essential
+    ones (e.g. saving the player's results); a step already running is finished.
+
+    Attributes:
+    - name: str, name of the thread and prefix of the messages
+    - results: dict, step name -> return value of every step that completed
+    - errors: dict, step name -> Exception of every step that failed
+    - timings: dict, step name -> milliseconds from start() until the step ended
+    - finished: bool, True once the job has ended (completed or cancelled)
+    """
+
+    def __init__(self, steps, name="BackgroundJob", essential=()):
+        """
+        Parameters:
+        - steps: list of (name, function) pairs; function(results) returns the step's result
+        - name: str, name of the thread and prefix of the messages
+        - essential: iterable of step names that still run after cancel()
+        """
+        self.steps = list(steps)
+        self.name = name
+        self.essential = set(essential)
+        self.results = {}
+        self.errors = {}
+        self.timings = {}
+        self.finished = False
+        self._cancelled = threading.Event()
+        self._thread = None
+        self._started = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def start(self):
+        """
+        Run the steps on a background thread and return at once.
+        """
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """
+        Skip the remaining steps that are not essential.
+        """
+        self._cancelled.set()
+
+    def wait(self, timeout=None):
+        """
+        Wait for a background job to end.
+
+        Returns:
+        - bool, True if the job has ended
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.finished
+
+    def done(self, step):
+        """
+        Return True once `step` has completed or failed.
+        """
+        return step in self.results or step in self.errors
+
+    def elapsed_ms(self):
+        """
+        Return the milliseconds since start() (or since run() was called directly).
+        """
+        return (time.perf_counter() - self._started) * 1000 if self._started is not None else 0.0
+
+    def run(self):
+        """
+        Run the steps on the calling thread.
+
+        Returns:
+        - bool, True if every step ran and none failed
+        """
+        if self._started is None:
+            self._started = time.perf_counter()
+        try:
+            for step, function in self.steps:
+                if self._cancelled.is_set() and step not in self.essential:
+                    continue
+                try:
+                    # Passed a copy: the caller's thread reads `results` while this one writes it
+                    self.results[step] = function(dict(self.results))
+                except Exception as e:
+                    self.errors[step] = e
+                    print(f"[{self.name}] Error in step {step}: {e}")
+                self.timings[step] = self.elapsed_ms()
+        finally:
+            self.finished = True
+        return not self.errors and len(self.results) == len(self.steps)
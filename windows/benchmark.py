@@ -0,0 +1,524 @@
+import os
+import sys
+
+# Every screen runs headless; SDL reads these when pygame initialises
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import json
+import math
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import time
+import tracemalloc
+
+import pygame
+
+import frame_scheduler
+from scene_router import BASE_DIR, SceneRouter
+
+# peak RSS comes from the resource module, which does not exist on Windows
+try:
+    import resource
+    resource_available = True
+except ImportError:
+    resource = None
+    resource_available = False
+
+# Game levels, the screens the benchmark exists for
+GAME_SCREENS = [
+    "memorymathl1.py", "memorymathl2.py", "memorymathl3.py",
+    "carparkingl1.py", "carparkingl2.py", "carparkingl3.py",
+    "footballquizl1.py", "footballquizl2.py", "footballquizl3.py",
+    "wordbuilderl1.py", "wordbuilderl2.py", "wordbuilderl3.py",
+    "englishprol1.py", "englishprol2.py", "englishprol3.py",
+]
+
+# Menus, instructions and summaries (view_rankings_parent.py is an empty file, so left out)
+MENU_SCREENS = [
+    "login_screen.py", "main_screen.py", "student_rankings.py",
+    "teacher_login.py", "teacher_main.py", "student_details.py", "view_rankings_teacher.py",
+    "parent_login.py", "parent_main.py",
+    "memorymath_instructions.py", "carparking_instructions.py", "footballquiz_instructions.py",
+    "wordbuilder_instructions.py", "englishpro_instructions.py",
+    "memorymath_summery.py", "carparking_summary.py", "footballquiz_summary.py",
+    "wordbuilder_summary.py", "englishpro_summary.py", "final_summary.py",
+]
+
+TEACHER_SCREENS = {"teacher_main.py", "student_details.py", "view_rankings_teacher.py"}
+PARENT_SCREENS = {"parent_main.py"}
+
+DEFAULT_FRAMES = 300
+WARMUP_FRAMES = 10
+DEFAULT_SEED = 1234
+BASELINE_FILE = "benchmark_baseline.json"
+
+# A metric regresses when it grows by more than this fraction of its baseline
+REGRESSION_THRESHOLD = 0.10
+
+# Metrics checked by --compare (all of them: lower is better)
+COMPARED_METRICS = ["mean_ms", "p95_ms", "p99_ms", "update_ms", "draw_ms", "alloc_peak_kb", "peak_rss_kb"]
+
+# A screen that keeps navigating away is restarted at most this many times
+MAX_RESTARTS = 200
+
+
+class BenchmarkDone(BaseException):
+    """
+    Raised from the frame hook once enough frames were recorded.
+
+    Derived from BaseException so that the screens' own `except Exception` blocks
+    cannot swallow it.
+    """
+
+
+class ScriptedInput:
+    """
+    ScriptedInput produces a seeded, reproducible stream of mouse and key events.
+
+    The pointer wanders across the screen, now and then clicking, scrolling or typing
+    digits, letters, Enter and Backspace, which is enough to reach hover effects, card
+    flips, typed answers and car moves on every screen.
+
+    Attributes:
+    - pos: (x, y) position of the scripted pointer
+    """
+
+    KEYS = ([(getattr(pygame, f"K_{d}"), d) for d in "0123456789"]
+            + [(getattr(pygame, f"K_{c}"), c) for c in "abcdefghijklmnopqrstuvwxyz"]
+            + [(pygame.K_RETURN, "\r"), (pygame.K_BACKSPACE, "\b"), (pygame.K_SPACE, " "),
+               (pygame.K_LEFT, ""), (pygame.K_RIGHT, ""), (pygame.K_UP, ""), (pygame.K_DOWN, "")])
+
+    def __init__(self, seed, size=(800, 600)):
+        """
+        Parameters:
+        - seed: int, seed of the event stream
+        - size: (width, height) of the screen
+        """
+        self.random = random.Random(seed)
+        self.size = size
+        self.pos = (size[0] // 2, size[1] // 2)
+
+    def get_pos(self):
+        """
+        Stand-in for pygame.mouse.get_pos(), which always reports (0, 0) headless.
+        """
+        return self.pos
+
+    def next_events(self):
+        """
+        Return the events for the next frame.
+        """
+        rng = self.random
+        events = []
+
+        if rng.random() < 0.6:
+            width, height = self.size
+            if rng.random() < 0.1:
+                new_pos = (rng.randrange(width), rng.randrange(height))
+            else:
+                new_pos = (min(width - 1, max(0, self.pos[0] + rng.randint(-40, 40))),
+                           min(height - 1, max(0, self.pos[1] + rng.randint(-40, 40))))
+            rel = (new_pos[0] - self.pos[0], new_pos[1] - self.pos[1])
+            self.pos = new_pos
+            events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=new_pos, rel=rel, buttons=(0, 0, 0)))
+
+        roll = rng.random()
+        if roll < 0.04:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=self.pos, button=1))
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=self.pos, button=1))
+        elif roll < 0.06:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=self.pos, button=rng.choice((4, 5))))
+        elif roll < 0.16:
+            key, char = rng.choice(self.KEYS)
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=char, mod=0, scancode=0))
+            events.append(pygame.event.Event(pygame.KEYUP, key=key, unicode=char, mod=0, scancode=0))
+        return events
+
+
+class FrameRecorder:
+    """
+    FrameRecorder is installed as the frame hook of frame_scheduler and times frames.
+
+    Each FrameScheduler.tick() ends a frame. Instead of waiting for the next one, the
+    recorder stores how long the frame took, posts the scripted events for the next
+    frame and returns at once, so screens run as fast as they can. A frame is split
+    into draw time, from FrameScheduler.mark_draw() (or the display update when the
+    screen has no marker) to the end of the display update, and update time, the rest.
+
+    Attributes:
+    - frame_ms, update_ms, draw_ms: lists of per-frame timings in ms, after warmup
+    - skipped_delay_ms: int, total pygame.time.delay()/wait() time skipped
+    """
+
+    def __init__(self, script, frames, warmup=WARMUP_FRAMES):
+        """
+        Parameters:
+        - script: ScriptedInput feeding the screens
+        - frames: int, number of frames to record
+        - warmup: int, number of frames run before recording starts
+        """
+        self.script = script
+        self.frames = frames
+        self.warmup = warmup
+        self.frame_ms = []
+        self.update_ms = []
+        self.draw_ms = []
+        self.skipped_delay_ms = 0
+        self.seen = 0
+        self._frame_start = None
+        self._draw_start = None
+        self._present_start = None
+        self._present_end = None
+
+    def begin_scene(self):
+        """
+        Forget the partial frame of a scene that navigated away.
+        """
+        self._frame_start = None
+
+    # ----- Frame hook -----
+
+    def tick(self, scheduler, animating):
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._record(now)
+        if len(self.frame_ms) >= self.frames:
+            raise BenchmarkDone()
+
+        for event in self.script.next_events():
+            pygame.event.post(event)
+
+        self._draw_start = None
+        self._present_start = None
+        self._present_end = None
+        self._frame_start = time.perf_counter()
+        # Report a nominal frame time so time-based game logic advances the same on every run
+        return 1000 // scheduler.fps
+
+    def mark_draw(self, scheduler):
+        if self._draw_start is None:
+            self._draw_start = time.perf_counter()
+
+    def _record(self, now):
+        frame = now - self._frame_start
+        draw = 0.0
+        if self._present_end is not None:
+            start = self._draw_start
+            if start is None or start > self._present_end:
+                start = self._present_start
+            draw = self._present_end - start
+
+        self.seen += 1
+        if self.seen <= self.warmup:
+            return
+        self.frame_ms.append(frame * 1000)
+        self.draw_ms.append(draw * 1000)
+        self.update_ms.append((frame - draw) * 1000)
+
+    # ----- pygame stand-ins -----
+
+    def wrap_present(self, present):
+        """
+        Wrap pygame.display.flip/update so the recorder knows when a frame is shown.
+        """
+        def timed_present(*args, **kwargs):
+            start = time.perf_counter()
+            if self._present_start is None:
+                self._present_start = start
+            result = present(*args, **kwargs)
+            self._present_end = time.perf_counter()
+            return result
+        return timed_present
+
+    def skip_delay(self, milliseconds):
+        """
+        Stand-in for pygame.time.delay()/wait(): scripted pauses are skipped.
+        """
+        self.skipped_delay_ms += int(milliseconds)
+        return 0
+
+
+def percentile(values, fraction):
+    """
+    Return the `fraction` percentile of `values` (nearest rank).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_kb():
+    """
+    Return the peak resident set size of this process in KB, or None if unknown.
+    """
+    if not resource_available:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def prepare_session(session, screen):
+    """
+    Log in whoever the screen expects to find in the session.
+    """
+    if screen in TEACHER_SCREENS:
+        session.login_teacher("benchmark")
+    elif screen in PARENT_SCREENS:
+        session.login_parent("benchmark", "Benchmark", "Level 1")
+    else:
+        session.login_student({"name": "Benchmark", "level": "Level 1 - Beginner", "icon": None})
+
+
+def run_worker(screen, workdir, frames, warmup, seed, allocations):
+    """
+    Benchmark a single screen in this process.
+
+    Parameters:
+    - screen: str, screen script (e.g. "memorymathl1.py")
+    - workdir: str, copy of the game directory to run in
+    - frames: int, number of frames to record
+    - warmup: int, number of frames run before recording starts
+    - seed: int, seed for the scripted input and the game's own random choices
+    - allocations: bool, trace Python allocations (slows the screen down)
+
+    Returns:
+    - dict of results for the screen
+    """
+    script = ScriptedInput(seed)
+    recorder = FrameRecorder(script, frames, warmup)
+    router = SceneRouter(base_dir=workdir)
+    prepare_session(router.session, screen)
+    router.start()
+
+    pygame.mouse.get_pos = script.get_pos
+    pygame.display.flip = recorder.wrap_present(pygame.display.flip)
+    pygame.display.update = recorder.wrap_present(pygame.display.update)
+    pygame.time.delay = recorder.skip_delay
+    pygame.time.wait = recorder.skip_delay
+    frame_scheduler.set_frame_hook(recorder)
+
+    if allocations:
+        tracemalloc.start()
+    restarts = 0
+    started = time.perf_counter()
+    try:
+        while restarts <= MAX_RESTARTS:
+            # Seed the game's own random choices (cards, questions, words) as well
+            random.seed(seed + restarts)
+            recorder.begin_scene()
+            try:
+                router.run_scene(screen)
+            except BenchmarkDone:
+                break
+            if recorder.seen == 0:
+                raise RuntimeError(f"{screen} ended before its first frame")
+            restarts += 1
+    finally:
+        frame_scheduler.set_frame_hook(None)
+        alloc_current, alloc_peak = tracemalloc.get_traced_memory() if allocations else (0, 0)
+        if allocations:
+            tracemalloc.stop()
+        router.stop()
+
+    frame_ms = recorder.frame_ms
+    return {
+        "frames": len(frame_ms),
+        "restarts": restarts,
+        "wall_s": round(time.perf_counter() - started, 3),
+        "mean_ms": round(sum(frame_ms) / len(frame_ms), 4) if frame_ms else 0.0,
+        "p95_ms": round(percentile(frame_ms, 0.95), 4),
+        "p99_ms": round(percentile(frame_ms, 0.99), 4),
+        "max_ms": round(max(frame_ms), 4) if frame_ms else 0.0,
+        "update_ms": round(sum(recorder.update_ms) / len(frame_ms), 4) if frame_ms else 0.0,
+        "draw_ms": round(sum(recorder.draw_ms) / len(frame_ms), 4) if frame_ms else 0.0,
+        "skipped_delay_ms": recorder.skipped_delay_ms,
+        "alloc_peak_kb": round(alloc_peak / 1024, 1) if allocations else None,
+        "alloc_current_kb": round(alloc_current / 1024, 1) if allocations else None,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def run_screen(screen, workdir, frames, warmup, seed, allocations):
+    """
+    Benchmark a screen in fresh worker processes, so every screen starts from a clean
+    pygame and its peak RSS is its own.
+
+    Timing comes from a run without tracemalloc; allocations, when requested, from a
+    second identical run with it.
+    """
+    def worker(trace):
+        fd, result_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        command = [sys.executable, os.path.abspath(__file__), "--worker", screen,
+                   "--workdir", workdir, "--frames", str(frames), "--warmup", str(warmup),
+                   "--seed", str(seed), "--result", result_path]
+        if trace:
+            command.append("--allocations")
+        try:
+            completed = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            if completed.returncode != 0:
+                return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip()
+                        else f"worker exited with {completed.returncode}"}
+            with open(result_path, "r") as f:
+                return json.load(f)
+        finally:
+            os.remove(result_path)
+
+    result = worker(False)
+    if allocations and "error" not in result:
+        traced = worker(True)
+        result["alloc_peak_kb"] = traced.get("alloc_peak_kb")
+        result["alloc_current_kb"] = traced.get("alloc_current_kb")
+    return result
+
+
+def run_benchmark(screens, frames, warmup, seed, allocations):
+    """
+    Benchmark `screens` and return the results as a dict ready to be saved as JSON.
+    """
+    # Screens write score files and the database; keep the real ones untouched
+    workdir = tempfile.mkdtemp(prefix="skillscape_bench_")
+    try:
+        shutil.copytree(BASE_DIR, workdir, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns("__pycache__", "*.pyc", "session_snapshot.json"))
+        results = {}
+        for screen in screens:
+            print(f"[Benchmark] {screen} ...", end=" ", flush=True)
+            result = run_screen(screen, workdir, frames, warmup, seed, allocations)
+            results[screen] = result
+            if "error" in result:
+                print(f"error: {result['error']}")
+            else:
+                print(f"mean {result['mean_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+                      f"p99 {result['p99_ms']:.2f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "frames": frames,
+            "warmup": warmup,
+            "seed": seed,
+            "allocations": allocations,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "screens": results,
+    }
+
+
+def compare_results(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare two benchmark results.
+
+    Returns:
+    - list of (screen, metric, baseline value, current value, relative change) for
+      every metric that grew by more than `threshold`
+    """
+    regressions = []
+    for screen, result in current["screens"].items():
+        base = baseline["screens"].get(screen)
+        if base is None or "error" in base or "error" in result:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change > threshold:
+                regressions.append((screen, metric, old, new, change))
+    return regressions
+
+
+def print_comparison(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """
+    Print the mean frame time of every screen next to its baseline and list the
+    regressions. Returns the regressions.
+    """
+    print(f"{'screen':<30}{'baseline ms':>14}{'current ms':>14}{'change':>10}")
+    for screen, result in current["screens"].items():
+        base = baseline["screens"].get(screen)
+        if base is None or "error" in base or "error" in result or not base.get("mean_ms"):
+            continue
+        change = (result["mean_ms"] - base["mean_ms"]) / base["mean_ms"]
+        print(f"{screen:<30}{base['mean_ms']:>14.3f}{result['mean_ms']:>14.3f}{change:>+10.1%}")
+
+    regressions = compare_results(baseline, current, threshold)
+    if regressions:
+        print(f"\n[Benchmark] {len(regressions)} regression(s) above {threshold:.0%}:")
+        for screen, metric, old, new, change in regressions:
+            print(f"  {screen}: {metric} {old} -> {new} ({change:+.1%})")
+    else:
+        print(f"\n[Benchmark] No regressions above {threshold:.0%}")
+    return regressions
+
+
+def main():
+    """
+    Usage:
+      python benchmark.py [screens...] [--frames N] [--seed S] [--output FILE]
+      python benchmark.py [screens...] --compare BASELINE [--threshold 0.1]
+      python benchmark.py --compare BASELINE --current RESULTS
+
+    Without screens the game levels are benchmarked; --all adds the menus,
+    instructions and summaries. Exits with status 1 when --compare finds regressions.
+    """
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmark for the SkillScape screens")
+    parser.add_argument("screens", nargs="*", help="screen scripts to benchmark (default: all game levels)")
+    parser.add_argument("--all", action="store_true", help="also benchmark menus, instructions and summaries")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--warmup", type=int, default=WARMUP_FRAMES)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--no-allocations", dest="allocations", action="store_false",
+                        help="skip the tracemalloc run")
+    parser.add_argument("--output", help=f"write the results to this file (default: {BASELINE_FILE} "
+                                         f"unless --compare is given)")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved baseline")
+    parser.add_argument("--current", metavar="RESULTS", help="with --compare: saved results to compare "
+                                                             "instead of running the benchmark")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    # Internal: run one screen in this process
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    parser.add_argument("--allocations", dest="trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_worker(args.worker, args.workdir, args.frames, args.warmup, args.seed, args.trace)
+        with open(args.result, "w") as f:
+            json.dump(result, f)
+        return 0
+
+    if args.current:
+        with open(args.current, "r") as f:
+            current = json.load(f)
+    else:
+        screens = args.screens or (GAME_SCREENS + MENU_SCREENS if args.all else GAME_SCREENS)
+        current = run_benchmark(screens, args.frames, args.warmup, args.seed, args.allocations)
+        output = args.output or (None if args.compare else BASELINE_FILE)
+        if output:
+            with open(output, "w") as f:
+                json.dump(current, f, indent=2)
+            print(f"[Benchmark] Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        if print_comparison(baseline, current, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
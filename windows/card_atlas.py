@@ -0,0 +1,236 @@
+import math
+
+import pygame
+
+from text_cache import render_text
+
+# Card palette shared by the Memory Math levels
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+BLUE = (50, 150, 255)
+LIGHT_BLUE = (100, 200, 255)
+DARK_BLUE = (20, 60, 120)
+DARK_GRAY = (100, 100, 100)
+GREEN = (50, 200, 50)
+
+# Offset of the drop shadow drawn below and to the right of every card
+SHADOW_OFFSET = 4
+
+# Degrees the flip animation advances per frame (Card.flip_speed)
+FLIP_SPEED = 15
+
+
+def flip_widths(width, flip_speed=FLIP_SPEED):
+    """
+    Return the card widths the flip animation passes through.
+
+    The animation draws the card at width * |cos(progress)| for progress = 0,
+    flip_speed, 2 * flip_speed, ... below 180 degrees, so only a handful of widths
+    ever occur.
+    """
+    return sorted({max(1, int(width * abs(math.cos(math.radians(progress)))))
+                   for progress in range(0, 180, flip_speed)})
+
+
+class CardAtlas:
+    """
+    CardAtlas pre-renders every card face of a Memory Math board.
+
+    Drawing a card used to allocate alpha surfaces, draw gradient strips and render
+    the problem text for every card on every frame. The atlas renders each face once,
+    keyed by (problem, colours, state), together with the few narrowed frames the flip
+    animation needs, so drawing a card is a single blit.
+
+    Sprites include the drop shadow, so they are SHADOW_OFFSET pixels wider and taller
+    than the card and are blitted at the card's top-left corner. They are shared and
+    must be treated as read-only.
+
+    Attributes:
+    - width: int, card width
+    - height: int, card height
+    - sprites: dict, (problem, colours, state) -> full-size sprite
+    - flip_frames: dict, (problem, colours, face, width) -> narrowed sprite
+    """
+
+    def __init__(self, width, height, font, big_font, flip_speed=FLIP_SPEED):
+        """
+        Parameters:
+        - width: int, card width
+        - height: int, card height
+        - font: pygame.font.Font for the problem text and the match checkmark
+        - big_font: pygame.font.Font for the "?" on the card back
+        - flip_speed: int, degrees the flip animation advances per frame
+        """
+        self.width = width
+        self.height = height
+        self.font = font
+        self.big_font = big_font
+        self.flip_speed = flip_speed
+        self.sprites = {}
+        self.flip_frames = {}
+        self._faces = {}
+
+    def build(self, cards):
+        """
+        Pre-render every state and flip frame for the cards of a new board.
+
+        Parameters:
+        - cards: list of Card, each with `problem`, `color` and `light_color`
+        """
+        self.sprites.clear()
+        self.flip_frames.clear()
+        self._faces.clear()
+        for card in cards:
+            colors = (card.color, card.light_color)
+            for state in ("front", "back", "matched"):
+                self.get(card.problem, colors, state)
+            for width in flip_widths(self.width, self.flip_speed):
+                self.get_flip_frame(card.problem, colors, "front", width)
+                self.get_flip_frame(card.problem, colors, "back", width)
+
+    def get(self, problem, colors, state):
+        """
+        Return the full-size sprite of a card.
+
+        Parameters:
+        - problem: str, problem shown on the card front
+        - colors: (color, light_color) of the card front gradient
+        - state: "front", "back" or "matched"
+        """
+        # Every card back looks the same, so they share one sprite
+        key = ("back",) if state == "back" else (problem, colors, state)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self._compose(self._face(problem, colors, state), self.width)
+            self.sprites[key] = sprite
+        return sprite
+
+    def get_flip_frame(self, problem, colors, face, width):
+        """
+        Return the sprite of a card narrowed to `width` during the flip animation.
+
+        Parameters:
+        - problem: str, problem shown on the card front
+        - colors: (color, light_color) of the card front gradient
+        - face: "front" or "back"
+        - width: int, visible width of the card in this frame
+        """
+        if width >= self.width:
+            return self.get(problem, colors, face)
+        key = ("back", width) if face == "back" else (problem, colors, face, width)
+        frame = self.flip_frames.get(key)
+        if frame is None:
+            face_surface = self._face(problem, colors, face)
+            frame = self._compose(pygame.transform.smoothscale(face_surface, (width, self.height)), width)
+            self.flip_frames[key] = frame
+        return frame
+
+    # ----- Rendering -----
+
+    def _finish(self, surface):
+        # Match the display format so blitting the sprite is as cheap as possible
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface
+
+    def _face(self, problem, colors, state):
+        """
+        Return the card face without its shadow, rendering it on first use.
+        """
+        key = ("back",) if state == "back" else (problem, colors, state)
+        face = self._faces.get(key)
+        if face is None:
+            if state == "back":
+                face = self._render_back()
+            elif state == "matched":
+                face = self._render_matched(problem, colors)
+            else:
+                face = self._render_front(problem, colors)
+            self._faces[key] = face
+        return face
+
+    def _compose(self, face, width):
+        """
+        Put a face of the given width on top of its drop shadow.
+        """
+        sprite = pygame.Surface((width + SHADOW_OFFSET, self.height + SHADOW_OFFSET), pygame.SRCALPHA)
+        # Narrow flip frames are drawn without a shadow, as before
+        if width > 10:
+            shadow_rect = pygame.Rect(SHADOW_OFFSET, SHADOW_OFFSET, width, self.height)
+            pygame.draw.rect(sprite, DARK_GRAY, shadow_rect, border_radius=10)
+        sprite.blit(face, (0, 0))
+        return self._finish(sprite)
+
+    def _render_front(self, problem, colors):
+        # Card front with a gradient in the card's colours
+        color, light_color = colors
+        width, height = self.width, self.height
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+
+        for i in range(5):
+            blend_factor = i / 5
+            strip_color = (
+                int(color[0] * (1 - blend_factor) + light_color[0] * blend_factor),
+                int(color[1] * (1 - blend_factor) + light_color[1] * blend_factor),
+                int(color[2] * (1 - blend_factor) + light_color[2] * blend_factor)
+            )
+            inner_rect = pygame.Rect(0, i * height // 5, width, height // 5)
+            pygame.draw.rect(surface, strip_color, inner_rect, border_radius=10)
+
+        # Draw border
+        pygame.draw.rect(surface, BLACK, surface.get_rect(), width=2, border_radius=10)
+
+        # Slightly transparent white background for the text
+        text_bg_width = width - 20
+        text_bg_height = 40
+        text_bg_rect = pygame.Rect((width - text_bg_width) // 2, (height - text_bg_height) // 2,
+                                   text_bg_width, text_bg_height)
+        s = pygame.Surface((text_bg_width, text_bg_height), pygame.SRCALPHA)
+        s.fill((255, 255, 255, 220))
+        surface.blit(s, text_bg_rect)
+        pygame.draw.rect(surface, BLACK, text_bg_rect, width=1, border_radius=5)
+
+        # Draw problem text
+        text = render_text(self.font, problem, True, BLACK)
+        surface.blit(text, text.get_rect(center=(width // 2, height // 2)))
+        return surface
+
+    def _render_back(self):
+        # Card back with a blue gradient and a "?"
+        width, height = self.width, self.height
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+
+        for i in range(5):
+            blend_factor = i / 5
+            strip_color = (
+                int(DARK_BLUE[0] * (1 - blend_factor) + BLUE[0] * blend_factor),
+                int(DARK_BLUE[1] * (1 - blend_factor) + BLUE[1] * blend_factor),
+                int(DARK_BLUE[2] * (1 - blend_factor) + BLUE[2] * blend_factor)
+            )
+            inner_rect = pygame.Rect(0, i * height // 5, width, height // 5)
+            pygame.draw.rect(surface, strip_color, inner_rect, border_radius=10)
+
+        # Draw a border around the card
+        pygame.draw.rect(surface, BLACK, surface.get_rect(), width=2, border_radius=10)
+
+        # Inner border
+        margin = 10
+        inner_rect = pygame.Rect(margin, margin, width - 2 * margin, height - 2 * margin)
+        pygame.draw.rect(surface, LIGHT_BLUE, inner_rect, width=2, border_radius=5)
+
+        # Draw "?" in the center
+        q_text = render_text(self.big_font, "?", True, WHITE)
+        surface.blit(q_text, q_text.get_rect(center=(width // 2, height // 2)))
+        return surface
+
+    def _render_matched(self, problem, colors):
+        # Card front with a green tint and a checkmark
+        surface = self._render_front(problem, colors)
+
+        s = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        s.fill((100, 255, 100, 128))  # Semi-transparent green
+        surface.blit(s, (0, 0))
+
+        check_text = render_text(self.font, "✓", True, GREEN)
+        surface.blit(check_text, check_text.get_rect(center=(self.width - 20, self.height - 20)))
+        return surface
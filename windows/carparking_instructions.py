@@ -1,6 +1,10 @@
 import pygame
 import sys
-import os
+from scene_router import navigate
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from dirty_rects import DirtyRenderer
 
 # Constants
 SCREEN_WIDTH = 800
@@ -28,10 +32,10 @@ def show_instructions(screen):
     bool: Whether to start the game (True) or quit (False)
     """
     # Prepare fonts
-    title_font = pygame.font.SysFont('Arial', 48, bold=True)
-    heading_font = pygame.font.SysFont('Arial', 32, bold=True)
-    font = pygame.font.SysFont('Arial', 24)
-    small_font = pygame.font.SysFont('Arial', 20)
+    title_font = get_font('Arial', 48, bold=True)
+    heading_font = get_font('Arial', 32, bold=True)
+    font = get_font('Arial', 24)
+    small_font = get_font('Arial', 20)
 
     # Button dimensions
     button_width = 180
@@ -73,7 +77,7 @@ def show_instructions(screen):
 
     # Render all the content onto the content surface
     # How to Play heading
-    how_to_play_text = heading_font.render("How to Play Car Parking Puzzle", True, BLACK)
+    how_to_play_text = render_text(heading_font, "How to Play Car Parking Puzzle", True, BLACK)
     how_to_play_rect = how_to_play_text.get_rect(center=(content_width // 2, 30))
     content_surface.blit(how_to_play_text, how_to_play_rect)
 
@@ -117,7 +121,7 @@ def show_instructions(screen):
     line_spacing = 32  # Spacing between lines
 
     for line in instructions:
-        text = font.render(line, True, BLACK)
+        text = render_text(font, line, True, BLACK)
         content_surface.blit(text, (30, y_pos))
         y_pos += line_spacing
 
@@ -130,9 +134,12 @@ def show_instructions(screen):
 
     # Main loop for the instructions screen
     running = True
+    frames = FrameScheduler()
+    renderer = DirtyRenderer(screen)
 
     while running:
         for event in pygame.event.get():
+            renderer.handle_event(event)
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -176,17 +183,20 @@ def show_instructions(screen):
             scroll_progress = scroll_y / max_scroll
             scroll_button_y = scroll_bar_y + scroll_progress * (scroll_bar_height - scroll_button_height)
 
+        # Report what can change so that only those regions are repainted
+        renderer.track("content", viewport_rect, scroll_y)
+        renderer.track("scroll_button", (scroll_button_x, scroll_button_y,
+                                         scroll_button_width, scroll_button_height))
+        renderer.track_hover(play_button_rect)
+        if not renderer.begin_frame():
+            frames.tick()
+            continue
+
         # Draw gradient background
-        for y in range(SCREEN_HEIGHT):
-            color = (
-                int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-            )
-            pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+        screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Title
-        title_text = title_font.render("Car Parking Puzzle", True, WHITE)
+        title_text = render_text(title_font, "Car Parking Puzzle", True, WHITE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 50))
         screen.blit(title_text, title_rect)
 
@@ -238,12 +248,12 @@ def show_instructions(screen):
         pygame.draw.rect(screen, button_color, play_button_rect, border_radius=10)
         pygame.draw.rect(screen, BLACK, play_button_rect, width=2, border_radius=10)
 
-        play_text = heading_font.render("Play Now", True, BLACK)
+        play_text = render_text(heading_font, "Play Now", True, BLACK)
         play_text_rect = play_text.get_rect(center=play_button_rect.center)
         screen.blit(play_text, play_text_rect)
 
-        pygame.display.flip()
-        pygame.time.Clock().tick(60)
+        renderer.present()
+        frames.tick()
 
     return False
 
@@ -259,9 +269,7 @@ if __name__ == "__main__":
 
     if result:
         # User clicked Play Now, launch the game
-        pygame.quit()  # Close this window first
-        import os
-        os.system(f"{sys.executable} carparkingl1.py")  # Start the game
+        navigate("carparkingl1.py")  # Start the game
     else:
         # User chose to quit
         pygame.quit()
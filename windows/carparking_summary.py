@@ -1,6 +1,12 @@
 import pygame
 import sys
 import os
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from dirty_rects import DirtyRenderer
 
 # Constants
 SCREEN_WIDTH = 800
@@ -48,9 +54,9 @@ def show_summary(screen, game_data):
         pygame.mixer.music.play(-1)  # -1 means loop indefinitely
 
     # Prepare fonts
-    big_font = pygame.font.SysFont('Arial', 48, bold=True)
-    medium_font = pygame.font.SysFont('Arial', 32)
-    font = pygame.font.SysFont('Arial', 24)
+    big_font = get_font('Arial', 48, bold=True)
+    medium_font = get_font('Arial', 32)
+    font = get_font('Arial', 24)
 
     # Get the star rating from game data
     stars = game_data['stars']
@@ -80,10 +86,13 @@ def show_summary(screen, game_data):
     # Main loop for the summary screen
     summary_running = True
     action = None
+    frames = FrameScheduler()
+    renderer = DirtyRenderer(screen)
 
     while summary_running:
         # Handle events
         for event in pygame.event.get():
+            renderer.handle_event(event)
             if event.type == pygame.QUIT:
                 return "quit"
             # Check for button clicks
@@ -99,22 +108,18 @@ def show_summary(screen, game_data):
                         # Run the final summary script
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        os.system(f"{sys.executable} final_summary.py")
+                        navigate("final_summary.py")
                         sys.exit()
 
+        if not renderer.begin_frame():
+            frames.tick()
+            continue
+
         # Draw background with gradient
-        for y in range(SCREEN_HEIGHT):
-            # Create a gradient from dark blue to light blue
-            color = (
-                int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-            )
-            pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+        screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Title
-        title_text = big_font.render("Puzzle Complete!", True, WHITE)
+        title_text = render_text(big_font, "Puzzle Complete!", True, WHITE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 70))
 
         # Add a fancy box around the title
@@ -130,7 +135,7 @@ def show_summary(screen, game_data):
         screen.blit(title_text, title_rect)
 
         # Performance message
-        performance_text = medium_font.render(performance_msg, True, WHITE)
+        performance_text = render_text(medium_font, performance_msg, True, WHITE)
         screen.blit(performance_text,
                     (SCREEN_WIDTH // 2 - performance_text.get_width() // 2, 130))
 
@@ -172,7 +177,7 @@ def show_summary(screen, game_data):
         pygame.draw.rect(screen, BLACK, summary_box, width=2, border_radius=10)
 
         # Summary heading
-        summary_heading = medium_font.render("Game Summary", True, BLACK)
+        summary_heading = render_text(medium_font, "Game Summary", True, BLACK)
         screen.blit(summary_heading,
                     (SCREEN_WIDTH // 2 - summary_heading.get_width() // 2, 240))
 
@@ -185,29 +190,29 @@ def show_summary(screen, game_data):
         y_pos = 300
 
         # Your Moves
-        moves_text = font.render(f"Your Moves: {game_data['moves']}", True, BLACK)
+        moves_text = render_text(font, f"Your Moves: {game_data['moves']}", True, BLACK)
         screen.blit(moves_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Perfect Moves
-        perfect_text = font.render(f"Perfect Solution: {game_data['perfect_moves']} moves", True, BLACK)
+        perfect_text = render_text(font, f"Perfect Solution: {game_data['perfect_moves']} moves", True, BLACK)
         screen.blit(perfect_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Efficiency
         if game_data['perfect_moves'] > 0:
             efficiency = int((game_data['perfect_moves'] / max(1, game_data['moves'])) * 100)
-            efficiency_text = font.render(f"Efficiency: {efficiency}%", True, BLACK)
+            efficiency_text = render_text(font, f"Efficiency: {efficiency}%", True, BLACK)
             screen.blit(efficiency_text, (summary_box.left + 30, y_pos))
             y_pos += line_height
 
         # Star Rating
-        star_rating_text = font.render(f"Star Rating: {stars}/3", True, BLACK)
+        star_rating_text = render_text(font, f"Star Rating: {stars}/3", True, BLACK)
         screen.blit(star_rating_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Difficulty
-        difficulty_text = font.render("Difficulty: Easy", True, BLACK)
+        difficulty_text = render_text(font, "Difficulty: Easy", True, BLACK)
         screen.blit(difficulty_text, (summary_box.left + 30, y_pos))
 
         # Continue button
@@ -217,12 +222,12 @@ def show_summary(screen, game_data):
         pygame.draw.rect(screen, BLACK, continue_rect, width=2, border_radius=10)
 
         # Changed button text to indicate this leads to final summary
-        continue_text = font.render("View Final Results", True, BLACK)
+        continue_text = render_text(font, "View Final Results", True, BLACK)
         continue_text_rect = continue_text.get_rect(center=continue_rect.center)
         screen.blit(continue_text, continue_text_rect)
 
-        pygame.display.flip()
-        pygame.time.Clock().tick(60)
+        renderer.present()
+        frames.tick()
 
     return action
 
@@ -234,6 +239,8 @@ def save_game_data(game_data):
     Parameters:
     game_data (dict): Dictionary containing game statistics
     """
+    get_session().record_result("Car Parking Puzzle", game_data)
+
     try:
         # Save the data to a file for the final summary to read
         # We keep the original carparking_data.txt file but include more data
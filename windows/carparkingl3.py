@@ -1,8 +1,10 @@
 import pygame
 import sys
-import os
 import random
 import math
+from scene_router import navigate
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
 
 # Initialize pygame
 pygame.init()
@@ -207,6 +209,10 @@ class Level:
             return (self.player_car.x == exit_x and
                     self.player_car.y + self.player_car.length == exit_y)
 
+    def is_animating(self):
+        """Return True while any car is still sliding to its target"""
+        return any(car.moving for car in self.car_objects)
+
     def update(self):
         """Update level state"""
         # Update car positions
@@ -244,8 +250,8 @@ class Level:
             car.draw(screen, selected=(car == self.selected_car))
 
         # Draw move count
-        font = pygame.font.SysFont('Arial', 24)
-        moves_text = font.render(f"Moves: {self.move_count}", True, COLORS['text'])
+        font = get_font('Arial', 24)
+        moves_text = render_text(font, f"Moves: {self.move_count}", True, COLORS['text'])
         screen.blit(moves_text, (20, 20))
 
     def calculate_stars(self):
@@ -275,8 +281,8 @@ class Button:
         pygame.draw.rect(screen, color, self.rect, border_radius=5)
         pygame.draw.rect(screen, COLORS['text'], self.rect, 2, border_radius=5)
 
-        font = pygame.font.SysFont('Arial', 24)
-        text_surface = font.render(self.text, True, COLORS['button_text'])
+        font = get_font('Arial', 24)
+        text_surface = render_text(font, self.text, True, COLORS['button_text'])
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -294,7 +300,7 @@ def main():
     # Set up the window
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Car Parking Puzzle - Level 3")
-    clock = pygame.time.Clock()
+    frames = FrameScheduler(FPS)
 
     # Create the level for level 3 - Hard difficulty
     level = Level(
@@ -377,6 +383,8 @@ def main():
             except:
                 print("Error: Could not save level data to file.")
 
+        frames.mark_draw()
+
         # Draw the game
         screen.fill(COLORS['background'])
 
@@ -400,8 +408,8 @@ def main():
             screen.blit(overlay, (0, 0))
 
             # Draw level complete message
-            font = pygame.font.SysFont('Arial', 48, bold=True)
-            complete_text = font.render("Level Complete!", True, COLORS['white'])
+            font = get_font('Arial', 48, bold=True)
+            complete_text = render_text(font, "Level Complete!", True, COLORS['white'])
             screen.blit(complete_text, (SCREEN_WIDTH // 2 - complete_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
 
             # Draw star rating
@@ -444,8 +452,8 @@ def main():
                     ])
 
             # Display move count
-            font = pygame.font.SysFont('Arial', 28)
-            moves_text = font.render(f"Moves: {level.move_count}", True, COLORS['white'])
+            font = get_font('Arial', 28)
+            moves_text = render_text(font, f"Moves: {level.move_count}", True, COLORS['white'])
             screen.blit(moves_text, (SCREEN_WIDTH // 2 - moves_text.get_width() // 2, SCREEN_HEIGHT // 2 + 20))
 
             # Draw continue button
@@ -453,15 +461,13 @@ def main():
             continue_button.draw(screen)
 
             if continue_button.is_clicked(mouse_pos, mouse_click):
-                pygame.quit()
-                os.system(f"{sys.executable} carparking_summary.py")
+                navigate("carparking_summary.py")
                 sys.exit()
 
         # Handle button clicks
         if menu_button.is_clicked(mouse_pos, mouse_click):
             # Return to menu/instructions
-            pygame.quit()
-            os.system(f"{sys.executable} carparking_instructions.py")
+            navigate("carparking_instructions.py")
             sys.exit()
 
         if reset_button.is_clicked(mouse_pos, mouse_click):
@@ -513,7 +519,7 @@ def main():
                     level.selected_car = None
 
         pygame.display.flip()
-        clock.tick(FPS)
+        frames.tick(animating=level.is_animating())
 
     pygame.quit()
     sys.exit()
@@ -0,0 +1,452 @@
+import os
+import sys
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+
+import pygame
+
+from text_cache import get_font
+
+# matplotlib.pyplot, imported on first use by export_line_chart() (False if it is not
+# installed); the screens draw their charts with pygame and never import it
+_pyplot = None
+
+# Maximum number of rendered charts kept alive at once
+MAX_CHARTS = 32
+
+# Colours of the charts
+CHART_BACKGROUND = (255, 255, 255)
+CHART_AXIS = (0, 0, 0)
+CHART_GRID = (220, 220, 220)
+CHART_LINE = (0, 100, 255)
+CHART_BAR = (50, 150, 255)
+CHART_TEXT = (0, 0, 0)
+
+# Fonts of the chart titles and of the axis and bar labels
+CHART_FONT = "Arial"
+TITLE_SIZE = 20
+LABEL_SIZE = 14
+
+# Horizontal grid lines, each with its value on the y axis, of line and bar charts
+GRID_LINES = 5
+
+# Points of a line chart are marked while it has at most this many
+MAX_MARKERS = 60
+
+# Size and resolution of exported charts: matplotlib figure in inches and dots per
+# inch, or the size of the pygame rendering when matplotlib is not installed
+EXPORT_FIGSIZE = (10, 5)
+EXPORT_DPI = 200
+EXPORT_SCALE = 2
+
+
+class ChartCache:
+    """
+    ChartCache keeps rendered charts so that a chart of unchanged data costs a hash of
+    its columns instead of a render.
+
+    Entries are keyed by the chart's kind, size, style and a hash of the data it plots
+    (see history_key), and evicted in least-recently-used order once `max_entries` is
+    reached. Cached surfaces are shared between callers and must be treated as
+    read-only. Charts may be asked for from background threads (see BackgroundJob);
+    the entries are guarded by a lock, renders run outside it.
+
+    Attributes:
+    - max_entries: int, maximum number of cached charts
+    - hits: int, number of charts answered from the cache
+    - misses: int, number of charts that had to be rendered
+    """
+
+    def __init__(self, max_entries=MAX_CHARTS):
+        """
+        Parameters:
+        - max_entries: int, maximum number of cached charts.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, render):
+        """
+        Return the chart cached under `key`, calling render() to draw it on a cache miss.
+        """
+        with self._lock:
+            surface = self._entries.get(key)
+            if surface is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return surface
+            self.misses += 1
+
+        surface = render()
+        with self._lock:
+            self._entries[key] = surface
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """
+        Drop every cached chart and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Return a dict with the cache's hits, misses, hit_rate, size and max_entries.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+
+# Cache shared by every screen running in this process
+chart_cache = ChartCache()
+
+# Chart Surface last written to each file by save_chart()
+_saved_charts = {}
+
+
+def history_key(*columns):
+    """
+    Return a hash of columns of data, as used to key the chart cache.
+
+    Columns may be arrays (e.g. from DataManager.get_player_series), numpy arrays,
+    lists or tuples; arrays are hashed from their raw bytes.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for column in columns:
+        digest.update(f"{len(column)}:".encode("ascii"))
+        if hasattr(column, "tobytes"):
+            digest.update(str(getattr(column, "typecode", getattr(column, "dtype", ""))).encode("ascii"))
+            digest.update(column.tobytes())
+        else:
+            digest.update("\x1f".join(map(str, column)).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def _value_range(values, baseline=None):
+    """
+    Return the (low, high) of the y axis: the range of `values`, widened to include
+    `baseline`, and never empty.
+    """
+    low, high = min(values), max(values)
+    if baseline is not None:
+        low, high = min(low, baseline), max(high, baseline)
+    if low == high:
+        low, high = low - 1, high + 1
+    return low, high
+
+
+def _render_label(font, text):
+    # Rendered directly: labels change with the data, the chart itself is what gets
+    # cached, and the shared text cache is not meant for background threads
+    return font.render(text, True, CHART_TEXT)
+
+
+def _format_value(value, step):
+    return f"{value:.0f}" if step >= 1 else f"{value:.1f}"
+
+
+def _finish(surface):
+    # Match the display format so blitting the chart is a straight copy
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+
+def _draw_frame(surface, title, low, high, scale=1):
+    """
+    Draw the title, grid lines, y labels and axes of a line or bar chart.
+
+    Returns:
+    - pygame.Rect, the plot area inside the axes
+    """
+    width, height = surface.get_size()
+    label_font = get_font(CHART_FONT, LABEL_SIZE * scale)
+    top = 10 * scale
+    if title:
+        title_text = _render_label(get_font(CHART_FONT, TITLE_SIZE * scale, bold=True), title)
+        surface.blit(title_text, title_text.get_rect(midtop=(width // 2, 5 * scale)))
+        top += title_text.get_height()
+    step = (high - low) / (GRID_LINES - 1)
+    labels = [_format_value(low + step * i, step) for i in range(GRID_LINES)]
+    left = max(label_font.size(label)[0] for label in labels) + 12 * scale
+    bottom = label_font.get_linesize() + 8 * scale
+    area = pygame.Rect(left, top, width - left - 15 * scale, height - top - bottom)
+
+    for i, label in enumerate(labels):
+        y = area.bottom - round(i * area.height / (GRID_LINES - 1))
+        pygame.draw.line(surface, CHART_GRID, (area.left, y), (area.right, y), scale)
+        text = _render_label(label_font, label)
+        surface.blit(text, text.get_rect(midright=(area.left - 6 * scale, y)))
+    pygame.draw.line(surface, CHART_AXIS, area.topleft, area.bottomleft, 2 * scale)
+    pygame.draw.line(surface, CHART_AXIS, area.bottomleft, area.bottomright, 2 * scale)
+    return area
+
+
+def _line_points(values, area, low, high):
+    """
+    Return the points of a line through `values` across `area`.
+
+    With more values than pixel columns, each column gets the lowest and highest of
+    its values, so long histories cost one segment per pixel and keep their peaks.
+    """
+    count = len(values)
+    y_scale = (area.height - 1) / (high - low)
+    bottom = area.bottom - 1
+    if count == 1:
+        return [(area.centerx, bottom - round((values[0] - low) * y_scale))]
+    if count <= area.width:
+        x_step = (area.width - 1) / (count - 1)
+        return [(area.left + round(i * x_step), bottom - round((value - low) * y_scale))
+                for i, value in enumerate(values)]
+    points = []
+    for x in range(area.width):
+        column = values[x * count // area.width:(x + 1) * count // area.width]
+        points.append((area.left + x, bottom - round((max(column) - low) * y_scale)))
+        points.append((area.left + x, bottom - round((min(column) - low) * y_scale)))
+    return points
+
+
+def _render_line_chart(size, values, x_labels, title, color, scale=1):
+    surface = pygame.Surface(size)
+    surface.fill(CHART_BACKGROUND)
+    low, high = _value_range(values)
+    area = _draw_frame(surface, title, low, high, scale)
+    points = _line_points(values, area, low, high)
+    if len(points) > 1:
+        pygame.draw.lines(surface, color, False, points, 2 * scale)
+    if len(values) <= MAX_MARKERS:
+        for point in points:
+            pygame.draw.circle(surface, color, point, 3 * scale)
+
+    if x_labels:
+        label_font = get_font(CHART_FONT, LABEL_SIZE * scale)
+        first = _render_label(label_font, str(x_labels[0]))
+        surface.blit(first, first.get_rect(topleft=(area.left, area.bottom + 4 * scale)))
+        if len(x_labels) > 1:
+            last = _render_label(label_font, str(x_labels[-1]))
+            surface.blit(last, last.get_rect(topright=(area.right, area.bottom + 4 * scale)))
+    return _finish(surface)
+
+
+def _render_bar_chart(size, labels, values, title, color):
+    surface = pygame.Surface(size)
+    surface.fill(CHART_BACKGROUND)
+    low, high = _value_range(values, baseline=0)
+    area = _draw_frame(surface, title, low, high)
+    label_font = get_font(CHART_FONT, LABEL_SIZE)
+    y_scale = area.height / (high - low)
+    zero = area.bottom - round(-low * y_scale)
+    slot = area.width / len(values)
+    bar_width = max(1, int(slot * 0.7))
+
+    for i, value in enumerate(values):
+        x = area.left + round(i * slot + (slot - bar_width) / 2)
+        y = area.bottom - round((value - low) * y_scale)
+        bar = pygame.Rect(x, min(y, zero), bar_width, max(1, abs(zero - y)))
+        pygame.draw.rect(surface, color, bar)
+        pygame.draw.rect(surface, CHART_AXIS, bar, 1)
+        # Labels that do not fit under their bar are left out
+        if labels is not None and label_font.size(str(labels[i]))[0] <= slot:
+            text = _render_label(label_font, str(labels[i]))
+            surface.blit(text, text.get_rect(midtop=(bar.centerx, area.bottom + 4)))
+    return _finish(surface)
+
+
+def _render_sparkline(size, values, color):
+    surface = pygame.Surface(size)
+    surface.fill(CHART_BACKGROUND)
+    low, high = _value_range(values)
+    area = surface.get_rect().inflate(-6, -6)
+    points = _line_points(values, area, low, high)
+    if len(points) > 1:
+        pygame.draw.lines(surface, color, False, points, 1)
+    # Mark the latest value
+    latest = area.bottom - 1 - round((values[-1] - low) * (area.height - 1) / (high - low))
+    pygame.draw.circle(surface, color, (points[-1][0], latest), 2)
+    return _finish(surface)
+
+
+def get_line_chart(size, values, x_labels=None, title=None, color=CHART_LINE):
+    """
+    Return a line chart of `values`, rendering it only when its data changed.
+
+    The same Surface is handed to every caller asking for the same chart, so it must
+    be treated as read-only: blit it, never draw onto it.
+
+    Parameters:
+    - size: (width, height) of the chart
+    - values: sequence of numbers (array, numpy array or list), in x order
+    - x_labels: (str, str) or None, labels of the first and last value
+    - title: str or None, drawn above the chart
+    - color: RGB colour of the line
+
+    Returns:
+    - pygame.Surface with the chart
+    """
+    if not len(values):
+        raise ValueError("A chart needs at least one value")
+    x_labels = tuple(x_labels) if x_labels else ()
+    key = ("line", tuple(size), x_labels, title, tuple(color), history_key(values))
+    return chart_cache.get(key, lambda: _render_line_chart(tuple(size), values, x_labels, title, color))
+
+
+def get_bar_chart(size, values, labels=None, title=None, color=CHART_BAR):
+    """
+    Return a bar chart of `values`, rendering it only when its data changed.
+
+    Parameters:
+    - size: (width, height) of the chart
+    - values: sequence of numbers, one bar each
+    - labels: sequence of str or None, drawn under the bars
+    - title: str or None, drawn above the chart
+    - color: RGB colour of the bars
+
+    Returns:
+    - pygame.Surface with the chart (read-only, see get_line_chart)
+    """
+    if not len(values):
+        raise ValueError("A chart needs at least one value")
+    key = ("bar", tuple(size), title, tuple(color), history_key(values, labels or ()))
+    return chart_cache.get(key, lambda: _render_bar_chart(tuple(size), labels, values, title, color))
+
+
+def get_sparkline(size, values, color=CHART_LINE):
+    """
+    Return a sparkline of `values`: a small line chart without axes or labels, with
+    the latest value marked.
+
+    Parameters:
+    - size: (width, height) of the sparkline
+    - values: sequence of numbers, in x order
+    - color: RGB colour of the line
+
+    Returns:
+    - pygame.Surface with the sparkline (read-only, see get_line_chart)
+    """
+    if not len(values):
+        raise ValueError("A chart needs at least one value")
+    key = ("sparkline", tuple(size), tuple(color), history_key(values))
+    return chart_cache.get(key, lambda: _render_sparkline(tuple(size), values, color))
+
+
+def save_chart(surface, path):
+    """
+    Write a chart to an image file, unless this same Surface was already written there.
+
+    Charts from the cache are only re-rendered when their data changed, so an unchanged
+    history is not written again.
+
+    Returns:
+    - bool, True if the file was written
+    """
+    if _saved_charts.get(path) is surface and os.path.exists(path):
+        return False
+    pygame.image.save(surface, path)
+    _saved_charts[path] = surface
+    return True
+
+
+def _load_pyplot():
+    global _pyplot
+    if _pyplot is None:
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as pyplot
+            _pyplot = pyplot
+        except ImportError:
+            _pyplot = False
+    return _pyplot or None
+
+
+def export_line_chart(path, values, labels=None, title=None, xlabel="", ylabel="", dpi=EXPORT_DPI):
+    """
+    Write a high-resolution line chart, e.g. for printing a player's progress.
+
+    Drawn by matplotlib when it is installed, with every label on the x axis;
+    otherwise rendered by pygame at EXPORT_SCALE times the size.
+
+    Parameters:
+    - path: str, image file to write (the extension selects the format)
+    - values: sequence of numbers, in x order
+    - labels: sequence of str or None, x labels of the values (e.g. timestamps)
+    - title, xlabel, ylabel: str, chart title and axis labels
+    - dpi: int, resolution of the matplotlib figure
+
+    Returns:
+    - str, "matplotlib" or "pygame", whichever drew the chart
+    """
+    if not len(values):
+        raise ValueError("A chart needs at least one value")
+    pyplot = _load_pyplot()
+    if pyplot is not None:
+        pyplot.figure(figsize=EXPORT_FIGSIZE)
+        pyplot.plot(list(labels) if labels is not None else range(len(values)), list(values),
+                    marker='o' if len(values) <= MAX_MARKERS else None, linestyle='-')
+        if title:
+            pyplot.title(title)
+        pyplot.xticks(rotation=45)
+        pyplot.xlabel(xlabel)
+        pyplot.ylabel(ylabel)
+        pyplot.tight_layout()
+        pyplot.grid(True)
+        pyplot.savefig(path, dpi=dpi)
+        pyplot.close()
+        return "matplotlib"
+
+    size = (EXPORT_FIGSIZE[0] * 80 * EXPORT_SCALE, EXPORT_FIGSIZE[1] * 80 * EXPORT_SCALE)
+    x_labels = (labels[0], labels[-1]) if labels is not None and len(labels) else ()
+    surface = _render_line_chart(size, values, x_labels, title, CHART_LINE, EXPORT_SCALE)
+    pygame.image.save(surface, path)
+    return "pygame"
+
+
+def main():
+    """
+    Export a player's score history as a high-resolution chart.
+
+    Usage: python charts.py PLAYER [output.png] [--db game_data.db] [--mode MODE] [--dpi 200]
+    """
+    from data_manager import DataManager
+
+    parser = argparse.ArgumentParser(description="Export a SkillScape player's score history chart")
+    parser.add_argument("player")
+    parser.add_argument("output", nargs="?", default="player_progress.png")
+    parser.add_argument("--db", default="game_data.db")
+    parser.add_argument("--mode", help="only chart this game mode")
+    parser.add_argument("--dpi", type=int, default=EXPORT_DPI)
+    args = parser.parse_args()
+
+    dm = DataManager(args.db, cache_size=0, use_daemon=False)
+    try:
+        timestamps, scores = dm.get_player_series(args.player, mode=args.mode)
+    finally:
+        dm.close()
+    if not timestamps:
+        print(f"[Charts] No history found for {args.player}")
+        return 1
+    pygame.font.init()
+    renderer = export_line_chart(args.output, scores, timestamps, f"{args.player}'s Score History",
+                                 "Date", "Score", args.dpi)
+    print(f"[Charts] {len(scores)} sessions charted to {args.output} ({renderer})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,872 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import socket
 import sqlite3
+import calendar
+import threading
+from copy import deepcopy
+from array import array
+from collections import namedtuple, OrderedDict
 from datetime import datetime
 
+# Schema version stored in PRAGMA user_version; bump it when adding a migration
+SCHEMA_VERSION = 8
+
+# Leaderboard level holding each player's best over all levels of a mode
+ALL_LEVELS = -1
+
+# Format of the timestamps taken and returned by the DataManager API
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# sessions.played_at is the local wall-clock time in seconds since 1970-01-01, i.e. the
+# timestamp read as if it were UTC: no time zone or DST rules are involved, and the day
+# of a session (daily_stats.day) is played_at / 86400
+SECONDS_PER_DAY = 86400
+
+# Name lookup tables: sessions refer to players and modes by id
+PLAYERS_TABLE = """CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);"""
+MODES_TABLE = """CREATE TABLE IF NOT EXISTS modes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);"""
+
+_SESSIONS_TABLE = """CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_id INTEGER NOT NULL REFERENCES players (id),
+    mode_id INTEGER NOT NULL REFERENCES modes (id),
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    played_at INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    accuracy REAL
+);"""
+
+# Sessions in the columns of the DataManager API (names, formatted timestamp); queries
+# filter on its player_id, mode_id and played_at columns so the sessions indexes are used
+SESSION_DETAILS_VIEW = """CREATE VIEW IF NOT EXISTS session_details AS
+SELECT s.id AS id, p.name AS player_name, s.score AS score, s.level AS level,
+       strftime('%Y-%m-%d %H:%M:%S', s.played_at, 'unixepoch') AS timestamp,
+       s.duration AS duration, s.accuracy AS accuracy, m.name AS mode,
+       s.player_id AS player_id, s.mode_id AS mode_id, s.played_at AS played_at
+FROM sessions AS s
+JOIN players AS p ON p.id = s.player_id
+JOIN modes AS m ON m.id = s.mode_id;"""
+
+# Columns of a session dict, as selected from session_details
+SESSION_COLUMNS = "id, player_name, score, level, timestamp, duration, accuracy, mode"
+
+# Secondary indexes of the sessions table, dropped and rebuilt around bulk loads
+SESSION_INDEXES = {
+    # Player history and per-player stats: player_id = ? [AND mode_id = ?] ORDER BY played_at
+    "idx_sessions_player_mode_time":
+        "CREATE INDEX IF NOT EXISTS idx_sessions_player_mode_time ON sessions (player_id, mode_id, played_at);",
+    # Leaderboards: mode_id = ? ORDER BY score DESC LIMIT ?
+    "idx_sessions_mode_score": "CREATE INDEX IF NOT EXISTS idx_sessions_mode_score ON sessions (mode_id, score DESC);",
+    # Keyset pagination of a player's history over all modes: ORDER BY played_at, id
+    "idx_sessions_player_time": "CREATE INDEX IF NOT EXISTS idx_sessions_player_time ON sessions (player_id, played_at);",
+}
+
+LEADERBOARD_TABLE = [
+    # Best session per player, mode and level (and per mode over all levels, level -1)
+    """CREATE TABLE IF NOT EXISTS leaderboard (
+    mode_id INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    best_score INTEGER NOT NULL,
+    session_id INTEGER NOT NULL,
+    played_at INTEGER NOT NULL,
+    PRIMARY KEY (mode_id, level, player_id)
+) WITHOUT ROWID;""",
+    # Top-N and rank counting: mode_id = ? AND level = ? ORDER BY best_score DESC, played_at
+    "CREATE INDEX IF NOT EXISTS idx_leaderboard_rank ON leaderboard (mode_id, level, best_score DESC, played_at);",
+]
+
+# Put a session on the leaderboards of its level and of ALL_LEVELS if it beats the
+# player's best there: a higher score, or the same score in less time; full ties keep
+# the earlier session
+_LEADERBOARD_ADD = """INSERT INTO leaderboard (mode_id, level, player_id, best_score, session_id, played_at)
+    VALUES ({row}.mode_id, {row}.level, {row}.player_id, {row}.score, {row}.id, {row}.played_at),
+           ({row}.mode_id, -1, {row}.player_id, {row}.score, {row}.id, {row}.played_at)
+    ON CONFLICT (mode_id, level, player_id) DO UPDATE SET
+        best_score = excluded.best_score, session_id = excluded.session_id, played_at = excluded.played_at
+    WHERE excluded.best_score > leaderboard.best_score
+       OR (excluded.best_score = leaderboard.best_score
+           AND {row}.duration < (SELECT duration FROM sessions WHERE id = leaderboard.session_id));"""
+
+# Take a session off the leaderboards and put the player's next best session in its place
+# (highest score, then shortest time, then earliest)
+_LEADERBOARD_REMOVE = """DELETE FROM leaderboard
+    WHERE mode_id = {row}.mode_id AND level IN ({row}.level, -1) AND player_id = {row}.player_id
+      AND session_id = {row}.id;
+    INSERT OR IGNORE INTO leaderboard (mode_id, level, player_id, best_score, session_id, played_at)
+    SELECT mode_id, level, player_id, score, id, played_at FROM sessions
+    WHERE player_id = {row}.player_id AND mode_id = {row}.mode_id AND level = {row}.level
+    ORDER BY score DESC, duration, id LIMIT 1;
+    INSERT OR IGNORE INTO leaderboard (mode_id, level, player_id, best_score, session_id, played_at)
+    SELECT mode_id, -1, player_id, score, id, played_at FROM sessions
+    WHERE player_id = {row}.player_id AND mode_id = {row}.mode_id
+    ORDER BY score DESC, duration, id LIMIT 1;"""
+
+# Triggers keeping the leaderboard table in step with the sessions table
+LEADERBOARD_TRIGGERS = {
+    "trg_leaderboard_insert": "CREATE TRIGGER IF NOT EXISTS trg_leaderboard_insert AFTER INSERT ON sessions\n"
+                              "BEGIN\n    " + _LEADERBOARD_ADD.format(row="NEW") + "\nEND;",
+    "trg_leaderboard_delete": "CREATE TRIGGER IF NOT EXISTS trg_leaderboard_delete AFTER DELETE ON sessions\n"
+                              "BEGIN\n    " + _LEADERBOARD_REMOVE.format(row="OLD") + "\nEND;",
+    "trg_leaderboard_update": "CREATE TRIGGER IF NOT EXISTS trg_leaderboard_update "
+                              "AFTER UPDATE OF player_id, score, level, mode_id ON sessions\n"
+                              "BEGIN\n    " + _LEADERBOARD_REMOVE.format(row="OLD") + "\n    "
+                              + _LEADERBOARD_ADD.format(row="NEW") + "\nEND;",
+}
+
+# Regenerate the leaderboard table from the sessions table
+LEADERBOARD_REBUILD = [
+    "DELETE FROM leaderboard;",
+    """INSERT INTO leaderboard (mode_id, level, player_id, best_score, session_id, played_at)
+SELECT mode_id, level, player_id, score, id, played_at FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY mode_id, level, player_id ORDER BY score DESC, duration, id) AS position
+    FROM sessions)
+WHERE position = 1;""",
+    """INSERT INTO leaderboard (mode_id, level, player_id, best_score, session_id, played_at)
+SELECT mode_id, -1, player_id, score, id, played_at FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY mode_id, player_id ORDER BY score DESC, duration, id) AS position
+    FROM sessions)
+WHERE position = 1;""",
+]
+
+# Fold the sessions with id > ? into the leaderboard table (after a bulk insert)
+_LEADERBOARD_MERGE = """INSERT INTO leaderboard (mode_id, level, player_id, best_score, session_id, played_at)
+SELECT mode_id, {level}, player_id, score, id, played_at FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY score DESC, duration, id) AS position
+    FROM sessions WHERE id > ?)
+WHERE position = 1
+ON CONFLICT (mode_id, level, player_id) DO UPDATE SET
+    best_score = excluded.best_score, session_id = excluded.session_id, played_at = excluded.played_at
+WHERE excluded.best_score > leaderboard.best_score
+   OR (excluded.best_score = leaderboard.best_score
+       AND (SELECT duration FROM sessions WHERE id = excluded.session_id)
+           < (SELECT duration FROM sessions WHERE id = leaderboard.session_id));"""
+LEADERBOARD_MERGE = [
+    _LEADERBOARD_MERGE.format(level="level", partition="mode_id, level, player_id"),
+    _LEADERBOARD_MERGE.format(level="-1", partition="mode_id, player_id"),
+]
+
+DAILY_STATS_TABLE = [
+    # Per day, player and mode totals, so get_stats sums days instead of sessions
+    """CREATE TABLE IF NOT EXISTS daily_stats (
+    day INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    mode_id INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    score_sum INTEGER NOT NULL,
+    score_max INTEGER NOT NULL,
+    accuracy_sum REAL NOT NULL,
+    accuracy_count INTEGER NOT NULL,
+    PRIMARY KEY (day, player_id, mode_id)
+) WITHOUT ROWID;""",
+    # Per-player reports: player_id = ? [AND mode_id = ?] AND day BETWEEN ? AND ?
+    "CREATE INDEX IF NOT EXISTS idx_daily_stats_player ON daily_stats (player_id, mode_id, day);",
+]
+
+# Count a session in the daily_stats rollup of its day, player and mode
+_DAILY_STATS_ADD = """INSERT INTO daily_stats (day, player_id, mode_id, games, score_sum, score_max,
+                             accuracy_sum, accuracy_count)
+    VALUES ({row}.played_at / 86400, {row}.player_id, {row}.mode_id, 1, {row}.score, {row}.score,
+            coalesce({row}.accuracy, 0.0), {row}.accuracy IS NOT NULL)
+    ON CONFLICT (day, player_id, mode_id) DO UPDATE SET
+        games = games + 1, score_sum = score_sum + excluded.score_sum,
+        score_max = max(score_max, excluded.score_max),
+        accuracy_sum = accuracy_sum + excluded.accuracy_sum,
+        accuracy_count = accuracy_count + excluded.accuracy_count;"""
+
+# Take a session out of its rollup; the maximum is recomputed from that day's sessions
+_DAILY_STATS_REMOVE = """UPDATE daily_stats SET
+        games = games - 1, score_sum = score_sum - {row}.score,
+        score_max = coalesce((SELECT max(score) FROM sessions
+                              WHERE player_id = {row}.player_id AND mode_id = {row}.mode_id
+                                AND played_at BETWEEN {row}.played_at / 86400 * 86400
+                                                  AND {row}.played_at / 86400 * 86400 + 86399), 0),
+        accuracy_sum = accuracy_sum - coalesce({row}.accuracy, 0.0),
+        accuracy_count = accuracy_count - ({row}.accuracy IS NOT NULL)
+    WHERE day = {row}.played_at / 86400 AND player_id = {row}.player_id AND mode_id = {row}.mode_id;
+    DELETE FROM daily_stats
+    WHERE day = {row}.played_at / 86400 AND player_id = {row}.player_id AND mode_id = {row}.mode_id
+      AND games <= 0;"""
+
+# Triggers keeping the daily_stats rollup in step with the sessions table
+DAILY_STATS_TRIGGERS = {
+    "trg_daily_stats_insert": "CREATE TRIGGER IF NOT EXISTS trg_daily_stats_insert AFTER INSERT ON sessions\n"
+                              "BEGIN\n    " + _DAILY_STATS_ADD.format(row="NEW") + "\nEND;",
+    "trg_daily_stats_delete": "CREATE TRIGGER IF NOT EXISTS trg_daily_stats_delete AFTER DELETE ON sessions\n"
+                              "BEGIN\n    " + _DAILY_STATS_REMOVE.format(row="OLD") + "\nEND;",
+    "trg_daily_stats_update": "CREATE TRIGGER IF NOT EXISTS trg_daily_stats_update "
+                              "AFTER UPDATE OF player_id, score, played_at, accuracy, mode_id ON sessions\n"
+                              "BEGIN\n    " + _DAILY_STATS_REMOVE.format(row="OLD") + "\n    "
+                              + _DAILY_STATS_ADD.format(row="NEW") + "\nEND;",
+}
+
+_DAILY_STATS_SELECT = """SELECT played_at / 86400, player_id, mode_id, COUNT(*), SUM(score), MAX(score),
+       TOTAL(accuracy), COUNT(accuracy)
+FROM sessions"""
+
+# Regenerate the daily_stats rollup from the sessions table
+DAILY_STATS_REBUILD = [
+    "DELETE FROM daily_stats;",
+    "INSERT INTO daily_stats (day, player_id, mode_id, games, score_sum, score_max, accuracy_sum, accuracy_count)\n"
+    + _DAILY_STATS_SELECT + "\nGROUP BY 1, 2, 3;",
+]
+
+# Fold the sessions with id > ? into the daily_stats rollup (after a bulk insert)
+DAILY_STATS_MERGE = [
+    "INSERT INTO daily_stats (day, player_id, mode_id, games, score_sum, score_max, accuracy_sum, accuracy_count)\n"
+    + _DAILY_STATS_SELECT + """ WHERE id > ?
+GROUP BY 1, 2, 3
+ON CONFLICT (day, player_id, mode_id) DO UPDATE SET
+    games = games + excluded.games, score_sum = score_sum + excluded.score_sum,
+    score_max = max(score_max, excluded.score_max),
+    accuracy_sum = accuracy_sum + excluded.accuracy_sum,
+    accuracy_count = accuracy_count + excluded.accuracy_count;""",
+]
+
+# Tables derived from sessions by triggers: dropped around bulk loads and merged afterwards
+DERIVED_TRIGGERS = {**LEADERBOARD_TRIGGERS, **DAILY_STATS_TRIGGERS}
+DERIVED_MERGE = LEADERBOARD_MERGE + DAILY_STATS_MERGE
+
+# Schema migrations, applied in order to bring a database from version N-1 to N
+MIGRATIONS = {
+    # The original text-keyed sessions table (a no-op for pre-versioning files)
+    1: [
+        """CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    duration REAL NOT NULL,
+    accuracy REAL,
+    mode TEXT NOT NULL
+);""",
+    ],
+    # Versions 2-5 added indexes, the leaderboard and the daily_stats rollup to the
+    # text-keyed table. Version 6 replaces that table and recreates all of them, so they
+    # are no longer run.
+    2: [],
+    3: [],
+    4: [],
+    5: [],
+    # Integer-keyed sessions: names move to the players and modes tables and timestamps
+    # become epoch seconds; indexes and derived tables are rebuilt on the new columns
+    6: [
+        "DROP TABLE IF EXISTS leaderboard;",
+        "DROP TABLE IF EXISTS daily_stats;",
+        PLAYERS_TABLE,
+        MODES_TABLE,
+        "INSERT INTO players (name) SELECT DISTINCT player_name FROM sessions ORDER BY player_name;",
+        "INSERT INTO modes (name) SELECT DISTINCT mode FROM sessions ORDER BY mode;",
+        _SESSIONS_TABLE.format(name="sessions_v6"),
+        """INSERT INTO sessions_v6 (id, player_id, mode_id, score, level, played_at, duration, accuracy)
+SELECT s.id, p.id, m.id, s.score, s.level, coalesce(CAST(strftime('%s', s.timestamp) AS INTEGER), 0),
+       s.duration, s.accuracy
+FROM sessions AS s
+JOIN players AS p ON p.name = s.player_name
+JOIN modes AS m ON m.name = s.mode
+ORDER BY s.id;""",
+        # Also drops the old indexes and triggers
+        "DROP TABLE sessions;",
+        "ALTER TABLE sessions_v6 RENAME TO sessions;",
+        SESSION_DETAILS_VIEW,
+    ] + list(SESSION_INDEXES.values())
+      + LEADERBOARD_TABLE + list(LEADERBOARD_TRIGGERS.values()) + LEADERBOARD_REBUILD
+      + DAILY_STATS_TABLE + list(DAILY_STATS_TRIGGERS.values()) + DAILY_STATS_REBUILD,
+    7: [
+        # Sessions brought in by import_sessions(), so re-running an import skips them
+        """CREATE TABLE IF NOT EXISTS imported_sessions (
+    import_key TEXT PRIMARY KEY,
+    session_id INTEGER NOT NULL,
+    source TEXT NOT NULL
+) WITHOUT ROWID;""",
+    ],
+    # Ties on the best score go to the faster session: new triggers, entries chosen again
+    8: ["DROP TRIGGER IF EXISTS " + name + ";" for name in LEADERBOARD_TRIGGERS]
+       + list(LEADERBOARD_TRIGGERS.values()) + LEADERBOARD_REBUILD,
+}
+
+# Migrations that rewrite most of the file; VACUUM afterwards gives the freed pages back
+COMPACTING_MIGRATIONS = {6}
+
+# Seconds a connection waits for another one (process or thread) to release its lock
+BUSY_TIMEOUT = 30.0
+
+# Connection settings applied every time a database is opened
+PRAGMAS = [
+    # Readers no longer block the writer and commits append to the log instead of rewriting pages
+    "PRAGMA journal_mode = WAL;",
+    # In WAL mode NORMAL only syncs at checkpoints; a crash can lose the last commit, never corrupt
+    "PRAGMA synchronous = NORMAL;",
+    # Page cache of about 8 MB (negative values are KiB)
+    "PRAGMA cache_size = -8000;",
+    "PRAGMA temp_store = MEMORY;",
+]
+
+SESSION_INSERT_SQL = """INSERT INTO sessions (player_id, mode_id, score, level, played_at, duration, accuracy)
+VALUES (?, ?, ?, ?, ?, ?, ?);"""
+
+# Leaderboard entries with player names and formatted timestamps
+LEADERBOARD_SELECT = """SELECT p.name AS player_name, l.best_score AS best_score, l.session_id AS session_id,
+       strftime('%Y-%m-%d %H:%M:%S', l.played_at, 'unixepoch') AS timestamp
+FROM leaderboard AS l
+JOIN players AS p ON p.id = l.player_id"""
+
+# Every player's best session per game mode, with its duration: LeaderboardRow columns
+BEST_SESSIONS_SELECT = """SELECT p.name, m.name, l.best_score, s.duration, l.session_id, l.played_at
+FROM leaderboard AS l
+JOIN sessions AS s ON s.id = l.session_id
+JOIN players AS p ON p.id = l.player_id
+JOIN modes AS m ON m.id = l.mode_id"""
+
+# Leaderboard entry returned by DataManager.get_best_sessions() (played_at in epoch seconds)
+LeaderboardRow = namedtuple("LeaderboardRow", ["player_name", "mode", "best_score", "duration", "session_id",
+                                               "played_at"])
+
+# Rows fetched per query by iter_player_history() and get_player_series()
+HISTORY_PAGE_SIZE = 500
+
+# Session row yielded by DataManager.iter_player_history()
+HistoryRow = namedtuple("HistoryRow", ["id", "player_name", "score", "level", "timestamp",
+                                       "duration", "accuracy", "mode"])
+
+# Write-behind mode: most rows per transaction, longest wait for more rows before
+# committing a batch (seconds), and most save calls queued before save_session blocks
+WRITE_BATCH_SIZE = 500
+WRITE_BATCH_INTERVAL = 0.25
+WRITE_QUEUE_SIZE = 1000
+
+# Seconds a read (or a screen) waits for queued sessions to be committed before it goes
+# ahead without them, so a stuck writer cannot freeze the game
+FLUSH_TIMEOUT = 5.0
+
+# Most query results kept by a DataManager's result cache (0 turns the cache off)
+QUERY_CACHE_SIZE = 128
+
+# A running db_daemon.py announces itself in a file next to the database with this suffix
+DAEMON_FILE_SUFFIX = ".daemon"
+
+# Seconds to wait when connecting to the daemon, and for the reply to a request
+DAEMON_CONNECT_TIMEOUT = 0.5
+DAEMON_REQUEST_TIMEOUT = 30.0
+
+
+def configure_connection(conn):
+    """
+    Apply the connection pragmas (WAL journaling, synchronous mode, cache size).
+    """
+    for pragma in PRAGMAS:
+        try:
+            conn.execute(pragma)
+        except sqlite3.Error as e:
+            # Not fatal: e.g. WAL is unavailable on some network filesystems
+            print(f"[DataManager] Could not apply {pragma.strip(';')}: {e}")
+
+
+def daemon_file(db_name):
+    """
+    Return the path of the file a database daemon for `db_name` announces itself in.
+    """
+    return os.path.abspath(db_name) + DAEMON_FILE_SUFFIX
+
+
+class DaemonReplyError(sqlite3.OperationalError):
+    """
+    Raised when a request reached the database daemon but no valid reply came back
+    (timeout, dropped connection). The daemon may have committed the rows, so they
+    must not be written again elsewhere.
+    """
+
+
+class DaemonClient:
+    """
+    DaemonClient sends session rows to a running db_daemon.py over localhost TCP.
+
+    The protocol is one JSON object per line in each direction. A "save" request is
+    answered once the daemon has committed the rows, with their ids. A request that
+    could not be sent raises OSError (callers fall back to writing the database
+    directly); one that was sent but got no reply raises DaemonReplyError, and a failed
+    commit in the daemon raises sqlite3.OperationalError like a local one would.
+    """
+
+    def __init__(self, sock, db_path):
+        """
+        Parameters:
+        - sock: connected socket.socket
+        - db_path: str, absolute path of the database the daemon writes
+        """
+        self.sock = sock
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self._file = sock.makefile("rb")
+
+    @classmethod
+    def connect(cls, db_name):
+        """
+        Connect to the daemon serving `db_name`.
+
+        Returns:
+        - DaemonClient, or None if no daemon is running for this database on this machine
+        """
+        try:
+            with open(daemon_file(db_name), "r", encoding="utf-8") as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # The announcement may be on a shared drive; only a daemon on this machine is reachable
+        if info.get("hostname") != socket.gethostname():
+            return None
+        sock = None
+        try:
+            sock = socket.create_connection((info["host"], info["port"]), timeout=DAEMON_CONNECT_TIMEOUT)
+            sock.settimeout(DAEMON_REQUEST_TIMEOUT)
+            client = cls(sock, os.path.abspath(db_name))
+            reply = client.request({"op": "hello"})
+        except (OSError, KeyError, ValueError, sqlite3.Error):
+            if sock is not None:
+                sock.close()
+            return None
+        if os.path.normcase(reply.get("db", "")) != os.path.normcase(client.db_path):
+            client.close()
+            return None
+        return client
+
+    def request(self, message):
+        """
+        Send a request and return the daemon's reply as a dict.
+
+        Raises:
+        - OSError if the request could not be sent
+        - DaemonReplyError if it was sent but no valid reply came back
+        - sqlite3.OperationalError if the daemon failed to carry it out
+        """
+        with self.lock:
+            if self._peer_closed():
+                raise ConnectionError("database daemon closed the connection")
+            self.sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            try:
+                line = self._file.readline()
+            except OSError as e:
+                raise DaemonReplyError(f"no reply from the database daemon: {e}") from e
+        if not line:
+            raise DaemonReplyError("database daemon closed the connection before replying")
+        try:
+            reply = json.loads(line)
+        except ValueError as e:
+            raise DaemonReplyError(f"invalid reply from the database daemon: {e}") from e
+        if not reply.get("ok"):
+            raise sqlite3.OperationalError(f"database daemon: {reply.get('error')}")
+        return reply
+
+    def save(self, rows):
+        """
+        Have the daemon commit session rows (as built by DataManager._session_row).
+
+        Returns:
+        - list of int, the ids of the rows in order
+        """
+        return self.request({"op": "save", "rows": [list(row) for row in rows]})["ids"]
+
+    def _peer_closed(self):
+        # A daemon that went away (e.g. restarted) leaves the socket readable at end of
+        # file; noticing that before sending keeps falling back to a direct write safe
+        try:
+            self.sock.setblocking(False)
+            try:
+                return self.sock.recv(1, socket.MSG_PEEK) == b""
+            finally:
+                self.sock.settimeout(DAEMON_REQUEST_TIMEOUT)
+        except BlockingIOError:
+            return False
+
+    def close(self):
+        try:
+            self._file.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class _Ticket:
+    """
+    Completion of rows submitted to a SessionWriter with write(): their ids, or the
+    error that made the batch fail.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.ids = None
+        self.error = None
+        self.done = threading.Event()
+
+    def finish(self, ids=None, error=None):
+        self.ids = ids
+        self.error = error
+        self.done.set()
+
+
+class NameCache:
+    """
+    NameCache maps player and mode names to their ids for one connection, so saving a
+    session only queries the players and modes tables the first time a name is seen.
+
+    New names are inserted on first use, in the caller's transaction. If that
+    transaction is rolled back the ids may not exist, so callers clear() the cache.
+
+    Attributes:
+    - ids: dict, table name ("players" or "modes") -> {name: id}
+    """
+
+    def __init__(self, conn):
+        """
+        Parameters:
+        - conn: sqlite3.Connection the ids are looked up (and inserted) on
+        """
+        self.conn = conn
+        self.ids = {"players": {}, "modes": {}}
+
+    def get_id(self, table, name):
+        """
+        Return the id of a name in `table`, inserting the name if it is new.
+        """
+        cache = self.ids[table]
+        name_id = cache.get(name)
+        if name_id is None:
+            # OR IGNORE: another connection may have added the name since we last looked
+            self.conn.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?);", (name,))
+            name_id = self.find_id(table, name)
+        return name_id
+
+    def find_id(self, table, name):
+        """
+        Return the id of a name in `table`, or None if no session uses it yet.
+        """
+        cache = self.ids[table]
+        name_id = cache.get(name)
+        if name_id is None:
+            row = self.conn.execute(f"SELECT id FROM {table} WHERE name = ?;", (name,)).fetchone()
+            if row is None:
+                return None
+            name_id = cache[name] = row[0]
+        return name_id
+
+    def session_params(self, row):
+        """
+        Turn a session row (as built by DataManager._session_row) into the parameters of
+        SESSION_INSERT_SQL.
+        """
+        player_name, score, level, played_at, duration, accuracy, mode = row
+        return (self.get_id("players", player_name), self.get_id("modes", mode), score, level,
+                played_at, duration, accuracy)
+
+    def clear(self):
+        """
+        Forget every cached id.
+        """
+        for cache in self.ids.values():
+            cache.clear()
+
+
+class SessionWriter:
+    """
+    SessionWriter owns a SQLite connection on a background thread and writes the
+    sessions queued by a write-behind DataManager.
+
+    Rows are drained from a bounded queue and committed in batches of up to batch_size
+    rows, or whatever arrived within batch_interval seconds of the first row. Until
+    their batch is committed, queued rows stay in `pending` so reads can include them.
+    Commits and the removal of their rows from `pending` happen under `lock`, so a
+    reader holding the lock never sees a row twice or not at all.
+
+    Given a DaemonClient, batches are sent to the database daemon instead of being
+    committed on the writer's own connection, until the daemon becomes unreachable.
+
+    Attributes:
+    - pending: dict, sequence number -> session row, rows queued but not committed
+    - lock: threading.Lock guarding `pending` and the commit
+    - batches: int, number of committed batches
+    - rows_written: int, number of committed rows
+    - errors: int, number of batches or single rows that failed and were dropped
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_name, batch_size=WRITE_BATCH_SIZE, batch_interval=WRITE_BATCH_INTERVAL,
+                 queue_size=WRITE_QUEUE_SIZE, daemon=None):
+        """
+        Parameters:
+        - db_name: str, path to the SQLite database file
+        - batch_size: int, most rows per transaction
+        - batch_interval: float, seconds to wait for more rows before committing
+        - queue_size: int, most queued save calls before submit() blocks
+        - daemon: DaemonClient or None, database daemon to send the batches to
+        """
+        self.db_name = db_name
+        self.daemon = daemon
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.rows_written = 0
+        self.errors = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.last_commit_ms = 0.0
+        self.max_commit_ms = 0.0
+        self.total_commit_ms = 0.0
+        self._sequence = 0
+        self._thread = threading.Thread(target=self._run, name="DataManagerWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, rows):
+        """
+        Queue session rows (as built by DataManager._session_row) for writing.
+
+        Blocks only if the queue is full, i.e. the disk has fallen far behind.
+        """
+        if rows:
+            self.queue.put(self._queue_items(rows))
+
+    def write(self, rows, timeout=None):
+        """
+        Queue session rows and wait until the batch they end up in is committed.
+
+        Rows from concurrent write() calls share transactions, so many small writers
+        cost one commit per batch instead of one each.
+
+        Returns:
+        - list of int, the ids of the rows in order
+
+        Raises:
+        - sqlite3.Error if the batch could not be committed
+        - TimeoutError if `timeout` seconds passed first
+        """
+        if not rows:
+            return []
+        ticket = _Ticket(self._queue_items(rows))
+        self.queue.put(ticket)
+        if not ticket.done.wait(timeout):
+            raise TimeoutError("session batch not committed in time")
+        if ticket.error is not None:
+            raise ticket.error
+        return ticket.ids
+
+    def _queue_items(self, rows):
+        with self.lock:
+            items = []
+            for row in rows:
+                self._sequence += 1
+                self.pending[self._sequence] = row
+                items.append((self._sequence, row))
+        return items
+
+    def flush(self, timeout=None):
+        """
+        Wait until everything queued so far is committed.
+
+        Returns:
+        - bool, False if `timeout` seconds passed first
+        """
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=None):
+        """
+        Commit everything still queued and stop the writer thread.
+        """
+        if self._thread.is_alive():
+            self.queue.put(self._STOP)
+            self._thread.join(timeout)
+
+    def metrics(self):
+        """
+        Return queue depth, batch size and commit latency figures as a dict.
+        """
+        with self.lock:
+            pending_rows = len(self.pending)
+        return {
+            "queue_depth": self.queue.qsize(),
+            "pending_rows": pending_rows,
+            "batches": self.batches,
+            "rows_written": self.rows_written,
+            "errors": self.errors,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": self.rows_written / self.batches if self.batches else 0.0,
+            "last_commit_ms": self.last_commit_ms,
+            "max_commit_ms": self.max_commit_ms,
+            "avg_commit_ms": self.total_commit_ms / self.batches if self.batches else 0.0,
+            "daemon": self.daemon is not None,
+        }
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_name, timeout=BUSY_TIMEOUT)
+        configure_connection(conn)
+        names = NameCache(conn)
+        stopping = False
+        while not stopping:
+            batch = []
+            tickets = []
+            flushes = []
+            item = self.queue.get()
+            deadline = time.monotonic() + self.batch_interval
+            while True:
+                if item is self._STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    flushes.append(item)
+                elif isinstance(item, _Ticket):
+                    tickets.append(item)
+                    batch.extend(item.items)
+                else:
+                    batch.extend(item)
+                # A flush or shutdown commits straight away instead of waiting for more rows
+                if stopping or flushes or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            try:
+                if batch:
+                    self._write(conn, names, batch, tickets)
+            except Exception as e:
+                # Whatever went wrong, the thread lives on: waiting callers get the error
+                self._fail(batch, [ticket for ticket in tickets if not ticket.done.is_set()], e)
+            finally:
+                for done in flushes:
+                    done.set()
+        conn.close()
+        if self.daemon is not None:
+            self.daemon.close()
+
+    def _write(self, conn, names, batch, tickets=()):
+        start = time.perf_counter()
+        failed = {}
+        try:
+            ids = self._send(batch) if self.daemon is not None else None
+        except sqlite3.Error as e:
+            # The daemon may have committed some of it, so nothing is written again here
+            self._fail(batch, tickets, e)
+            return
+        if ids is None:
+            try:
+                ids = self._commit(conn, names, batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    self._fail(batch, tickets, e)
+                    return
+                print(f"[DataManager] Error writing {len(batch)} queued sessions, retrying one by one: {e}")
+                ids, failed = self._commit_each(conn, names, batch)
+        if tickets:
+            ids_by_sequence = {sequence: row_id for (sequence, row), row_id in zip(batch, ids)}
+            for ticket in tickets:
+                error = next((failed[sequence] for sequence, row in ticket.items if sequence in failed), None)
+                if error is not None:
+                    ticket.finish(error=error)
+                else:
+                    ticket.finish([ids_by_sequence[sequence] for sequence, row in ticket.items])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.batches += 1
+        self.rows_written += len(batch) - len(failed)
+        self.last_batch_size = len(batch)
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+        self.last_commit_ms = elapsed_ms
+        self.max_commit_ms = max(self.max_commit_ms, elapsed_ms)
+        self.total_commit_ms += elapsed_ms
+
+    def _commit(self, conn, names, batch):
+        """
+        Commit a batch on the writer's own connection and return the new ids.
+        """
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            conn.executemany(SESSION_INSERT_SQL, [names.session_params(row) for sequence, row in batch])
+            last_id = conn.execute("SELECT last_insert_rowid();").fetchone()[0]
+            with self.lock:
+                conn.commit()
+                self._forget(batch)
+        except Exception:
+            conn.rollback()
+            names.clear()
+            raise
+        return list(range(last_id - len(batch) + 1, last_id + 1))
+
+    def _commit_each(self, conn, names, batch):
+        """
+        Commit a batch one row per transaction, so a bad row loses only itself.
+
+        Returns:
+        - (ids, failed): the new ids (None for failed rows) and a dict of
+          sequence -> Exception for the rows that were dropped
+        """
+        ids = []
+        failed = {}
+        for item in batch:
+            try:
+                ids.extend(self._commit(conn, names, [item]))
+            except Exception as e:
+                with self.lock:
+                    self._forget([item])
+                self.errors += 1
+                print(f"[DataManager] Error writing queued session {item[1]!r}, dropped: {e}")
+                failed[item[0]] = e
+                ids.append(None)
+        return ids, failed
+
+    def _fail(self, batch, tickets, error):
+        """
+        Drop a batch that could not be written and pass the error to its waiting callers.
+        """
+        with self.lock:
+            self._forget(batch)
+        self.errors += 1
+        print(f"[DataManager] Error writing {len(batch)} queued sessions: {error}")
+        for ticket in tickets:
+            ticket.finish(error=error)
+
+    def _send(self, batch):
+        """
+        Have the database daemon commit a batch and return the new ids, or None if the
+        daemon is gone (the batch is then committed directly, and so are later ones).
+        A batch sent without a reply raises DaemonReplyError and is not written again.
+        """
+        try:
+            # Under the lock, so readers see the rows either queued or committed
+            with self.lock:
+                ids = self.daemon.save([row for sequence, row in batch])
+                self._forget(batch)
+            return ids
+        except DaemonReplyError:
+            self.daemon.close()
+            self.daemon = None
+            raise
+        except OSError as e:
+            print(f"[DataManager] Database daemon unavailable, writing directly: {e}")
+            self.daemon.close()
+            self.daemon = None
+            return None
+
+    def _forget(self, batch):
+        for sequence, row in batch:
+            self.pending.pop(sequence, None)
+
+
 class DataManager:
     """
     DataManager handles storage and retrieval of game session data using SQLite.
@@ -13,42 +879,115 @@ class DataManager:
     - duration: float, session duration in seconds
     - accuracy: float or None, accuracy achieved (0 to 1, or percentage) if applicable
     - mode: str, game mode name
+
+    On disk, sessions refer to rows of the players and modes tables by id and store the
+    timestamp as epoch seconds (played_at); the session_details view and the methods
+    below translate back, and a NameCache keeps the name -> id lookups off the write path.
+
+    In write-behind mode, save_session() and save_sessions() only queue the sessions
+    and return at once; a SessionWriter thread commits them in batches. Reads still
+    include queued sessions that are not committed yet (with id None).
+
+    If a database daemon (db_daemon.py) is running for the file, writes are sent to it
+    and it commits the sessions of all game processes in shared batches; reads always
+    use this DataManager's own connection. When no daemon is running, or it stops
+    answering, the DataManager writes the file directly.
+
+    Results of get_top_scores(), get_stats() and the leaderboard queries are kept in a
+    bounded LRU cache keyed by the method and its normalised filters. Writes through
+    this DataManager bump cache_generation, which empties the cache; commits by any
+    other connection (the writer thread, another process) are noticed through
+    PRAGMA data_version before each cached read.
     """
 
-    def __init__(self, db_name="game_data.db"):
+    def __init__(self, db_name="game_data.db", write_behind=False, batch_size=WRITE_BATCH_SIZE,
+                 batch_interval=WRITE_BATCH_INTERVAL, queue_size=WRITE_QUEUE_SIZE,
+                 cache_size=QUERY_CACHE_SIZE, use_daemon=True):
         """
         Initialize the DataManager by connecting to the SQLite database
         and creating necessary tables if they do not exist.
 
         Parameters:
         - db_name: str, path to the SQLite database file.
+        - write_behind: bool, queue writes for a background writer thread
+        - batch_size: int, write-behind mode: most rows per transaction
+        - batch_interval: float, write-behind mode: seconds to wait for more rows before committing
+        - queue_size: int, write-behind mode: most queued save calls before saving blocks
+        - cache_size: int, most query results kept in the result cache (0 disables it)
+        - use_daemon: bool, send writes to a running database daemon for this file
         """
+        self.writer = None
+        self.daemon = None
+        self.cache_size = cache_size
+        self.cache_generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()
+        self._data_version = None
         try:
-            self.conn = sqlite3.connect(db_name)
+            self.conn = sqlite3.connect(db_name, timeout=BUSY_TIMEOUT)
             self.conn.row_factory = sqlite3.Row
             self.cursor = self.conn.cursor()
+            self.names = NameCache(self.conn)
+            self.configure()
             self.create_table()
         except sqlite3.Error as e:
             print(f"[DataManager] Error connecting to database: {e}")
             raise
+        if use_daemon:
+            self.daemon = DaemonClient.connect(db_name)
+        if write_behind:
+            # The writer thread takes over the daemon connection
+            self.writer = SessionWriter(db_name, batch_size, batch_interval, queue_size, self.daemon)
+            self.daemon = None
+            # Commit whatever is still queued when the program exits
+            atexit.register(self.close)
+
+    def configure(self):
+        """
+        Apply the connection pragmas (WAL journaling, synchronous mode, cache size).
+        """
+        configure_connection(self.conn)
+
+    def get_schema_version(self):
+        """
+        Return the schema version of the open database (0 for a new or pre-versioning file).
+        """
+        self.cursor.execute("PRAGMA user_version;")
+        return self.cursor.fetchone()[0]
 
     def create_table(self):
         """
-        Create the sessions table if it doesn't already exist.
+        Create the sessions table if it doesn't already exist and upgrade the schema
+        of an existing database to SCHEMA_VERSION.
+
+        Each migration runs in its own transaction together with the version bump, so an
+        interrupted upgrade leaves the file at the last completed version. Several
+        processes may open the file at once: each migration takes the write lock first
+        and re-reads the version under it, so a step another process already applied
+        is skipped rather than run twice.
         """
-        create_table_sql = """CREATE TABLE IF NOT EXISTS sessions (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    player_name TEXT NOT NULL,
-    score INTEGER NOT NULL,
-    level INTEGER NOT NULL,
-    timestamp TEXT NOT NULL,
-    duration REAL NOT NULL,
-    accuracy REAL,
-    mode TEXT NOT NULL
-);"""
         try:
-            self.cursor.execute(create_table_sql)
-            self.conn.commit()
+            version = self.get_schema_version()
+            if version > SCHEMA_VERSION:
+                print(f"[DataManager] Database schema version {version} is newer than {SCHEMA_VERSION}")
+                return
+            applied = []
+            for target in range(version + 1, SCHEMA_VERSION + 1):
+                with self.conn:
+                    self.cursor.execute("BEGIN IMMEDIATE;")
+                    if self.get_schema_version() >= target:
+                        continue
+                    for statement in MIGRATIONS[target]:
+                        self.cursor.execute(statement)
+                    self.cursor.execute(f"PRAGMA user_version = {target};")
+                applied.append(target)
+            if applied:
+                # Give the query planner statistics for the new indexes
+                self.cursor.execute("ANALYZE;")
+                self.conn.commit()
+            if COMPACTING_MIGRATIONS.intersection(applied):
+                self.cursor.execute("VACUUM;")
         except sqlite3.Error as e:
             print(f"[DataManager] Error creating table: {e}")
             raise
@@ -65,16 +1004,349 @@ class DataManager:
         - accuracy: float or None, accuracy (e.g., 0.85 for 85%), if applicable
         - mode: str, game mode
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        insert_sql = """INSERT INTO sessions (player_name, score, level, timestamp, duration, accuracy, mode)
-VALUES (?, ?, ?, ?, ?, ?, ?);"""
+        row = (player_name, score, level, self._epoch(datetime.now()), duration, accuracy, mode)
+        self.invalidate_cache()
+        if self.writer is not None:
+            self.writer.submit([row])
+            return
         try:
-            self.cursor.execute(insert_sql, (player_name, score, level, timestamp, duration, accuracy, mode))
+            if self.daemon is not None and self._daemon_save([row]) is not None:
+                return
+            self.cursor.execute(SESSION_INSERT_SQL, self.names.session_params(row))
             self.conn.commit()
         except sqlite3.Error as e:
+            self.conn.rollback()
+            self.names.clear()
             print(f"[DataManager] Error saving session: {e}")
             raise
 
+    def save_sessions(self, sessions, timestamp=None, bulk=False):
+        """
+        Save many game session records in a single transaction.
+
+        Each session is either a dict with the keys player_name, score, level, duration,
+        accuracy and mode (and optionally timestamp), or a tuple with the same values in
+        the order of save_session(): (player_name, score, level, duration, accuracy, mode),
+        optionally followed by a timestamp. Sessions are streamed into executemany(), so
+        `sessions` can be a generator.
+
+        Parameters:
+        - sessions: iterable of dicts or tuples
+        - timestamp: str or datetime, timestamp of sessions that carry none (default: now)
+        - bulk: bool, drop the secondary indexes and the leaderboard and rollup triggers
+          for the insert, then rebuild the indexes and fold the new rows into the derived
+          tables in one pass, all in the same transaction; faster when the batch is large compared
+          with the table (e.g. backfills), slower for a handful of rows; ignored in
+          write-behind mode; bypasses the database daemon
+
+        Returns:
+        - list of int, the ids of the inserted rows in input order (None in write-behind
+          mode, where the rows have no ids until the writer commits them)
+        """
+        default_timestamp = self._epoch(timestamp or datetime.now())
+        self.invalidate_cache()
+        if self.writer is not None:
+            self.writer.submit([self._session_row(session, default_timestamp) for session in sessions])
+            return None
+        session_rows = (self._session_row(session, default_timestamp) for session in sessions)
+        if self.daemon is not None and not bulk:
+            session_rows = list(session_rows)
+            ids = self._daemon_save(session_rows) if session_rows else []
+            if ids is not None:
+                return ids
+        try:
+            # Take the write lock up front so the new ids are one contiguous block
+            self.cursor.execute("BEGIN IMMEDIATE;")
+            ids = self._insert_rows(session_rows, bulk)
+            self.conn.commit()
+        except (sqlite3.Error, ValueError) as e:
+            self.conn.rollback()
+            self.names.clear()
+            print(f"[DataManager] Error saving sessions: {e}")
+            raise
+        return ids
+
+    def import_sessions(self, sessions, import_keys, source="", bulk=False):
+        """
+        Save the sessions that were not imported before, in a single transaction.
+
+        Each session comes with an import key identifying where it came from (e.g. a
+        hash of the file it was read from). Keys are recorded in the imported_sessions
+        table in the same transaction as their sessions, so importing the same data
+        again, or after an interrupted run, saves nothing twice. Always writes the
+        database directly.
+
+        Parameters:
+        - sessions: list of dicts or tuples, as for save_sessions()
+        - import_keys: list of str, one per session
+        - source: str, where the sessions came from, kept with the keys
+        - bulk: bool, as for save_sessions()
+
+        Returns:
+        - int, number of sessions saved
+        """
+        self.invalidate_cache()
+        try:
+            self.cursor.execute("BEGIN IMMEDIATE;")
+            new = []
+            seen = set()
+            for session, key in zip(sessions, import_keys):
+                if key in seen:
+                    continue
+                seen.add(key)
+                self.cursor.execute("SELECT 1 FROM imported_sessions WHERE import_key = ?;", (key,))
+                if self.cursor.fetchone() is None:
+                    new.append((session, key))
+            ids = []
+            # Nothing new (e.g. a rerun): the bulk path would still rebuild the indexes
+            if new:
+                default_timestamp = self._epoch(datetime.now())
+                ids = self._insert_rows([self._session_row(session, default_timestamp) for session, key in new],
+                                        bulk)
+                self.cursor.executemany(
+                    "INSERT INTO imported_sessions (import_key, session_id, source) VALUES (?, ?, ?);",
+                    [(key, session_id, source) for (session, key), session_id in zip(new, ids)])
+            self.conn.commit()
+        except (sqlite3.Error, ValueError) as e:
+            self.conn.rollback()
+            self.names.clear()
+            print(f"[DataManager] Error importing sessions: {e}")
+            raise
+        return len(ids)
+
+    def _insert_rows(self, session_rows, bulk):
+        """
+        Insert session rows within the open transaction and return their ids.
+        """
+        count = 0
+
+        def rows():
+            nonlocal count
+            for row in session_rows:
+                count += 1
+                yield self.names.session_params(row)
+
+        if bulk:
+            # The rows get larger ids than any already there; only those are merged below
+            self.cursor.execute("SELECT coalesce(max(id), 0) FROM sessions;")
+            previous_id = self.cursor.fetchone()[0]
+            for name in SESSION_INDEXES:
+                self.cursor.execute(f"DROP INDEX IF EXISTS {name};")
+            for name in DERIVED_TRIGGERS:
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS {name};")
+        self.cursor.executemany(SESSION_INSERT_SQL, rows())
+        self.cursor.execute("SELECT last_insert_rowid();")
+        last_id = self.cursor.fetchone()[0]
+        if bulk:
+            for statement in SESSION_INDEXES.values():
+                self.cursor.execute(statement)
+            if count:
+                for statement in DERIVED_MERGE:
+                    self.cursor.execute(statement, (previous_id,))
+            for statement in DERIVED_TRIGGERS.values():
+                self.cursor.execute(statement)
+        if count == 0:
+            return []
+        return list(range(last_id - count + 1, last_id + 1))
+
+    def _daemon_save(self, rows):
+        """
+        Have the database daemon commit session rows.
+
+        Returns:
+        - list of int ids, or None if the daemon is unreachable; the caller then writes
+          directly, as do all later saves
+
+        Raises:
+        - DaemonReplyError if the rows were sent but not acknowledged; they are not
+          written directly, since the daemon may have committed them
+        """
+        try:
+            return self.daemon.save(rows)
+        except DaemonReplyError:
+            self.daemon.close()
+            self.daemon = None
+            raise
+        except OSError as e:
+            print(f"[DataManager] Database daemon unavailable, writing directly: {e}")
+            self.daemon.close()
+            self.daemon = None
+            return None
+
+    def _session_row(self, session, default_timestamp):
+        """
+        Turn a session dict or tuple into a session row:
+        (player_name, score, level, played_at, duration, accuracy, mode).
+        """
+        if isinstance(session, dict):
+            try:
+                values = [session[key] for key in ("player_name", "score", "level", "duration", "accuracy", "mode")]
+            except KeyError as e:
+                raise ValueError(f"session is missing {e}") from None
+            values.append(session.get("timestamp"))
+        else:
+            values = list(session)
+            if len(values) == 6:
+                values.append(None)
+            elif len(values) != 7:
+                raise ValueError(f"session tuple has {len(values)} values, expected 6 or 7")
+        player_name, score, level, duration, accuracy, mode, timestamp = values
+        played_at = self._epoch(timestamp) if timestamp else default_timestamp
+        return (player_name, score, level, played_at, duration, accuracy, mode)
+
+    @staticmethod
+    def _epoch(value):
+        """
+        Return a timestamp as stored in sessions.played_at (wall-clock epoch seconds).
+
+        Parameters:
+        - value: datetime, str (ISO format, e.g. YYYY-MM-DD HH:MM:SS) or int epoch seconds
+        """
+        if isinstance(value, (int, float)):
+            return int(value)
+        if not isinstance(value, datetime):
+            try:
+                value = datetime.fromisoformat(str(value))
+            except ValueError:
+                raise ValueError(f"unrecognised timestamp {value!r}") from None
+        return calendar.timegm(value.timetuple())
+
+    @staticmethod
+    def _format_epoch(played_at):
+        """
+        Return sessions.played_at as a timestamp string (YYYY-MM-DD HH:MM:SS).
+        """
+        return time.strftime(TIMESTAMP_FORMAT, time.gmtime(played_at))
+
+    @staticmethod
+    def _date_bound(value, default_time):
+        """
+        Return a start or end date filter as epoch seconds.
+
+        Parameters:
+        - value: str or datetime, date (YYYY-MM-DD) or full timestamp
+        - default_time: str, time used when `value` is a bare date that isn't ISO parseable
+        """
+        if isinstance(value, datetime):
+            return DataManager._epoch(value)
+        try:
+            return DataManager._epoch(datetime.fromisoformat(value))
+        except ValueError:
+            return DataManager._epoch(datetime.strptime(f"{value} {default_time}", TIMESTAMP_FORMAT))
+
+    def _session_filters(self, player_name, mode, start, end):
+        """
+        Return the SQL conditions and parameters for the common filters.
+
+        The conditions apply to sessions, session_details and daily_stats (player and
+        mode only). A name no session uses yet matches nothing.
+        """
+        filters = []
+        params = []
+        if player_name:
+            filters.append("player_id = ?")
+            params.append(self.names.find_id("players", player_name))
+        if mode:
+            filters.append("mode_id = ?")
+            params.append(self.names.find_id("modes", mode))
+        if start:
+            filters.append("played_at >= ?")
+            params.append(start)
+        if end:
+            filters.append("played_at <= ?")
+            params.append(end)
+        return filters, params
+
+    def _read_lock(self):
+        """
+        Return the lock that keeps queued writes from being committed during a read.
+        """
+        return self.writer.lock if self.writer is not None else _NO_LOCK
+
+    def _pending_sessions(self, player_name, mode, start, end):
+        """
+        Return the queued, not yet committed sessions matching the filters as dicts.
+
+        Must be called while holding _read_lock().
+        """
+        if self.writer is None or not self.writer.pending:
+            return []
+        sessions = []
+        for player, score, level, played_at, duration, accuracy, session_mode in self.writer.pending.values():
+            if player_name and player != player_name:
+                continue
+            if mode and session_mode != mode:
+                continue
+            if start and played_at < start:
+                continue
+            if end and played_at > end:
+                continue
+            sessions.append({"id": None, "player_name": player, "score": score, "level": level,
+                             "timestamp": self._format_epoch(played_at), "duration": duration,
+                             "accuracy": accuracy, "mode": session_mode})
+        return sessions
+
+    # ----- Result cache -----
+
+    def _cache_get(self, key):
+        """
+        Return the cached result for `key`, or _CACHE_MISS.
+
+        Empties the cache first if another connection has committed since the last read.
+        """
+        if self.cache_size <= 0:
+            return _CACHE_MISS
+        try:
+            self.cursor.execute("PRAGMA data_version;")
+            data_version = self.cursor.fetchone()[0]
+        except sqlite3.Error:
+            data_version = None
+        if data_version is None or data_version != self._data_version:
+            self.invalidate_cache()
+            self._data_version = data_version
+        result = self._cache.get(key, _CACHE_MISS)
+        if result is _CACHE_MISS:
+            self.cache_misses += 1
+            return _CACHE_MISS
+        self.cache_hits += 1
+        self._cache.move_to_end(key)
+        # Callers may modify what they get back, so they never get the cached object
+        return deepcopy(result)
+
+    def _cache_put(self, key, result):
+        """
+        Cache a freshly computed result, evicting the least recently used one if full,
+        and return it.
+        """
+        if self.cache_size > 0:
+            self._cache[key] = deepcopy(result)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def invalidate_cache(self):
+        """
+        Start a new cache generation: forget every cached query result.
+        """
+        self.cache_generation += 1
+        self._cache.clear()
+
+    def get_cache_metrics(self):
+        """
+        Return result cache figures: size, max_size, hits, misses, hit_rate and generation.
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "size": len(self._cache),
+            "max_size": self.cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "generation": self.cache_generation,
+        }
+
+    # ----- Queries -----
+
     def get_top_scores(self, limit=10, player_name=None, mode=None, start_date=None, end_date=None):
         """
         Retrieve the top N game sessions ordered by score (descending).
@@ -88,52 +1360,31 @@ VALUES (?, ?, ?, ?, ?, ?, ?);"""
         Returns:
         - List of dicts, each representing a session.
         """
-        base_sql = "SELECT * FROM sessions"
-        filters = []
-        params = []
-
-        if player_name:
-            filters.append("player_name = ?")
-            params.append(player_name)
-        if mode:
-            filters.append("mode = ?")
-            params.append(mode)
-        if start_date:
-            # Convert start_date to string format if needed
-            if isinstance(start_date, datetime):
-                start_str = start_date.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                try:
-                    start_dt = datetime.fromisoformat(start_date)
-                    start_str = start_dt.strftime("%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    start_str = f"{start_date} 00:00:00"
-            filters.append("timestamp >= ?")
-            params.append(start_str)
-        if end_date:
-            if isinstance(end_date, datetime):
-                end_str = end_date.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                try:
-                    end_dt = datetime.fromisoformat(end_date)
-                    end_str = end_dt.strftime("%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    end_str = f"{end_date} 23:59:59"
-            filters.append("timestamp <= ?")
-            params.append(end_str)
+        start = self._date_bound(start_date, "00:00:00") if start_date else None
+        end = self._date_bound(end_date, "23:59:59") if end_date else None
+        filters, params = self._session_filters(player_name, mode, start, end)
 
         where_clause = ""
         if filters:
             where_clause = " WHERE " + " AND ".join(filters)
 
-        sql = f"{base_sql}{where_clause} ORDER BY score DESC LIMIT ?"
+        sql = f"SELECT {SESSION_COLUMNS} FROM session_details{where_clause} ORDER BY score DESC LIMIT ?"
         params.append(limit)
 
+        key = ("get_top_scores", limit, player_name or None, mode or None, start, end)
+        cached = self._cache_get(key)
+        if cached is not _CACHE_MISS:
+            return cached
         try:
-            self.cursor.execute(sql, tuple(params))
-            rows = self.cursor.fetchall()
+            with self._read_lock():
+                pending = self._pending_sessions(player_name, mode, start, end)
+                self.cursor.execute(sql, tuple(params))
+                rows = self.cursor.fetchall()
             # Convert sqlite3.Row objects to dicts
-            return [dict(row) for row in rows]
+            sessions = [dict(row) for row in rows]
+            if pending:
+                sessions = sorted(sessions + pending, key=lambda session: session["score"], reverse=True)[:limit]
+            return self._cache_put(key, sessions)
         except sqlite3.Error as e:
             print(f"[DataManager] Error retrieving top scores: {e}")
             return []
@@ -150,51 +1401,210 @@ VALUES (?, ?, ?, ?, ?, ?, ?);"""
         Returns:
         - List of dicts, each representing a session, sorted by timestamp descending (newest first).
         """
-        base_sql = "SELECT * FROM sessions"
-        filters = []
-        params = []
+        start = self._date_bound(start_date, "00:00:00") if start_date else None
+        end = self._date_bound(end_date, "23:59:59") if end_date else None
+        filters, params = self._session_filters(None, mode, start, end)
 
         # Filter by player name (required)
-        filters.append("player_name = ?")
-        params.append(player_name)
-
-        if mode:
-            filters.append("mode = ?")
-            params.append(mode)
-        if start_date:
-            if isinstance(start_date, datetime):
-                start_str = start_date.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                try:
-                    start_dt = datetime.fromisoformat(start_date)
-                    start_str = start_dt.strftime("%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    start_str = f"{start_date} 00:00:00"
-            filters.append("timestamp >= ?")
-            params.append(start_str)
-        if end_date:
-            if isinstance(end_date, datetime):
-                end_str = end_date.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                try:
-                    end_dt = datetime.fromisoformat(end_date)
-                    end_str = end_dt.strftime("%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    end_str = f"{end_date} 23:59:59"
-            filters.append("timestamp <= ?")
-            params.append(end_str)
+        filters.insert(0, "player_id = ?")
+        params.insert(0, self.names.find_id("players", player_name))
 
         where_clause = " WHERE " + " AND ".join(filters)
-        sql = f"{base_sql}{where_clause} ORDER BY timestamp DESC"
+        sql = f"SELECT {SESSION_COLUMNS} FROM session_details{where_clause} ORDER BY played_at DESC"
 
         try:
-            self.cursor.execute(sql, tuple(params))
-            rows = self.cursor.fetchall()
-            return [dict(row) for row in rows]
+            with self._read_lock():
+                pending = self._pending_sessions(player_name, mode, start, end)
+                self.cursor.execute(sql, tuple(params))
+                rows = self.cursor.fetchall()
+            sessions = [dict(row) for row in rows]
+            if pending:
+                sessions = sorted(sessions + pending, key=lambda session: session["timestamp"], reverse=True)
+            return sessions
         except sqlite3.Error as e:
             print(f"[DataManager] Error retrieving player history: {e}")
             return []
 
+    def iter_player_history(self, player_name, mode=None, since=None, until=None,
+                            page_size=HISTORY_PAGE_SIZE, newest_first=False):
+        """
+        Stream a player's game sessions, oldest first, without loading them all at once.
+
+        Sessions are read page by page with keyset pagination on (played_at, id): each
+        query continues after the last row of the previous page, so every page is an
+        index range scan and memory use does not grow with the length of the history.
+
+        Parameters:
+        - player_name: str, name of the player
+        - mode: str, if provided, only include sessions of this game mode
+        - since: str or datetime, include sessions on or after this date
+        - until: str or datetime, include sessions on or before this date
+        - page_size: int, rows fetched per query
+        - newest_first: bool, yield the newest session first instead
+
+        Yields:
+        - HistoryRow namedtuples (id is None for queued write-behind sessions)
+        """
+        for page in self._history_pages(SESSION_COLUMNS, player_name, mode, since, until, page_size,
+                                        newest_first):
+            for row in page:
+                yield HistoryRow._make(row)
+
+    def get_player_series(self, player_name, mode=None, since=None, until=None, page_size=HISTORY_PAGE_SIZE):
+        """
+        Return a player's scores over time as columns, oldest first, ready for plotting.
+
+        Only the two columns are read and no per-session objects are built.
+
+        Parameters:
+        - player_name: str, name of the player
+        - mode: str, if provided, only include sessions of this game mode
+        - since: str or datetime, include sessions on or after this date
+        - until: str or datetime, include sessions on or before this date
+        - page_size: int, rows fetched per query
+
+        Returns:
+        - (timestamps, scores): list of str and array of int of the same length
+        """
+        timestamps = []
+        scores = array("q")
+        for page in self._history_pages("timestamp, score", player_name, mode, since, until, page_size):
+            timestamps.extend(row[0] for row in page)
+            scores.extend(row[1] for row in page)
+        return timestamps, scores
+
+    def _history_pages(self, columns, player_name, mode, since, until, page_size, newest_first=False):
+        """
+        Yield pages (lists of tuples of `columns`) of a player's sessions ordered by
+        (played_at, id), followed or preceded by the matching queued sessions.
+        """
+        start = self._date_bound(since, "00:00:00") if since else None
+        end = self._date_bound(until, "23:59:59") if until else None
+        filters, params = self._session_filters(None, mode, start, end)
+        filters.insert(0, "player_id = ?")
+        params.insert(0, self.names.find_id("players", player_name))
+        direction, compare = ("DESC", "<") if newest_first else ("ASC", ">")
+        sql_first = (f"SELECT {columns}, played_at, id FROM session_details WHERE {' AND '.join(filters)} "
+                     f"ORDER BY played_at {direction}, id {direction} LIMIT ?")
+        sql_next = (f"SELECT {columns}, played_at, id FROM session_details WHERE {' AND '.join(filters)} "
+                    f"AND (played_at, id) {compare} (?, ?) ORDER BY played_at {direction}, id {direction} LIMIT ?")
+        names = [name.strip() for name in columns.split(",")]
+        width = len(names)
+
+        def pending_page():
+            pending = sorted(self._pending_sessions(player_name, mode, start, end),
+                             key=lambda session: session["timestamp"], reverse=newest_first)
+            return [tuple(session[name] for name in names) for session in pending]
+
+        # A cursor of its own, so other reads can run while the caller consumes pages
+        cursor = self.conn.cursor()
+        key = None
+        try:
+            while True:
+                with self._read_lock():
+                    if key is None:
+                        cursor.execute(sql_first, tuple(params) + (page_size,))
+                    else:
+                        cursor.execute(sql_next, tuple(params) + key + (page_size,))
+                    rows = cursor.fetchall()
+                    # Queued sessions are the newest: they go after the last page, or
+                    # before the first one when iterating newest first
+                    before = pending_page() if newest_first and key is None else []
+                    after = pending_page() if not newest_first and len(rows) < page_size else []
+                if before:
+                    yield before
+                if rows:
+                    key = tuple(rows[-1][width:])
+                    yield [row[:width] for row in rows]
+                if after:
+                    yield after
+                if len(rows) < page_size:
+                    return
+        except sqlite3.Error as e:
+            print(f"[DataManager] Error retrieving player history: {e}")
+        finally:
+            cursor.close()
+
+    def iter_session_chunks(self, player_name=None, mode=None, start_date=None, end_date=None,
+                            chunk_size=HISTORY_PAGE_SIZE, columns=SESSION_COLUMNS, after_id=0, flush=True):
+        """
+        Stream all sessions matching the filters, in id order, as lists of tuples.
+
+        Each chunk is its own query continuing after the last id of the previous one, so
+        memory use is bounded by `chunk_size` and no read transaction is held open
+        between chunks. Queued write-behind sessions are flushed first, unless `flush`
+        is False.
+
+        Parameters:
+        - player_name: str, if provided, only include this player's sessions
+        - mode: str, if provided, only include sessions of this game mode
+        - start_date: str or datetime, include sessions on or after this date
+        - end_date: str or datetime, include sessions on or before this date
+        - chunk_size: int, rows per chunk
+        - columns: str, comma-separated columns of session_details to select
+        - after_id: int, only include sessions with a larger id (those committed since)
+        - flush: bool, wait for queued sessions first; False reads only what is committed,
+          for callers on the UI thread that pick up later rows by `after_id`
+
+        Yields:
+        - list of tuples of `columns`
+        """
+        if flush and not self.flush(FLUSH_TIMEOUT):
+            print("[DataManager] Queued sessions not committed yet, reading without them")
+        start = self._date_bound(start_date, "00:00:00") if start_date else None
+        end = self._date_bound(end_date, "23:59:59") if end_date else None
+        filters, params = self._session_filters(player_name, mode, start, end)
+        filters.append("id > ?")
+        sql = (f"SELECT {columns}, id FROM session_details WHERE {' AND '.join(filters)} "
+               f"ORDER BY id LIMIT ?")
+        width = len(columns.split(","))
+        # A cursor of its own, so other reads can run while the caller consumes chunks
+        cursor = self.conn.cursor()
+        last_id = after_id
+        try:
+            while True:
+                cursor.execute(sql, tuple(params) + (last_id, chunk_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    return
+                last_id = rows[-1][width]
+                yield [tuple(row)[:width] for row in rows]
+                if len(rows) < chunk_size:
+                    return
+        except sqlite3.Error as e:
+            print(f"[DataManager] Error reading sessions: {e}")
+            raise
+        finally:
+            cursor.close()
+
+    def count_sessions(self, player_name=None, mode=None, start_date=None, end_date=None):
+        """
+        Return the number of committed sessions matching the filters (see get_top_scores).
+        """
+        start = self._date_bound(start_date, "00:00:00") if start_date else None
+        end = self._date_bound(end_date, "23:59:59") if end_date else None
+        filters, params = self._session_filters(player_name, mode, start, end)
+        where_clause = " WHERE " + " AND ".join(filters) if filters else ""
+        try:
+            self.cursor.execute("SELECT COUNT(*) FROM sessions" + where_clause, tuple(params))
+            return self.cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"[DataManager] Error counting sessions: {e}")
+            return 0
+
+    def get_last_session_id(self):
+        """
+        Return the id of the newest committed session (0 if there are none).
+
+        Session ids only grow, so sessions committed later are those with a larger id.
+        """
+        try:
+            self.cursor.execute("SELECT COALESCE(MAX(id), 0) FROM sessions;")
+            return self.cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"[DataManager] Error retrieving last session id: {e}")
+            return 0
+
     def get_stats(self, player_name=None, mode=None, start_date=None, end_date=None):
         """
         Calculate and return statistics about game sessions.
@@ -214,71 +1624,343 @@ VALUES (?, ?, ?, ?, ?, ?, ?);"""
         Returns:
         - dict containing the statistics.
         """
-        base_sql = """SELECT
-    AVG(score) as average_score,
-    MAX(score) as best_score,
-    COUNT(*) as total_games,
-    AVG(accuracy) as average_accuracy
-FROM sessions"""
-        filters = []
-        params = []
-        if player_name:
-            filters.append("player_name = ?")
-            params.append(player_name)
-        if mode:
-            filters.append("mode = ?")
-            params.append(mode)
-        if start_date:
-            if isinstance(start_date, datetime):
-                start_str = start_date.strftime("%Y-%m-%d %H:%M:%S")
+        start = self._date_bound(start_date, "00:00:00") if start_date else None
+        end = self._date_bound(end_date, "23:59:59") if end_date else None
+        day_filters, day_params, raw_ranges = self._split_date_range(start, end)
+        base_filters, base_params = self._session_filters(player_name, mode, None, None)
+
+        key = ("get_stats", player_name or None, mode or None, start, end)
+        cached = self._cache_get(key)
+        if cached is not _CACHE_MISS:
+            return cached
+
+        # games, score sum, best score, accuracy sum, accuracy count
+        parts = []
+        try:
+            with self._read_lock():
+                pending = self._pending_sessions(player_name, mode, start, end)
+                if day_filters is not None:
+                    # Whole days come from the rollup
+                    filters = base_filters + day_filters
+                    where_clause = " WHERE " + " AND ".join(filters) if filters else ""
+                    self.cursor.execute("""SELECT SUM(games), SUM(score_sum), MAX(score_max),
+    TOTAL(accuracy_sum), SUM(accuracy_count)
+FROM daily_stats""" + where_clause, tuple(base_params + day_params))
+                    parts.append(tuple(self.cursor.fetchone()))
+                for range_start, range_end in raw_ranges:
+                    # Partial days come from the sessions themselves
+                    filters, params = self._session_filters(player_name, mode, range_start, range_end)
+                    where_clause = " WHERE " + " AND ".join(filters) if filters else ""
+                    self.cursor.execute("""SELECT COUNT(*), SUM(score), MAX(score), TOTAL(accuracy), COUNT(accuracy)
+FROM sessions""" + where_clause, tuple(params))
+                    parts.append(tuple(self.cursor.fetchone()))
+        except sqlite3.Error as e:
+            print(f"[DataManager] Error calculating statistics: {e}")
+            return {}
+
+        for session in pending:
+            has_accuracy = session["accuracy"] is not None
+            parts.append((1, session["score"], session["score"],
+                          session["accuracy"] if has_accuracy else 0.0, int(has_accuracy)))
+
+        total_games = sum(part[0] or 0 for part in parts)
+        score_sum = sum(part[1] or 0 for part in parts)
+        maxima = [part[2] for part in parts if part[2] is not None]
+        accuracy_sum = sum(part[3] or 0.0 for part in parts)
+        accuracy_count = sum(part[4] or 0 for part in parts)
+        return self._cache_put(key, {
+            "average_score": score_sum / total_games if total_games else 0.0,
+            "best_score": max(maxima) if maxima else 0,
+            "total_games": total_games,
+            "average_accuracy": accuracy_sum / accuracy_count if accuracy_count else 0.0
+        })
+
+    @staticmethod
+    def _split_date_range(start, end):
+        """
+        Split an epoch-second range into whole days, answered from daily_stats, and the
+        partial days at either end, answered from sessions.
+
+        Returns:
+        - day_filters: list of SQL conditions on daily_stats.day, or None if the rollup
+          is not used at all
+        - day_params: list of parameters for day_filters
+        - raw_ranges: list of (start, end) epoch-second ranges (either may be None) to
+          read from sessions
+        """
+        start_day = start // SECONDS_PER_DAY if start else None
+        end_day = end // SECONDS_PER_DAY if end else None
+        start_partial = bool(start) and start % SECONDS_PER_DAY != 0
+        end_partial = bool(end) and end % SECONDS_PER_DAY != SECONDS_PER_DAY - 1
+
+        if start_day is not None and start_day == end_day and (start_partial or end_partial):
+            # A part of a single day
+            return None, [], [(start, end)]
+
+        day_filters, day_params, raw_ranges = [], [], []
+        if start:
+            if start_partial:
+                day_filters.append("day > ?")
+                raw_ranges.append((start, (start_day + 1) * SECONDS_PER_DAY - 1))
             else:
-                try:
-                    start_dt = datetime.fromisoformat(start_date)
-                    start_str = start_dt.strftime("%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    start_str = f"{start_date} 00:00:00"
-            filters.append("timestamp >= ?")
-            params.append(start_str)
-        if end_date:
-            if isinstance(end_date, datetime):
-                end_str = end_date.strftime("%Y-%m-%d %H:%M:%S")
+                day_filters.append("day >= ?")
+            day_params.append(start_day)
+        if end:
+            if end_partial:
+                day_filters.append("day < ?")
+                raw_ranges.append((end_day * SECONDS_PER_DAY, end))
             else:
-                try:
-                    end_dt = datetime.fromisoformat(end_date)
-                    end_str = end_dt.strftime("%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    end_str = f"{end_date} 23:59:59"
-            filters.append("timestamp <= ?")
-            params.append(end_str)
+                day_filters.append("day <= ?")
+            day_params.append(end_day)
+        return day_filters, day_params, raw_ranges
 
-        where_clause = ""
-        if filters:
-            where_clause = " WHERE " + " AND ".join(filters)
+    # ----- Leaderboards -----
 
-        sql = base_sql + where_clause
+    def _pending_bests(self, mode, level):
+        """
+        Return {player_name: (score, timestamp)} of the best queued, not yet committed
+        session of every player in `mode` (and `level`, unless ALL_LEVELS).
+
+        Must be called while holding _read_lock().
+        """
+        bests = {}
+        if self.writer is None:
+            return bests
+        for player, score, session_level, played_at, duration, accuracy, session_mode in self.writer.pending.values():
+            if session_mode != mode or (level != ALL_LEVELS and session_level != level):
+                continue
+            if player not in bests or score > bests[player][0]:
+                bests[player] = (score, self._format_epoch(played_at))
+        return bests
+
+    def get_leaderboard(self, mode, level=ALL_LEVELS, limit=10):
+        """
+        Return the top players of a game mode, best score first.
+
+        Reads the leaderboard table, so the cost depends on `limit`, not on the number
+        of sessions. Players with the same best score share a rank; the one whose best
+        session was played first is listed first.
+
+        Parameters:
+        - mode: str, game mode
+        - level: int, game level, or ALL_LEVELS for each player's best over all levels
+        - limit: int, number of players
+
+        Returns:
+        - List of dicts with rank, player_name, best_score, session_id (None while the
+          session is still queued) and timestamp.
+        """
+        sql = LEADERBOARD_SELECT + """
+WHERE l.mode_id = ? AND l.level = ? ORDER BY l.best_score DESC, l.played_at LIMIT ?"""
+        key = ("get_leaderboard", mode, level, limit)
+        cached = self._cache_get(key)
+        if cached is not _CACHE_MISS:
+            return cached
         try:
-            self.cursor.execute(sql, tuple(params))
-            row = self.cursor.fetchone()
-            if row:
-                stats = {
-                    "average_score": row["average_score"] if row["average_score"] is not None else 0.0,
-                    "best_score": row["best_score"] if row["best_score"] is not None else 0,
-                    "total_games": row["total_games"],
-                    "average_accuracy": row["average_accuracy"] if row["average_accuracy"] is not None else 0.0
-                }
-                return stats
+            with self._read_lock():
+                pending = self._pending_bests(mode, level)
+                self.cursor.execute(sql, (self.names.find_id("modes", mode), level, limit + len(pending)))
+                rows = [dict(row) for row in self.cursor.fetchall()]
+                # Queued sessions can lift players that are not in the fetched rows at all
+                for player in pending.keys() - {row["player_name"] for row in rows}:
+                    best = self._leaderboard_row(player, mode, level)
+                    if best is not None:
+                        rows.append(best)
+        except sqlite3.Error as e:
+            print(f"[DataManager] Error retrieving leaderboard: {e}")
+            return []
+
+        entries = {row["player_name"]: row for row in rows}
+        for player, (score, timestamp) in pending.items():
+            entry = entries.get(player)
+            if entry is None or score > entry["best_score"]:
+                entries[player] = {"player_name": player, "best_score": score, "session_id": None,
+                                   "timestamp": timestamp}
+        ranked = sorted(entries.values(), key=lambda entry: (-entry["best_score"], entry["timestamp"]))[:limit]
+        for position, entry in enumerate(ranked):
+            if position > 0 and entry["best_score"] == ranked[position - 1]["best_score"]:
+                entry["rank"] = ranked[position - 1]["rank"]
             else:
-                return {}
+                entry["rank"] = position + 1
+        return self._cache_put(key, ranked)
+
+    def _leaderboard_row(self, player_name, mode, level):
+        self.cursor.execute(LEADERBOARD_SELECT + """
+WHERE l.mode_id = ? AND l.level = ? AND l.player_id = ?""",
+                            (self.names.find_id("modes", mode), level, self.names.find_id("players", player_name)))
+        row = self.cursor.fetchone()
+        return dict(row) if row else None
+
+    def get_best_sessions(self, level=ALL_LEVELS, mode=None):
+        """
+        Return every player's best committed session of each game mode, in no particular
+        order.
+
+        One row per leaderboard entry, joined with the session for its duration, so the
+        cost depends on the number of players and modes, not on the number of sessions.
+
+        Parameters:
+        - level: int, game level, or ALL_LEVELS for each player's best over all levels
+        - mode: str, if provided, only include this game mode
+
+        Returns:
+        - List of LeaderboardRow namedtuples
+        """
+        sql = BEST_SESSIONS_SELECT + "\nWHERE l.level = ?"
+        params = [level]
+        if mode:
+            sql += " AND l.mode_id = ?"
+            params.append(self.names.find_id("modes", mode))
+        # Plain tuples rather than sqlite3.Row: there is a row per player and mode
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        try:
+            cursor.execute(sql, tuple(params))
+            return list(map(LeaderboardRow._make, cursor.fetchall()))
         except sqlite3.Error as e:
-            print(f"[DataManager] Error calculating statistics: {e}")
+            print(f"[DataManager] Error retrieving best sessions: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def get_personal_best(self, player_name, mode, level=ALL_LEVELS):
+        """
+        Return a player's best session in a game mode.
+
+        Parameters:
+        - player_name: str, name of the player
+        - mode: str, game mode
+        - level: int, game level, or ALL_LEVELS for the best over all levels
+
+        Returns:
+        - dict with player_name, best_score, session_id and timestamp, or None if the
+          player has not played the mode (level)
+        """
+        key = ("get_personal_best", player_name, mode, level)
+        cached = self._cache_get(key)
+        if cached is not _CACHE_MISS:
+            return cached
+        try:
+            with self._read_lock():
+                pending = self._pending_bests(mode, level).get(player_name)
+                best = self._leaderboard_row(player_name, mode, level)
+        except sqlite3.Error as e:
+            print(f"[DataManager] Error retrieving personal best: {e}")
+            return None
+        if pending is not None and (best is None or pending[0] > best["best_score"]):
+            best = {"player_name": player_name, "best_score": pending[0], "session_id": None,
+                    "timestamp": pending[1]}
+        return self._cache_put(key, best)
+
+    def get_player_rank(self, player_name, mode, level=ALL_LEVELS):
+        """
+        Return a player's rank on a leaderboard: 1 + the number of players with a
+        strictly higher best score.
+
+        Parameters:
+        - player_name: str, name of the player
+        - mode: str, game mode
+        - level: int, game level, or ALL_LEVELS
+
+        Returns:
+        - int, or None if the player is not on the leaderboard
+        """
+        key = ("get_player_rank", player_name, mode, level)
+        cached = self._cache_get(key)
+        if cached is not _CACHE_MISS:
+            return cached
+        try:
+            with self._read_lock():
+                pending = self._pending_bests(mode, level)
+                best = self._leaderboard_row(player_name, mode, level)
+                score = best["best_score"] if best else None
+                if player_name in pending and (score is None or pending[player_name][0] > score):
+                    score = pending[player_name][0]
+                if score is None:
+                    return self._cache_put(key, None)
+                self.cursor.execute("""SELECT COUNT(*) FROM leaderboard
+WHERE mode_id = ? AND level = ? AND best_score > ?""", (self.names.find_id("modes", mode), level, score))
+                higher = self.cursor.fetchone()[0]
+                # Players only lifted above `score` by queued sessions
+                for player, (pending_score, timestamp) in pending.items():
+                    if player == player_name or pending_score <= score:
+                        continue
+                    committed = self._leaderboard_row(player, mode, level)
+                    if committed is None or committed["best_score"] <= score:
+                        higher += 1
+        except sqlite3.Error as e:
+            print(f"[DataManager] Error retrieving player rank: {e}")
+            return None
+        return self._cache_put(key, higher + 1)
+
+    def rebuild_leaderboards(self):
+        """
+        Regenerate the leaderboard table (and its triggers) from the sessions table.
+        """
+        self._rebuild(list(LEADERBOARD_TRIGGERS.values()) + LEADERBOARD_REBUILD, "leaderboards")
+
+    def rebuild_daily_stats(self):
+        """
+        Regenerate the daily_stats rollup (and its triggers) from the sessions table.
+        """
+        self._rebuild(list(DAILY_STATS_TRIGGERS.values()) + DAILY_STATS_REBUILD, "daily stats")
+
+    def _rebuild(self, statements, name):
+        self.flush()
+        self.invalidate_cache()
+        try:
+            with self.conn:
+                self.cursor.execute("BEGIN IMMEDIATE;")
+                for statement in statements:
+                    self.cursor.execute(statement)
+        except sqlite3.Error as e:
+            print(f"[DataManager] Error rebuilding {name}: {e}")
+            raise
+
+    def flush(self, timeout=None):
+        """
+        Write-behind mode: wait until every queued session is committed.
+
+        Returns:
+        - bool, False if `timeout` seconds passed first (always True otherwise)
+        """
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+
+    def get_writer_metrics(self):
+        """
+        Return write-behind metrics: queue_depth, pending_rows, batches, rows_written,
+        errors, last/max/avg_batch_size, last/max/avg_commit_ms and daemon (True while
+        batches go to the database daemon).
+
+        Returns:
+        - dict, empty if the DataManager is not in write-behind mode
+        """
+        if self.writer is None:
             return {}
+        return self.writer.metrics()
 
     def close(self):
         """
-        Close the database connection.
+        Close the database connection, committing any queued sessions first.
         """
+        writer = getattr(self, 'writer', None)
+        if writer is not None:
+            writer.close()
+            self.writer = None
+        daemon = getattr(self, 'daemon', None)
+        if daemon is not None:
+            daemon.close()
+            self.daemon = None
         if hasattr(self, 'conn') and self.conn:
+            try:
+                # Refresh planner statistics if they have gone stale; cheap when they have not
+                self.conn.execute("PRAGMA optimize;")
+            except sqlite3.Error:
+                pass
             self.conn.close()
+            self.conn = None
 
     def __del__(self):
         """
@@ -289,12 +1971,84 @@ FROM sessions"""
         except Exception:
             pass
 
+
+class _NoLock:
+    """
+    Stand-in for the writer lock when there is no writer.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_LOCK = _NoLock()
+
+# Returned by DataManager._cache_get() when a result is not cached (None is a valid result)
+_CACHE_MISS = object()
+
+# Shared write-behind DataManagers, one per database file
+_shared_managers = {}
+
+
+def get_data_manager(db_name="game_data.db"):
+    """
+    Return the process-wide write-behind DataManager for a database file.
+
+    Screens should use this rather than creating their own DataManager, so a run of the
+    suite has a single writer thread per database, flushed when the program exits.
+    """
+    path = os.path.abspath(db_name)
+    manager = _shared_managers.get(path)
+    if manager is None:
+        manager = DataManager(path, write_behind=True)
+        _shared_managers[path] = manager
+    return manager
+
+def main():
+    """
+    Maintenance commands.
+
+    Usage: python data_manager.py rebuild-leaderboards|rebuild-daily-stats [database]
+    """
+    commands = {
+        "rebuild-leaderboards": ("rebuild_leaderboards", "leaderboard"),
+        "rebuild-daily-stats": ("rebuild_daily_stats", "daily_stats"),
+    }
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print("Usage: python data_manager.py rebuild-leaderboards|rebuild-daily-stats [database]")
+        return 1
+    method, table = commands[sys.argv[1]]
+    dm = DataManager(sys.argv[2] if len(sys.argv) > 2 else "game_data.db")
+    start = time.perf_counter()
+    getattr(dm, method)()
+    dm.cursor.execute(f"SELECT COUNT(*) FROM {table};")
+    print(f"[DataManager] Rebuilt {dm.cursor.fetchone()[0]} {table} rows "
+          f"in {time.perf_counter() - start:.2f}s")
+    dm.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
 # Example usage:
 # dm = DataManager("game_data.db")
 # dm.save_session("Alice", 200, 3, 60.0, 0.75, "Classic")
+# ids = dm.save_sessions([("Bob", 150, 2, 45.0, None, "Classic"), {"player_name": "Eve", "score": 90,
+#                         "level": 1, "duration": 30.0, "accuracy": 0.5, "mode": "Classic"}])
 # top_scores = dm.get_top_scores(5)
+# leaders = dm.get_leaderboard("Classic", level=3, limit=5)
+# rank = dm.get_player_rank("Alice", "Classic")
+# bests = dm.get_best_sessions(level=3)  # every player's best per mode, for rankings_engine
 # history = dm.get_player_history("Alice")
+# for session in dm.iter_player_history("Alice", mode="Classic"):
+#     print(session.timestamp, session.score)
+# timestamps, scores = dm.get_player_series("Alice")
 # stats_alice = dm.get_stats(player_name="Alice")
 # stats_global = dm.get_stats()
+# print(dm.get_cache_metrics())
 # print(top_scores, history, stats_alice, stats_global)
 # dm.close()
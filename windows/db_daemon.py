@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+import socket
+import sqlite3
+import argparse
+import threading
+import socketserver
+
+from data_manager import (DataManager, DaemonClient, SessionWriter, WRITE_BATCH_SIZE, WRITE_QUEUE_SIZE,
+                          daemon_file)
+
+# Address the daemon listens on; port 0 picks a free port, which is announced in the daemon file
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 0
+
+# Seconds the daemon waits for more rows before committing. Clients wait for the commit, so
+# it does not wait at all: rows arriving while a batch commits go into the next batch together
+DAEMON_BATCH_INTERVAL = 0.0
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Serves one client connection: one JSON request per line, one JSON reply per line.
+    """
+
+    def handle(self):
+        daemon = self.server.database_daemon
+        for line in self.rfile:
+            try:
+                reply = daemon.handle_request(json.loads(line))
+            except (ValueError, KeyError, TypeError, TimeoutError, sqlite3.Error) as e:
+                reply = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class DatabaseDaemon:
+    """
+    DatabaseDaemon is the single writer of a database file for every game process on
+    this machine.
+
+    Game processes find it through the daemon file next to the database (see
+    data_manager.daemon_file) and send their sessions over localhost TCP. Each
+    connection is served by its own thread, which hands the rows to one SessionWriter
+    and waits for the commit, so concurrent saves share transactions instead of
+    fighting over the database lock. Readers keep using their own connections.
+
+    Attributes:
+    - db_path: str, absolute path of the database file
+    - writer: SessionWriter committing the sessions
+    - server: socketserver.ThreadingTCPServer accepting the game processes
+    """
+
+    def __init__(self, db_name="game_data.db", host=DAEMON_HOST, port=DAEMON_PORT, batch_size=WRITE_BATCH_SIZE,
+                 batch_interval=DAEMON_BATCH_INTERVAL, queue_size=WRITE_QUEUE_SIZE):
+        """
+        Parameters:
+        - db_name: str, path to the SQLite database file
+        - host: str, address to listen on
+        - port: int, port to listen on (0 for any free port)
+        - batch_size: int, most rows per transaction
+        - batch_interval: float, seconds to wait for more rows before committing
+        - queue_size: int, most queued save requests before new ones wait
+        """
+        self.db_path = os.path.abspath(db_name)
+        # Bring the schema up to date before anything is written through the daemon
+        DataManager(self.db_path, cache_size=0, use_daemon=False).close()
+        self.writer = SessionWriter(self.db_path, batch_size, batch_interval, queue_size)
+        self.server = socketserver.ThreadingTCPServer((host, port), _RequestHandler)
+        self.server.daemon_threads = True
+        self.server.database_daemon = self
+
+    def handle_request(self, request):
+        """
+        Answer one client request.
+
+        Requests:
+        - {"op": "hello"}: the database path and the daemon's process id
+        - {"op": "save", "rows": [...]}: commit session rows, reply with their ids
+        - {"op": "metrics"}: the writer's metrics
+        - {"op": "stop"}: shut the daemon down
+        """
+        if not isinstance(request, dict):
+            raise TypeError("a request must be a JSON object")
+        op = request.get("op")
+        if op == "hello":
+            return {"ok": True, "db": self.db_path, "pid": os.getpid()}
+        if op == "save":
+            return {"ok": True, "ids": self.writer.write([tuple(row) for row in request["rows"]])}
+        if op == "metrics":
+            return {"ok": True, "metrics": self.writer.metrics()}
+        if op == "stop":
+            # shutdown() waits for serve_forever() to return, so not from a handler thread
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown request {op!r}"}
+
+    def serve_forever(self):
+        """
+        Announce the daemon and serve until stopped (a "stop" request or Ctrl+C).
+        """
+        self._announce()
+        host, port = self.server.server_address
+        print(f"[DatabaseDaemon] Serving {self.db_path} on {host}:{port}")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def _announce(self):
+        host, port = self.server.server_address
+        info = {"host": host, "port": port, "pid": os.getpid(), "hostname": socket.gethostname(),
+                "db": self.db_path}
+        path = daemon_file(self.db_path)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        """
+        Withdraw the announcement, stop accepting clients and commit what is queued.
+        """
+        path = daemon_file(self.db_path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                ours = json.load(f).get("pid") == os.getpid()
+            if ours:
+                os.remove(path)
+        except (OSError, ValueError):
+            pass
+        self.server.server_close()
+        self.writer.close()
+        print(f"[DatabaseDaemon] Stopped ({self.writer.rows_written} sessions in {self.writer.batches} batches)")
+
+
+def main():
+    """
+    Run, query or stop the database daemon.
+
+    Usage:
+      python db_daemon.py [database] [--port 0] [--batch-size 500] [--batch-interval 0]
+      python db_daemon.py [database] --status
+      python db_daemon.py [database] --stop
+    """
+    parser = argparse.ArgumentParser(description="Single-writer daemon for the SkillScape database")
+    parser.add_argument("database", nargs="?", default="game_data.db")
+    parser.add_argument("--host", default=DAEMON_HOST)
+    parser.add_argument("--port", type=int, default=DAEMON_PORT)
+    parser.add_argument("--batch-size", type=int, default=WRITE_BATCH_SIZE)
+    parser.add_argument("--batch-interval", type=float, default=DAEMON_BATCH_INTERVAL)
+    parser.add_argument("--status", action="store_true", help="print the running daemon's writer metrics")
+    parser.add_argument("--stop", action="store_true", help="stop the running daemon")
+    args = parser.parse_args()
+
+    client = DaemonClient.connect(args.database)
+    if args.status or args.stop:
+        if client is None:
+            print(f"[DatabaseDaemon] No daemon is running for {os.path.abspath(args.database)}")
+            return 1
+        reply = client.request({"op": "stop"} if args.stop else {"op": "metrics"})
+        if args.status:
+            print(json.dumps(reply["metrics"], indent=2))
+        client.close()
+        return 0
+    if client is not None:
+        client.close()
+        print(f"[DatabaseDaemon] A daemon is already running for {os.path.abspath(args.database)}")
+        return 1
+
+    DatabaseDaemon(args.database, args.host, args.port, args.batch_size, args.batch_interval).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
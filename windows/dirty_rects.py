@@ -0,0 +1,224 @@
+import os
+
+import pygame
+
+from text_cache import get_font
+
+# Set SKILLSCAPE_DIRTY_RECTS=0 to go back to redrawing and flipping every frame
+DIRTY_RECTS_ENABLED = os.environ.get("SKILLSCAPE_DIRTY_RECTS", "1") != "0"
+
+# Set SKILLSCAPE_DIRTY_DEBUG=1 to start with the debug overlay shown (F3 toggles it)
+DEBUG_OVERLAY = os.environ.get("SKILLSCAPE_DIRTY_DEBUG", "0") == "1"
+
+DEBUG_KEY = pygame.K_F3
+DEBUG_COLOR = (255, 0, 255)
+
+# Window events after which the whole window has to be repainted
+REPAINT_EVENTS = {
+    getattr(pygame, name)
+    for name in ("VIDEOEXPOSE", "WINDOWEXPOSED", "WINDOWRESTORED", "WINDOWSIZECHANGED")
+    if hasattr(pygame, name)
+}
+
+
+def merge_rects(rects, bounds):
+    """
+    Clip rectangles to `bounds` and merge the ones that overlap.
+
+    Returns:
+    - list of pygame.Rect with no two rectangles overlapping
+    """
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect).clip(bounds)
+        if rect.width == 0 or rect.height == 0:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRenderer:
+    """
+    DirtyRenderer lets a mostly static screen repaint only the regions that changed.
+
+    Every frame the screen reports its interactive widgets with track() or
+    track_hover(). A widget whose rectangle or state differs from the previous frame
+    marks its old and new rectangles dirty. begin_frame() then clips the display
+    surface to the dirty area, so the screen's usual drawing code only touches those
+    pixels, and present() pushes just those rectangles with pygame.display.update().
+    When nothing is dirty, begin_frame() returns False and the frame can be skipped.
+
+    The first frame, and any frame after invalidate() or a window expose event, is
+    drawn and flipped in full. The debug overlay outlines the rectangles of the last
+    update and shows how much of the frame they cover.
+
+    Attributes:
+    - screen: pygame.Surface, the display surface
+    - enabled: bool, False to redraw and flip every frame as before
+    - debug: bool, True to show the debug overlay
+    - frames: int, number of frames presented
+    - full_frames: int, number of those frames that were flipped in full
+    - pixels_updated: int, total number of pixels pushed to the display
+    """
+
+    def __init__(self, screen, enabled=DIRTY_RECTS_ENABLED, debug=DEBUG_OVERLAY):
+        """
+        Parameters:
+        - screen: pygame.Surface, the display surface
+        - enabled: bool, use dirty rectangles (False redraws every frame)
+        - debug: bool, show the debug overlay
+        """
+        self.screen = screen
+        self.enabled = enabled
+        self.debug = debug
+        self.frames = 0
+        self.full_frames = 0
+        self.pixels_updated = 0
+        self._regions = {}
+        self._dirty = []
+        self._full = True
+        self._overlay = []
+
+    # ----- Reporting changes -----
+
+    def invalidate(self):
+        """
+        Repaint the whole screen on the next frame.
+        """
+        self._full = True
+
+    def mark(self, rect):
+        """
+        Repaint `rect` on the next frame.
+        """
+        self._dirty.append(pygame.Rect(rect))
+
+    def track(self, key, rect, state=None):
+        """
+        Report a widget's rectangle and visual state for this frame.
+
+        Parameters:
+        - key: hashable, identifies the widget from frame to frame
+        - rect: pygame.Rect or (x, y, width, height), area the widget draws into
+        - state: any comparable value that changes whenever the widget looks different
+        """
+        rect = pygame.Rect(rect)
+        previous = self._regions.get(key)
+        if previous == (rect, state):
+            return
+        if previous is not None:
+            self.mark(previous[0])
+        self.mark(rect)
+        self._regions[key] = (rect, state)
+
+    def track_hover(self, rect):
+        """
+        Report a button whose only visual state is whether the mouse is over it.
+        """
+        rect = pygame.Rect(rect)
+        self.track(("hover", tuple(rect)), rect, rect.collidepoint(pygame.mouse.get_pos()))
+
+    def handle_event(self, event):
+        """
+        Let the renderer see an event: window exposes force a full repaint and the
+        debug key toggles the overlay.
+        """
+        if event.type in REPAINT_EVENTS:
+            self.invalidate()
+        elif event.type == pygame.KEYDOWN and event.key == DEBUG_KEY:
+            self.debug = not self.debug
+            self.invalidate()
+
+    # ----- Drawing -----
+
+    def begin_frame(self):
+        """
+        Prepare the display surface for drawing this frame.
+
+        Returns:
+        - bool, False if nothing changed and the frame does not need drawing at all
+        """
+        if self._full or not self.enabled:
+            self.screen.set_clip(None)
+            return True
+        if not self._dirty:
+            return False
+        self._dirty = merge_rects(self._dirty, self.screen.get_rect())
+        self.screen.set_clip(self._dirty[0].unionall(self._dirty[1:]))
+        return True
+
+    def present(self):
+        """
+        Push this frame to the display (replaces pygame.display.flip()).
+        """
+        self.screen.set_clip(None)
+        full = self._full or not self.enabled
+        if full:
+            rects = [self.screen.get_rect()]
+        else:
+            rects = merge_rects(self._dirty, self.screen.get_rect())
+
+        # Erase the outlines of the previous update from the display
+        updates = rects + self._overlay
+        self._overlay = []
+        saved = []
+        if self.debug:
+            saved = self._draw_overlay(rects, full)
+            self._overlay = [rect for rect, pixels in saved]
+            updates += self._overlay
+
+        if full:
+            pygame.display.flip()
+        elif updates:
+            pygame.display.update(updates)
+
+        # Keep the overlay off the display surface so partial repaints never pick it up
+        for rect, pixels in reversed(saved):
+            self.screen.blit(pixels, rect)
+
+        self.frames += 1
+        if full:
+            self.full_frames += 1
+        self.pixels_updated += sum(rect.width * rect.height for rect in rects)
+        self._dirty = []
+        self._full = False
+
+    def _draw_overlay(self, rects, full):
+        """
+        Outline the updated rectangles and label them with their share of the frame.
+
+        Returns:
+        - list of (rect, surface) holding the pixels the overlay covered
+        """
+        bounds = self.screen.get_rect()
+        area = sum(rect.width * rect.height for rect in rects)
+        label = "full frame" if full else f"{len(rects)} rects, {100 * area / (bounds.width * bounds.height):.1f}% of frame"
+        # Rendered directly: the label changes every frame and would only churn the text cache
+        text = get_font("Arial", 16).render(label, True, DEBUG_COLOR, (0, 0, 0))
+        label_rect = text.get_rect(topleft=(4, 4))
+
+        saved = []
+        for rect in rects + [label_rect]:
+            rect = rect.clip(bounds)
+            saved.append((rect, self.screen.subsurface(rect).copy()))
+        for rect in rects:
+            pygame.draw.rect(self.screen, DEBUG_COLOR, rect, 2)
+        self.screen.blit(text, label_rect)
+        return saved
+
+    def info(self):
+        """
+        Return a dict with frames, full_frames, pixels_updated and the average
+        fraction of the screen updated per frame.
+        """
+        width, height = self.screen.get_size()
+        return {
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "pixels_updated": self.pixels_updated,
+            "updated_fraction": self.pixels_updated / (self.frames * width * height) if self.frames else 0.0,
+        }
@@ -1,6 +1,12 @@
 import pygame
 import sys
 import os
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from dirty_rects import DirtyRenderer
 
 # Constants
 SCREEN_WIDTH = 800
@@ -48,9 +54,9 @@ def show_summary(screen, game_data):
         pygame.mixer.music.play(-1)  # -1 means loop indefinitely
 
     # Prepare fonts
-    big_font = pygame.font.SysFont('Arial', 48, bold=True)
-    medium_font = pygame.font.SysFont('Arial', 32)
-    font = pygame.font.SysFont('Arial', 24)
+    big_font = get_font('Arial', 48, bold=True)
+    medium_font = get_font('Arial', 32)
+    font = get_font('Arial', 24)
 
     # Calculate star rating based on score (out of 10 possible points)
     if game_data['score'] >= 9:
@@ -84,10 +90,13 @@ def show_summary(screen, game_data):
     # Main loop for the summary screen
     summary_running = True
     action = None
+    frames = FrameScheduler()
+    renderer = DirtyRenderer(screen)
 
     while summary_running:
         # Handle events
         for event in pygame.event.get():
+            renderer.handle_event(event)
             if event.type == pygame.QUIT:
                 return "quit"
             # Check for button clicks
@@ -103,22 +112,18 @@ def show_summary(screen, game_data):
                         # Simply run the next game and quit
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        os.system(f"{sys.executable} footballquiz_instructions.py")
+                        navigate("footballquiz_instructions.py")
                         sys.exit()
 
+        if not renderer.begin_frame():
+            frames.tick()
+            continue
+
         # Draw background with gradient
-        for y in range(SCREEN_HEIGHT):
-            # Create a gradient from dark blue to light blue
-            color = (
-                int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-            )
-            pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+        screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Title
-        title_text = big_font.render("English Pro Complete!", True, WHITE)
+        title_text = render_text(big_font, "English Pro Complete!", True, WHITE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 70))
 
         # Add a fancy box around the title
@@ -134,7 +139,7 @@ def show_summary(screen, game_data):
         screen.blit(title_text, title_rect)
 
         # Performance message
-        performance_text = medium_font.render(performance_msg, True, WHITE)
+        performance_text = render_text(medium_font, performance_msg, True, WHITE)
         screen.blit(performance_text,
                     (SCREEN_WIDTH // 2 - performance_text.get_width() // 2, 130))
 
@@ -174,7 +179,7 @@ def show_summary(screen, game_data):
         pygame.draw.rect(screen, BLACK, summary_box, width=2, border_radius=10)
 
         # Summary heading
-        summary_heading = medium_font.render("Game Summary", True, BLACK)
+        summary_heading = render_text(medium_font, "Game Summary", True, BLACK)
         screen.blit(summary_heading,
                     (SCREEN_WIDTH // 2 - summary_heading.get_width() // 2, 240))
 
@@ -187,28 +192,28 @@ def show_summary(screen, game_data):
         y_pos = 300
 
         # Final score
-        final_score_text = font.render(f"Final Score: {game_data['score']}/10", True, BLACK)
+        final_score_text = render_text(font, f"Final Score: {game_data['score']}/10", True, BLACK)
         screen.blit(final_score_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Word Completion score
-        word_text = font.render(f"Word Completion: {game_data['completion_score']}/5", True, BLACK)
+        word_text = render_text(font, f"Word Completion: {game_data['completion_score']}/5", True, BLACK)
         screen.blit(word_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Memory score
-        memory_text = font.render(f"Memory Game: {game_data['memory_score']}/5", True, BLACK)
+        memory_text = render_text(font, f"Memory Game: {game_data['memory_score']}/5", True, BLACK)
         screen.blit(memory_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Time taken
-        time_text = font.render(f"Time Taken: {game_data['time']:.1f} seconds", True, BLACK)
+        time_text = render_text(font, f"Time Taken: {game_data['time']:.1f} seconds", True, BLACK)
         screen.blit(time_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Accuracy
         accuracy = int((game_data['score'] / 10) * 100)
-        accuracy_text = font.render(f"Accuracy: {accuracy}%", True, BLACK)
+        accuracy_text = render_text(font, f"Accuracy: {accuracy}%", True, BLACK)
         screen.blit(accuracy_text, (summary_box.left + 30, y_pos))
 
         # Continue button
@@ -217,12 +222,12 @@ def show_summary(screen, game_data):
         pygame.draw.rect(screen, GREEN, continue_rect, border_radius=10)
         pygame.draw.rect(screen, BLACK, continue_rect, width=2, border_radius=10)
 
-        continue_text = font.render("Continue", True, BLACK)
+        continue_text = render_text(font, "Continue", True, BLACK)
         continue_text_rect = continue_text.get_rect(center=continue_rect.center)
         screen.blit(continue_text, continue_text_rect)
 
-        pygame.display.flip()
-        pygame.time.Clock().tick(60)
+        renderer.present()
+        frames.tick()
 
     return action
 
@@ -234,6 +239,8 @@ def save_game_data(game_data):
     Parameters:
     game_data (dict): Dictionary containing game statistics
     """
+    get_session().record_result("English Pro", game_data)
+
     try:
         # Create a more detailed data file for the final summary
         with open("englishpro_data.txt", "w") as f:
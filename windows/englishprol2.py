@@ -1,8 +1,11 @@
 import pygame
 import random
 import sys
-import os
 import time
+from scene_router import navigate
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
 
 # Initialize pygame
 pygame.init()
@@ -21,20 +24,13 @@ GREEN = (0, 255, 0)
 
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("English Pro - Level 2")
+frames = FrameScheduler()
 
-font = pygame.font.SysFont('Arial', 48)
-small_font = pygame.font.SysFont('Arial', 36)
+font = get_font('Arial', 48)
+small_font = get_font('Arial', 36)
 
 # Create a gradient background similar to your other games
-background_img = pygame.Surface((WIDTH, HEIGHT))
-for y in range(HEIGHT):
-    # Create a gradient from dark blue to light blue
-    color = (
-        int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / HEIGHT),
-        int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / HEIGHT),
-        int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / HEIGHT)
-    )
-    pygame.draw.line(background_img, color, (0, y), (WIDTH, y))
+background_img = get_gradient((WIDTH, HEIGHT), (DARK_BLUE, LIGHT_BLUE))
 
 # Level 2 has longer words
 words = [
@@ -44,7 +40,7 @@ words = [
 
 
 def draw_text(text, font, color, surface, x, y):
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, True, color)
     text_rect = text_obj.get_rect(center=(x, y))
     surface.blit(text_obj, text_rect)
 
@@ -68,6 +64,7 @@ def create_modern_button(text, x, y, width, height, active=False):
 def playing_game_with_boxes(puzzle_word, correct_word, title):
     input_text = ""
     while True:
+        frames.mark_draw()
         screen.blit(background_img, (0, 0))
 
         # Draw a title box
@@ -105,6 +102,7 @@ def playing_game_with_boxes(puzzle_word, correct_word, title):
         submit_button, submit_hovered = create_modern_button("Submit", WIDTH // 2 - 60, 450, 120, 50, active=True)
 
         pygame.display.update()
+        frames.tick()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -146,6 +144,7 @@ def memory_game(word):
 def memory_input_phase(correct_word):
     input_text = ""
     while True:
+        frames.mark_draw()
         screen.blit(background_img, (0, 0))
 
         # Draw a title box
@@ -166,6 +165,7 @@ def memory_input_phase(correct_word):
         submit_button, submit_hovered = create_modern_button("Submit", WIDTH // 2 - 60, 450, 120, 50, active=True)
 
         pygame.display.update()
+        frames.tick()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -234,7 +234,7 @@ def main():
 
     # Create a fancy message box
     message_text = f"Game Complete!"
-    message_font = font.render(message_text, True, WHITE)
+    message_font = render_text(font, message_text, True, WHITE)
     message_rect = message_font.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
 
     pygame.draw.rect(screen, DEEP_BLUE,
@@ -256,7 +256,7 @@ def main():
     pygame.draw.rect(screen, BLACK, continue_button, width=2, border_radius=10)
 
     # Create button text
-    button_text = small_font.render("Continue", True, BLACK)
+    button_text = render_text(small_font, "Continue", True, BLACK)
     button_rect = button_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 50 + button_height // 2))
     screen.blit(button_text, button_rect)
 
@@ -269,6 +269,7 @@ def main():
     # Wait for continue button click
     waiting = True
     while waiting:
+        frames.tick()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
@@ -276,8 +277,7 @@ def main():
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1 and continue_button.collidepoint(event.pos):  # Left click on continue button
                     waiting = False
-                    pygame.quit()
-                    os.system(f"{sys.executable} englishpro_summary.py")
+                    navigate("englishpro_summary.py")
                     sys.exit()
 
         # Update hover state for button (change button color on hover)
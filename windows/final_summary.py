@@ -2,9 +2,17 @@ import pygame
 import sys
 import os
 import json
+import time
 import pathlib
-from data_manager import DataManager
-import matplotlib.pyplot as plt
+from data_manager import DataManager, get_data_manager, FLUSH_TIMEOUT
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from dirty_rects import DirtyRenderer
+from charts import get_line_chart, get_sparkline, save_chart
+from background_job import BackgroundJob
 
 
 # Constants
@@ -20,6 +28,12 @@ GOLD = (255, 215, 0)
 DARK_BLUE = (0, 50, 150)
 RED = (200, 0, 0)
 
+# Size of the score history chart saved as player_progress.png
+PROGRESS_CHART_SIZE = (800, 400)
+
+# Size of the score history sparkline shown under the summary
+SPARKLINE_SIZE = (120, 24)
+
 # Try to load background music
 try:
     pygame.mixer.init()
@@ -34,42 +48,41 @@ try:
 except Exception as e:
     print(f"Warning: Could not initialize music for final summary screen. Error: {e}")
     music_loaded = False
-import matplotlib.pyplot as plt
 
-def plot_player_progress(player_name, dm):
+def plot_player_progress(player_name, series):
+    """
+    Chart the player's score history and save it as player_progress.png.
+
+    The chart is drawn with pygame and cached by its data, so it is only rendered and
+    written again when the history changed. Use `python charts.py PLAYER` for a
+    high-resolution copy.
+
+    Parameters:
+    - player_name: str, name of the player
+    - series: (timestamps, scores) as returned by DataManager.get_player_series
+
+    Returns:
+    - pygame.Surface with the chart, or None without history
+    """
     try:
-        history = dm.get_player_history(player_name)
-        if not history:
+        dates, scores = series
+        if not dates:
             print("No history found to plot.")
-            return
-
-        dates = [row['timestamp'] for row in history]
-        scores = [row['score'] for row in history]
-        modes = [row['mode'] for row in history]
-
-        plt.figure(figsize=(10, 5))
-        plt.plot(dates, scores, marker='o', linestyle='-')
-        plt.title(f"{player_name}'s Score History")
-        plt.xticks(rotation=45)
-        plt.xlabel("Date")
-        plt.ylabel("Score")
-        plt.tight_layout()
-        plt.grid(True)
-        plt.savefig("player_progress.png")
-        plt.close()
-        print("Graph saved as player_progress.png")
+            return None
+
+        chart = get_line_chart(PROGRESS_CHART_SIZE, scores, (dates[0][:10], dates[-1][:10]),
+                               f"{player_name}'s Score History")
+        if save_chart(chart, "player_progress.png"):
+            print("Graph saved as player_progress.png")
+        return chart
 
     except Exception as e:
         print("Error plotting progress:", e)
+        return None
 
 def get_current_player():
-    """Retrieve the current player's name from storage."""
-    try:
-        with open("current_student.txt", "r") as f:
-            return f.read().strip()
-    except Exception as e:
-        print(f"Could not read player name: {e}")
-        return "Guest"
+    """Retrieve the current player's name from the session."""
+    return get_session().player_name
     
 def load_game_scores():
     """
@@ -124,17 +137,14 @@ def load_game_scores():
 
     # Game 4 - Football Quiz
     try:
-        if len(sys.argv) >= 2:
-            scores['game4']['score'] = int(sys.argv[1])
-        else:
-            files_to_try = ["football_quiz_score.txt", "football_score.txt", "quiz_score.txt"]
-            for file in files_to_try:
-                try:
-                    with open(file, "r") as f:
-                        scores['game4']['score'] = int(f.read().strip())
-                        break
-                except:
-                    continue
+        files_to_try = ["football_quiz_score.txt", "football_score.txt", "quiz_score.txt"]
+        for file in files_to_try:
+            try:
+                with open(file, "r") as f:
+                    scores['game4']['score'] = int(f.read().strip())
+                    break
+            except:
+                continue
         with open("englishpro_score.txt", "r") as f:
             lines = f.readlines()
             if lines:
@@ -163,9 +173,83 @@ def load_game_scores():
     except Exception as e:
         print(f"Car Parking error: {e}")
 
+    # Prefer the results recorded in this run's session over the result files
+    session = get_session()
+    for game in scores.values():
+        result = session.get_result(game['mode'])
+        if not result:
+            continue
+        if 'score' in result:
+            game['score'] = int(result['score'])
+        if 'time' in result:
+            game['duration'] = float(result['time'])
+
     return scores
 
 
+def save_game_scores(dm, player_name, game_scores):
+    """
+    Queue every game's session data for the shared DataManager `dm`; its writer thread
+    commits them in one transaction.
+
+    Returns:
+    - int, number of sessions queued
+    """
+    dm.save_sessions(
+        {
+            'player_name': player_name,
+            'score': data['score'],
+            'level': data['level'],
+            'duration': data['duration'],
+            'accuracy': data['accuracy'],
+            'mode': data['mode']
+        }
+        for data in game_scores.values()
+    )
+    return len(game_scores)
+
+
+def load_player_history(shared_dm, player_name):
+    """
+    Read the player's statistics and score history, the sessions just queued included.
+
+    Runs on the summary job's thread, so it reads through a connection of its own
+    once the shared DataManager has committed its queue.
+
+    Returns:
+    - (stats, timestamps, scores): get_stats() dict and get_player_series() columns
+    """
+    if not shared_dm.flush(FLUSH_TIMEOUT):
+        print("[FinalSummary] Queued sessions not committed yet, the history may miss them")
+    dm = DataManager("game_data.db", cache_size=0, use_daemon=False)
+    try:
+        stats = dm.get_stats(player_name=player_name)
+        print("Player Stats:", stats)
+        timestamps, scores = dm.get_player_series(player_name)
+        return stats, timestamps, scores
+    finally:
+        dm.close()
+
+
+def start_summary_job(player_name):
+    """
+    Start the summary pipeline on a background thread (see BackgroundJob).
+
+    Its results, in order: "scores" (load_game_scores), "saved" (save_game_scores),
+    "player" (load_player_history) and "chart" (plot_player_progress). Loading and
+    saving the scores still run if the job is cancelled.
+    """
+    # Opened here: the shared DataManager's connection belongs to the screen's thread,
+    # the job only queues sessions for its writer thread
+    dm = get_data_manager()
+    return BackgroundJob([
+        ("scores", lambda results: load_game_scores()),
+        ("saved", lambda results: save_game_scores(dm, player_name, results["scores"])),
+        ("player", lambda results: load_player_history(dm, player_name)),
+        ("chart", lambda results: plot_player_progress(player_name, results["player"][1:])),
+    ], name="FinalSummary", essential=("scores", "saved")).start()
+
+
 def calculate_level_status(total_score):
     """
     Calculate level status based on total score
@@ -200,46 +284,28 @@ def show_final_summary(screen):
     Returns:
     str: Action to take
     """
+    # Time to first frame is measured from here
+    started = time.perf_counter()
+
     # Start background music if available
     if music_loaded:
         pygame.mixer.music.play(-1)  # -1 means loop indefinitely
 
     # Prepare fonts - REDUCED FONT SIZES
-    big_font = pygame.font.SysFont('Arial', 44, bold=True)  # Reduced from 48
-    medium_font = pygame.font.SysFont('Arial', 28, bold=True)  # Reduced from 32
-    font = pygame.font.SysFont('Arial', 22)  # Reduced from 24
-    small_font = pygame.font.SysFont('Arial', 18)  # For table content
+    big_font = get_font('Arial', 44, bold=True)  # Reduced from 48
+    medium_font = get_font('Arial', 28, bold=True)  # Reduced from 32
+    font = get_font('Arial', 22)  # Reduced from 24
+    small_font = get_font('Arial', 18)  # For table content
 
-    # Load scores from all games
-    game_scores = load_game_scores()
+    # Load, save and chart the scores on a background thread; the screen shows
+    # placeholders until each result arrives
     player_name = get_current_player()
-    
-    # Calculate total score
-    total_score = sum(game['score'] for game in game_scores.values())
-    # Get level status
-    level_status, motivational_message = calculate_level_status(total_score)
-
-    # Save each game's session data using DataManager
-    dm = DataManager()
-    for game_key in game_scores:
-        data = game_scores[game_key]
-        try:
-            dm.save_session(
-                player_name=player_name,
-                score=data['score'],
-                level=data['level'],
-                duration=data['duration'],
-                accuracy=data['accuracy'],
-                mode=data['mode']
-            )
-        except Exception as e:
-            print(f"Error saving session for {data['mode']}: {e}")
-
-    # Fetch and print player stats (optional)
-    stats = dm.get_stats(player_name=player_name)
-    print("Player Stats:", stats)
-    plot_player_progress(player_name, dm)
-
+    job = start_summary_job(player_name)
+    game_scores = None
+    total_score = None
+    level_status, motivational_message = "...", "Adding up your scores"
+    summary_complete = False
+    first_frame = True
 
     # Define button variables
     button_width = 160
@@ -260,10 +326,13 @@ def show_final_summary(screen):
     # Main loop for the summary screen
     summary_running = True
     action = None
+    frames = FrameScheduler()
+    renderer = DirtyRenderer(screen)
 
     while summary_running:
         # Handle events
         for event in pygame.event.get():
+            renderer.handle_event(event)
             if event.type == pygame.QUIT:
                 summary_running = False
                 action = "quit"
@@ -300,27 +369,39 @@ def show_final_summary(screen):
                     summary_running = False
 
 
+        # Redraw in full while results stream in (the placeholders are animated), and
+        # once more after the last one
+        if not summary_complete:
+            renderer.invalidate()
+            summary_complete = job.finished
+            if summary_complete:
+                timings = ", ".join(f"{step} {ms:.0f} ms" for step, ms in job.timings.items())
+                print(f"[FinalSummary] Summary ready after {job.elapsed_ms():.0f} ms ({timings})")
+
+        if game_scores is None and "scores" in job.results:
+            game_scores = job.results["scores"]
+            total_score = sum(game['score'] for game in game_scores.values())
+            level_status, motivational_message = calculate_level_status(total_score)
+        loading = "." * (1 + pygame.time.get_ticks() // 400 % 3)
+
+        if not renderer.begin_frame():
+            frames.tick()
+            continue
+
         # Draw background with gradient
-        for y in range(SCREEN_HEIGHT):
-            # Create a gradient from dark blue to light blue (simplified)
-            color = (
-                int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-            )
-            pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+        screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Level status in top right corner
         level_box = pygame.Rect(SCREEN_WIDTH - 180, 20, 160, 40)
         pygame.draw.rect(screen, WHITE, level_box, border_radius=10)
         pygame.draw.rect(screen, BLACK, level_box, width=2, border_radius=10)
 
-        level_text = font.render(f"Level: {level_status}", True, BLACK)
+        level_text = render_text(font, f"Level: {level_status}", True, BLACK)
         level_text_rect = level_text.get_rect(center=level_box.center)
         screen.blit(level_text, level_text_rect)
 
         # Title - positioned to not overlap with level box
-        title_text = big_font.render("LEVEL COMPLETE", True, WHITE)
+        title_text = render_text(big_font, "LEVEL COMPLETE", True, WHITE)
         # Center the title horizontally but shift it slightly left to avoid overlap
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2 - 40, 60))
 
@@ -337,7 +418,8 @@ def show_final_summary(screen):
         screen.blit(title_text, title_rect)
 
         # Motivational message
-        motivation_text = medium_font.render(motivational_message, True, WHITE)
+        motivation_text = render_text(medium_font, motivational_message if game_scores is not None else
+                                      motivational_message + loading, True, WHITE)
         screen.blit(motivation_text,
                     (SCREEN_WIDTH // 2 - motivation_text.get_width() // 2, 130))
 
@@ -347,7 +429,7 @@ def show_final_summary(screen):
         pygame.draw.rect(screen, BLACK, summary_box, width=2, border_radius=10)
 
         # Summary heading
-        summary_heading = medium_font.render("Game Performance Summary", True, BLACK)
+        summary_heading = render_text(medium_font, "Game Performance Summary", True, BLACK)
         summary_heading_rect = summary_heading.get_rect(
             center=(summary_box.left + summary_box.width // 2, 210))
         screen.blit(summary_heading, summary_heading_rect)
@@ -363,8 +445,8 @@ def show_final_summary(screen):
         right_column_x = summary_box.right - 60  # Scores
 
         # Headers - Use smaller font
-        game_header = small_font.render("Game", True, BLACK)
-        score_header = small_font.render("Score", True, BLACK)
+        game_header = render_text(small_font, "Game", True, BLACK)
+        score_header = render_text(small_font, "Score", True, BLACK)
 
         screen.blit(game_header, (left_column_x, 250))
         screen.blit(score_header, (right_column_x - score_header.get_width(), 250))
@@ -387,13 +469,15 @@ def show_final_summary(screen):
         y_pos = 290
         line_height = 30  # Reduced line height
 
-        for i, (game_key, game_name) in enumerate(zip(game_scores.keys(), game_names)):
+        game_keys = list(game_scores) if game_scores is not None else [None] * len(game_names)
+        for i, (game_key, game_name) in enumerate(zip(game_keys, game_names)):
             # Game name - left aligned
-            game_text = small_font.render(game_name, True, BLACK)
+            game_text = render_text(small_font, game_name, True, BLACK)
             screen.blit(game_text, (left_column_x, y_pos))
 
-            # Score - right aligned
-            score_text = small_font.render(str(game_scores[game_key]['score']), True, BLACK)
+            # Score - right aligned, a placeholder until the scores are loaded
+            score = game_scores[game_key]['score'] if game_key is not None else loading
+            score_text = render_text(small_font, str(score), True, BLACK)
             score_x = right_column_x - score_text.get_width()
             screen.blit(score_text, (score_x, y_pos))
 
@@ -408,15 +492,16 @@ def show_final_summary(screen):
 
         # Total row - ensure it stays within the summary box
         total_y = min(sep_y + 15, summary_box.bottom - 25)
-        total_text = small_font.render("TOTAL", True, BLACK)
+        total_text = render_text(small_font, "TOTAL", True, BLACK)
         screen.blit(total_text, (left_column_x, total_y))
 
-        total_score_text = small_font.render(str(total_score), True, BLACK)
+        total_score_text = render_text(small_font, str(total_score) if total_score is not None else loading,
+                                       True, BLACK)
         total_score_x = right_column_x - total_score_text.get_width()
         screen.blit(total_score_text, (total_score_x, total_y))
         # # Top 5 Scores Section
         # leaderboard_y = summary_box.bottom + 10
-        # leaderboard_title = small_font.render("Top 5 Scores Per Game", True, WHITE)
+        # leaderboard_title = render_text(small_font, "Top 5 Scores Per Game", True, WHITE)
         # screen.blit(leaderboard_title, (SCREEN_WIDTH // 2 - leaderboard_title.get_width() // 2, leaderboard_y))
 
         # leaderboard_y += 30  # spacing
@@ -426,24 +511,41 @@ def show_final_summary(screen):
         #     top_scores = dm.get_top_scores(limit=5, mode=game_mode)
 
         #     # Game title
-        #     game_title = small_font.render(f"{game_mode}:", True, GOLD)
+        #     game_title = render_text(small_font, f"{game_mode}:", True, GOLD)
         #     screen.blit(game_title, (150, leaderboard_y))
         #     leaderboard_y += 20
 
         #     for row in top_scores:
-        #         entry_text = small_font.render(f"{row['player_name']} - {row['score']}", True, WHITE)
+        #         entry_text = render_text(small_font, f"{row['player_name']} - {row['score']}", True, WHITE)
         #         screen.blit(entry_text, (170, leaderboard_y))
         #         leaderboard_y += 20
 
         #     leaderboard_y += 10  # spacing between games
 
+        # Player statistics and score history, under the summary box
+        player = job.results.get("player")
+        if player is not None:
+            stats, dates, history = player
+            stats_label = (f"Games played: {stats.get('total_games', 0)}   Best: {stats.get('best_score', 0)}   "
+                           f"Average: {stats.get('average_score', 0.0):.0f}")
+            if len(history):
+                sparkline = get_sparkline(SPARKLINE_SIZE, history)
+                screen.blit(sparkline, (summary_box.right - SPARKLINE_SIZE[0], summary_box.bottom + 8))
+        elif job.done("player") or job.cancelled:
+            stats_label = None
+        else:
+            stats_label = "Loading your progress" + loading
+        if stats_label:
+            stats_text = render_text(small_font, stats_label, True, WHITE)
+            screen.blit(stats_text, (summary_box.left, summary_box.bottom + 10))
+
         # Draw buttons - now 3 buttons with different colors
 
         # Rankings button
         pygame.draw.rect(screen, BLUE, rankings_rect, border_radius=10)
         pygame.draw.rect(screen, BLACK, rankings_rect, width=2, border_radius=10)
 
-        rankings_text = font.render("Rankings", True, WHITE)
+        rankings_text = render_text(font, "Rankings", True, WHITE)
         rankings_text_rect = rankings_text.get_rect(center=rankings_rect.center)
         screen.blit(rankings_text, rankings_text_rect)
 
@@ -451,7 +553,7 @@ def show_final_summary(screen):
         pygame.draw.rect(screen, GREEN, main_menu_rect, border_radius=10)
         pygame.draw.rect(screen, BLACK, main_menu_rect, width=2, border_radius=10)
 
-        main_menu_text = font.render("Main Menu", True, BLACK)
+        main_menu_text = render_text(font, "Main Menu", True, BLACK)
         main_menu_text_rect = main_menu_text.get_rect(center=main_menu_rect.center)
         screen.blit(main_menu_text, main_menu_text_rect)
 
@@ -459,28 +561,33 @@ def show_final_summary(screen):
         pygame.draw.rect(screen, RED, logout_rect, border_radius=10)
         pygame.draw.rect(screen, BLACK, logout_rect, width=2, border_radius=10)
 
-        logout_text = font.render("Logout", True, WHITE)
+        logout_text = render_text(font, "Logout", True, WHITE)
         logout_text_rect = logout_text.get_rect(center=logout_rect.center)
         screen.blit(logout_text, logout_text_rect)
 
-        pygame.display.flip()
-        pygame.time.Clock().tick(60)
-        
-    # dm.export_to_csv("exported_sessions.csv")
+        renderer.present()
+        if first_frame:
+            first_frame = False
+            print(f"[FinalSummary] First frame after {(time.perf_counter() - started) * 1000:.0f} ms")
+        frames.tick()
+
+    # Skip what is left of the summary job, but let the scores be saved before leaving
+    job.cancel()
+    job.wait()
+
+    # SessionExport("exported_sessions.csv").start()  (see session_export.py)
     if music_loaded:
         pygame.mixer.music.stop()
     
     if action == "rankings":
-        pygame.quit()
-        os.system(f"{sys.executable} student_rankings.py")
+        navigate("student_rankings.py")
         sys.exit()
     elif action == "main_menu":
-        pygame.quit()
-        os.system(f"{sys.executable} main_screen.py")
+        navigate("main_screen.py")
         sys.exit()
     elif action == "logout":
-        pygame.quit()
-        os.system(f"{sys.executable} login_screen.py")
+        get_session().logout()
+        navigate("login_screen.py")
         sys.exit()
     
 
@@ -1,8 +1,13 @@
 import pygame
 import sys
-import os
 import json
 import pathlib
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from dirty_rects import DirtyRenderer
 
 # Constants
 SCREEN_WIDTH = 800
@@ -24,12 +29,11 @@ pygame.init()
 pygame.mixer.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Football Quiz - Summary")
-clock = pygame.time.Clock()
 
 # Fonts
-big_font = pygame.font.SysFont('Arial', 48, bold=True)
-medium_font = pygame.font.SysFont('Arial', 32)
-font = pygame.font.SysFont('Arial', 24)
+big_font = get_font('Arial', 48, bold=True)
+medium_font = get_font('Arial', 32)
+font = get_font('Arial', 24)
 
 # Try to load background music
 try:
@@ -101,10 +105,13 @@ def show_summary(screen, game_data):
     # Main loop for the summary screen
     summary_running = True
     action = None
+    frames = FrameScheduler()
+    renderer = DirtyRenderer(screen)
 
     while summary_running:
         # Handle events
         for event in pygame.event.get():
+            renderer.handle_event(event)
             if event.type == pygame.QUIT:
                 return "quit"
             # Check for button clicks
@@ -120,22 +127,18 @@ def show_summary(screen, game_data):
                         # Launch the next game
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        os.system(f"{sys.executable} carparking_instructions.py")  # Assuming this is the next game
+                        navigate("carparking_instructions.py")  # Assuming this is the next game
                         sys.exit()
 
+        if not renderer.begin_frame():
+            frames.tick()
+            continue
+
         # Draw background with gradient
-        for y in range(SCREEN_HEIGHT):
-            # Create a gradient from dark blue to light blue
-            color = (
-                int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-            )
-            pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+        screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Title
-        title_text = big_font.render("Football Quiz Complete!", True, WHITE)
+        title_text = render_text(big_font, "Football Quiz Complete!", True, WHITE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 70))
 
         # Add a fancy box around the title
@@ -151,7 +154,7 @@ def show_summary(screen, game_data):
         screen.blit(title_text, title_rect)
 
         # Performance message
-        performance_text = medium_font.render(performance_msg, True, WHITE)
+        performance_text = render_text(medium_font, performance_msg, True, WHITE)
         screen.blit(performance_text,
                     (SCREEN_WIDTH // 2 - performance_text.get_width() // 2, 130))
 
@@ -191,7 +194,7 @@ def show_summary(screen, game_data):
         pygame.draw.rect(screen, BLACK, summary_box, width=2, border_radius=10)
 
         # Summary heading
-        summary_heading = medium_font.render("Game Summary", True, BLACK)
+        summary_heading = render_text(medium_font, "Game Summary", True, BLACK)
         screen.blit(summary_heading,
                     (SCREEN_WIDTH // 2 - summary_heading.get_width() // 2, 240))
 
@@ -204,24 +207,24 @@ def show_summary(screen, game_data):
         y_pos = 300
 
         # Goals/Score
-        goals_text = font.render(f"Goals Scored: {total_goals}/{total_questions}", True, BLACK)
+        goals_text = render_text(font, f"Goals Scored: {total_goals}/{total_questions}", True, BLACK)
         screen.blit(goals_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Completion Status
         completion_status = "Completed!" if success else "Incomplete"
-        completion_text = font.render(f"Game Status: {completion_status}", True, BLACK)
+        completion_text = render_text(font, f"Game Status: {completion_status}", True, BLACK)
         screen.blit(completion_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Accuracy
         accuracy = int((total_goals / total_questions) * 100) if total_questions > 0 else 0
-        accuracy_text = font.render(f"Accuracy: {accuracy}%", True, BLACK)
+        accuracy_text = render_text(font, f"Accuracy: {accuracy}%", True, BLACK)
         screen.blit(accuracy_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Star Rating
-        star_text = font.render(f"Star Rating: {stars}/5", True, BLACK)
+        star_text = render_text(font, f"Star Rating: {stars}/5", True, BLACK)
         screen.blit(star_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
@@ -229,7 +232,7 @@ def show_summary(screen, game_data):
         high_scores = load_scores()
         if high_scores:
             high_score = high_scores[0]
-            high_score_text = font.render(f"High Score: {high_score}", True, BLACK)
+            high_score_text = render_text(font, f"High Score: {high_score}", True, BLACK)
             screen.blit(high_score_text, (summary_box.left + 30, y_pos))
 
         # Continue button
@@ -238,12 +241,12 @@ def show_summary(screen, game_data):
         pygame.draw.rect(screen, GREEN, continue_rect, border_radius=10)
         pygame.draw.rect(screen, BLACK, continue_rect, width=2, border_radius=10)
 
-        continue_text = font.render("Continue", True, BLACK)
+        continue_text = render_text(font, "Continue", True, BLACK)
         continue_text_rect = continue_text.get_rect(center=continue_rect.center)
         screen.blit(continue_text, continue_text_rect)
 
-        pygame.display.flip()
-        pygame.time.Clock().tick(60)
+        renderer.present()
+        frames.tick()
 
     return action
 
@@ -255,6 +258,8 @@ def save_game_data(game_data):
     Parameters:
     game_data (dict): Dictionary containing game statistics
     """
+    get_session().record_result("Football Quiz", game_data)
+
     try:
         # Save to football quiz specific score file
         with open("football_quiz_score.txt", "w") as f:
@@ -281,17 +286,10 @@ if __name__ == "__main__":
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Football Quiz - Summary")
 
-    # Get score and success from command line arguments
-    score = 0
-    success = False
-
-    if len(sys.argv) >= 3:
-        try:
-            score = int(sys.argv[1])
-            success = sys.argv[2] == '1'
-        except:
-            # Use default values if parsing fails
-            print("Could not parse command line arguments, using defaults")
+    # Get score and success from the session
+    result = get_session().get_result("Football Quiz", {})
+    score = result.get('score', 0)
+    success = result.get('success', False)
 
     # Prepare game data
     game_data = {
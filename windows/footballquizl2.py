@@ -1,9 +1,13 @@
 import pygame
 import sys
-import os
 import random
 import json
 import pathlib
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
 
 # Constants
 WIDTH, HEIGHT = 960, 640
@@ -50,12 +54,12 @@ pygame.init()
 pygame.mixer.init()
 scr = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption(f"Football Quiz – {DIFFICULTY}")
-clock = pygame.time.Clock()
+frames = FrameScheduler()
 
 # Use Georgia serif font for all text
-fBig = pygame.font.SysFont("Georgia", 52)
-fMid = pygame.font.SysFont("Georgia", 36)
-fSm = pygame.font.SysFont("Georgia", 24)
+fBig = get_font("Georgia", 52)
+fMid = get_font("Georgia", 36)
+fSm = get_font("Georgia", 24)
 
 
 # Load sound effects
@@ -107,7 +111,8 @@ def main_game():
     tip, tipT = "", 0
 
     while True:
-        dt = clock.tick(60)
+        # The ball only moves after a shot
+        dt = frames.tick(animating=shot_res is not None)
         keys = pygame.key.get_pressed()
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
@@ -155,21 +160,13 @@ def main_game():
                     save_score(score)
 
                     # Create a gradient background for the transition screen
-                    transition_bg = pygame.Surface((WIDTH, HEIGHT))
-                    for y in range(HEIGHT):
-                        # Create a gradient from dark blue to light blue
-                        color = (
-                            int(0 + (100) * y / HEIGHT),
-                            int(50 + (130) * y / HEIGHT),
-                            int(150 + (50) * y / HEIGHT)
-                        )
-                        pygame.draw.line(transition_bg, color, (0, y), (WIDTH, y))
+                    transition_bg = get_gradient((WIDTH, HEIGHT), ((0, 50, 150), (100, 180, 200)))
 
                     # Show transition screen with gradient background
                     scr.blit(transition_bg, (0, 0))
 
                     # Create a fancy box for the title
-                    msg_text = fBig.render("Game Over!", True, (255, 50, 50))
+                    msg_text = render_text(fBig, "Game Over!", True, (255, 50, 50))
                     msg_rect = msg_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 30))
 
                     # Draw a gold box around the title
@@ -189,7 +186,7 @@ def main_game():
                     pygame.draw.rect(scr, (0, 200, 0), continue_btn, border_radius=10)
                     pygame.draw.rect(scr, (0, 0, 0), continue_btn, 2, border_radius=10)
 
-                    btn_text = fMid.render("Continue", True, (0, 0, 0))
+                    btn_text = render_text(fMid, "Continue", True, (0, 0, 0))
                     btn_rect = btn_text.get_rect(center=continue_btn.center)
                     scr.blit(btn_text, btn_rect)
 
@@ -198,6 +195,7 @@ def main_game():
                     # Wait for button click
                     waiting = True
                     while waiting:
+                        frames.tick()
                         for event in pygame.event.get():
                             if event.type == pygame.QUIT:
                                 pygame.quit()
@@ -207,8 +205,8 @@ def main_game():
                                     waiting = False
 
                     # Go to summary screen
-                    pygame.quit()
-                    os.system(f"{sys.executable} footballquiz_summary.py {score} 0")
+                    get_session().record_result("Football Quiz", {'score': score, 'success': False})
+                    navigate("footballquiz_summary.py")
                     sys.exit()
 
                 q_no += 1
@@ -216,21 +214,13 @@ def main_game():
                     save_score(score)
 
                     # Create a gradient background for the transition screen
-                    transition_bg = pygame.Surface((WIDTH, HEIGHT))
-                    for y in range(HEIGHT):
-                        # Create a gradient from dark blue to light blue
-                        color = (
-                            int(0 + (100) * y / HEIGHT),
-                            int(50 + (130) * y / HEIGHT),
-                            int(150 + (50) * y / HEIGHT)
-                        )
-                        pygame.draw.line(transition_bg, color, (0, y), (WIDTH, y))
+                    transition_bg = get_gradient((WIDTH, HEIGHT), ((0, 50, 150), (100, 180, 200)))
 
                     # Show transition screen with gradient background
                     scr.blit(transition_bg, (0, 0))
 
                     # Create a fancy box for the title
-                    msg_text = fBig.render("All Questions Complete!", True, (255, 215, 0))
+                    msg_text = render_text(fBig, "All Questions Complete!", True, (255, 215, 0))
                     msg_rect = msg_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 30))
 
                     # Draw a gold box around the title
@@ -250,7 +240,7 @@ def main_game():
                     pygame.draw.rect(scr, (0, 200, 0), continue_btn, border_radius=10)
                     pygame.draw.rect(scr, (0, 0, 0), continue_btn, 2, border_radius=10)
 
-                    btn_text = fMid.render("Continue", True, (0, 0, 0))
+                    btn_text = render_text(fMid, "Continue", True, (0, 0, 0))
                     btn_rect = btn_text.get_rect(center=continue_btn.center)
                     scr.blit(btn_text, btn_rect)
 
@@ -259,6 +249,7 @@ def main_game():
                     # Wait for button click
                     waiting = True
                     while waiting:
+                        frames.tick()
                         for event in pygame.event.get():
                             if event.type == pygame.QUIT:
                                 pygame.quit()
@@ -268,8 +259,8 @@ def main_game():
                                     waiting = False
 
                     # Go to summary screen
-                    pygame.quit()
-                    os.system(f"{sys.executable} footballquiz_summary.py {score} 1")
+                    get_session().record_result("Football Quiz", {'score': score, 'success': True})
+                    navigate("footballquiz_summary.py")
                     sys.exit()
 
                 # Reset for next question
@@ -279,6 +270,8 @@ def main_game():
                 vx, vy = reset_ball()
                 shot_res = None
 
+        frames.mark_draw()
+
         # Draw the game screen
         draw_pitch()
         pygame.draw.rect(scr, (50, 50, 220), player)
@@ -289,24 +282,24 @@ def main_game():
         pygame.draw.rect(scr, (0, 0, 0), hud_rect, border_radius=6)
         pygame.draw.rect(scr, (255, 255, 255), hud_rect, 2, border_radius=6)
         left = max(0, QUESTION_TIME - int((pygame.time.get_ticks() - q_start) / 1000))
-        scr.blit(fSm.render(f"G:{score}   T:{left}s", True, (255, 255, 255)), (20, 18))
+        scr.blit(render_text(fSm, f"G:{score}   T:{left}s", True, (255, 255, 255)), (20, 18))
 
         # Question
-        scr.blit(fMid.render(question, True, (0, 0, 0)),
-                 fMid.render(question, True, (0, 0, 0)).get_rect(center=(WIDTH // 2, HEIGHT // 2 - 60)))
+        scr.blit(render_text(fMid, question, True, (0, 0, 0)),
+                 render_text(fMid, question, True, (0, 0, 0)).get_rect(center=(WIDTH // 2, HEIGHT // 2 - 60)))
 
         # Input box
         input_box = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 - 10, 200, 50)
         pygame.draw.rect(scr, (255, 255, 255), input_box, border_radius=10)
         pygame.draw.rect(scr, (0, 0, 180), input_box, 2, border_radius=10)
-        scr.blit(fMid.render(typed, True, (0, 0, 180)),
-                 fMid.render(typed, True, (0, 0, 180)).get_rect(center=input_box.center))
+        scr.blit(render_text(fMid, typed, True, (0, 0, 180)),
+                 render_text(fMid, typed, True, (0, 0, 180)).get_rect(center=input_box.center))
 
         # Tip
         if tip and pygame.time.get_ticks() - tipT < TIP_MS:
             col = (255, 215, 0) if tip == "GOAL !" else (255, 50, 50)
-            scr.blit(fBig.render(tip, True, col),
-                     fBig.render(tip, True, col).get_rect(center=(WIDTH // 2, HEIGHT // 2 - 120)))
+            scr.blit(render_text(fBig, tip, True, col),
+                     render_text(fBig, tip, True, col).get_rect(center=(WIDTH // 2, HEIGHT // 2 - 120)))
         elif tip:
             tip = ""
 
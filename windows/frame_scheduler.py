@@ -0,0 +1,136 @@
+import pygame
+
+# Frame rate while something is moving or the user is interacting
+ACTIVE_FPS = 60
+
+# Frame rate while the screen is static and no input has arrived
+IDLE_FPS = 10
+
+# Idle rate for screens whose only motion is slow decoration (floating elements)
+AMBIENT_FPS = 20
+
+# How long after the last input the scheduler keeps running at the active rate (ms)
+IDLE_DELAY = 500
+
+# Longest sleep between checks of the event queue while idle (ms); bounds the delay of
+# the first input after an idle period
+IDLE_POLL_INTERVAL = 10
+
+# Object that takes over frame pacing for tools such as the benchmark harness
+_frame_hook = None
+
+
+def set_frame_hook(hook):
+    """
+    Install a frame hook, or remove it with None.
+
+    While a hook is installed every FrameScheduler hands its frames to it instead of
+    pacing them. The hook must provide:
+    - tick(scheduler, animating): called at the end of every frame, returns the frame
+      time in ms like FrameScheduler.tick()
+    - mark_draw(scheduler): called when a screen starts drawing its frame
+    """
+    global _frame_hook
+    _frame_hook = hook
+
+
+class FrameScheduler:
+    """
+    FrameScheduler paces a screen's main loop and replaces pygame.time.Clock.
+
+    While the screen is animating, or for IDLE_DELAY ms after the last input event,
+    tick() caps the loop at the active frame rate like clock.tick(fps). Once nothing is
+    moving and no input has arrived, tick() sleeps for up to one idle frame instead of
+    spinning, checking the event queue every IDLE_POLL_INTERVAL ms. Events are only
+    peeked at, never taken off the queue, so the screen's own pygame.event.get() loop
+    sees them in their original order. Any queued event counts as input: it ends the
+    idle wait and keeps the loop at the active rate, also while the user keeps typing.
+
+    Attributes:
+    - fps: int, frame cap while active
+    - idle_fps: int, frame rate while idle
+    - idle_delay: int, ms of inactivity before dropping to the idle rate
+    - frames: int, number of frames ticked
+    - idle_frames: int, number of those frames that ran at the idle rate
+    """
+
+    def __init__(self, fps=ACTIVE_FPS, idle_fps=IDLE_FPS, idle_delay=IDLE_DELAY):
+        """
+        Parameters:
+        - fps: int, frame cap while active
+        - idle_fps: int, frame rate while idle
+        - idle_delay: int, ms of inactivity before dropping to the idle rate
+        """
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.idle_delay = idle_delay
+        self.frames = 0
+        self.idle_frames = 0
+        self.clock = pygame.time.Clock()
+        self._last_input = pygame.time.get_ticks()
+
+    def wake(self):
+        """
+        Switch back to the active rate, e.g. after the screen changed on its own.
+        """
+        self._last_input = pygame.time.get_ticks()
+
+    def is_idle(self, animating=False):
+        """
+        Return True if the next frame would run at the idle rate.
+        """
+        if animating:
+            return False
+        return pygame.time.get_ticks() - self._last_input >= self.idle_delay
+
+    def tick(self, animating=False):
+        """
+        Wait for the next frame.
+
+        Parameters:
+        - animating: bool, True while something on screen moves every frame
+
+        Returns:
+        - int, milliseconds since the previous tick (like pygame.time.Clock.tick)
+        """
+        self.frames += 1
+        if _frame_hook is not None:
+            return _frame_hook.tick(self, animating)
+        # Events still queued are input the screen has not handled yet
+        if pygame.event.peek():
+            self.wake()
+        if self.is_idle(animating):
+            self.idle_frames += 1
+            self._wait_for_event(1000 // self.idle_fps)
+        elapsed = self.clock.tick(self.fps)
+        # Input that arrived during the frame's sleep keeps the next frames active
+        if pygame.event.peek():
+            self.wake()
+        return elapsed
+
+    def _wait_for_event(self, timeout):
+        """
+        Sleep for up to `timeout` ms, returning as soon as an event is queued.
+        """
+        deadline = pygame.time.get_ticks() + timeout
+        while not pygame.event.peek():
+            remaining = deadline - pygame.time.get_ticks()
+            if remaining <= 0:
+                return
+            pygame.time.wait(min(IDLE_POLL_INTERVAL, remaining))
+        self.wake()
+
+    def mark_draw(self):
+        """
+        Note that the screen has finished updating and starts drawing this frame.
+
+        Only used to split update time from draw time when a frame hook is installed.
+        """
+        if _frame_hook is not None:
+            _frame_hook.mark_draw(self)
+
+    def get_fps(self):
+        """
+        Return the average frame rate of the last few frames.
+        """
+        return self.clock.get_fps()
@@ -0,0 +1,474 @@
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import shutil
+import fnmatch
+import argparse
+import tempfile
+
+import pygame
+
+import frame_scheduler
+from scene_router import BASE_DIR, START_SCENE, SceneRouter, get_router
+from session_context import SessionContext
+
+# Version of the recording format written by SessionRecorder
+RECORDING_VERSION = 1
+
+# Input events that are recorded and replayed; window and audio events are not
+RECORDED_EVENTS = {
+    pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT,
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+}
+
+# Keys whose held-down state is recorded (for screens polling pygame.key.get_pressed())
+RECORDED_KEYS = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE, pygame.K_RETURN]
+
+# Event attributes restored as tuples on replay
+TUPLE_ATTRIBUTES = {"pos", "rel", "buttons"}
+
+# Files the screens write to; restored from the game directory before every replay
+DATA_FILES = ["*.db", "*.db-*", "*.txt", "*.json"]
+
+
+class ReplayFinished(BaseException):
+    """
+    Raised when a replay has used up its recording.
+
+    Derived from BaseException so that the screens' own `except Exception` blocks
+    cannot swallow it.
+    """
+
+
+class ReplayDiverged(BaseException):
+    """
+    Raised when the replayed session ends up on a different screen than the recorded one.
+    """
+
+
+def open_recording(path, mode):
+    """
+    Open a recording for reading ("r") or writing ("w"); ".gz" files are compressed.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def encode_event(event):
+    """
+    Return [type, attributes] for an input event, keeping only JSON-friendly attributes.
+    """
+    attributes = {}
+    for name, value in event.dict.items():
+        if isinstance(value, tuple):
+            value = list(value)
+        if value is None or isinstance(value, (bool, int, float, str, list)):
+            attributes[name] = value
+    return [event.type, attributes]
+
+
+def decode_event(data):
+    """
+    Rebuild a pygame event from the output of encode_event().
+    """
+    event_type, attributes = data
+    attributes = {name: tuple(value) if name in TUPLE_ATTRIBUTES and isinstance(value, list) else value
+                  for name, value in attributes.items()}
+    return pygame.event.Event(event_type, attributes)
+
+
+class PressedKeys:
+    """
+    Stand-in for the sequence returned by pygame.key.get_pressed() during a replay.
+    """
+
+    def __init__(self, keys=()):
+        self.keys = set(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+class SessionRecorder:
+    """
+    SessionRecorder records a live session so it can be replayed deterministically.
+
+    The recording holds the random seed the session was started with, the session it
+    started from, and one entry per call to pygame.event.get(): the pygame clock, the
+    mouse position, the keys held down and the input events returned. Screen changes
+    are written as separate entries so a replay can tell when it diverges.
+
+    The recording is a JSON Lines file (gzip-compressed if the name ends in ".gz"),
+    written as the session runs, so a crash still leaves a usable recording.
+
+    Attributes:
+    - path: str, recording file
+    - seed: int, seed handed to the random module when recording started
+    - polls: int, number of event polls recorded
+    """
+
+    def __init__(self, path, seed=None):
+        """
+        Parameters:
+        - path: str, recording file to write
+        - seed: int, random seed for the session (a fresh one if None)
+        """
+        self.path = path
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.polls = 0
+        self._file = None
+        self._scene = None
+        self._event_get = None
+
+    def start(self, router, script=START_SCENE, args=()):
+        """
+        Start recording a session that `router` is about to run from `script`.
+        """
+        self._file = open_recording(self.path, "w")
+        header = {
+            "version": RECORDING_VERSION,
+            "seed": self.seed,
+            "start": [script, [str(arg) for arg in args]],
+            "session": router.session.to_dict(),
+            "wall_clock": time.time(),
+            "pygame": pygame.version.ver,
+            "hash_seed": os.environ.get("PYTHONHASHSEED"),
+        }
+        self._file.write(json.dumps(header) + "\n")
+
+        # Every random choice of the session (cards, questions, words) follows from this
+        random.seed(self.seed)
+        self._event_get = pygame.event.get
+        pygame.event.get = self._get
+
+    def stop(self):
+        """
+        Stop recording and close the file.
+        """
+        if self._event_get is not None:
+            pygame.event.get = self._event_get
+            self._event_get = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            print(f"[SessionRecorder] Recorded {self.polls} polls to {self.path}")
+
+    def _get(self, *args, **kwargs):
+        events = self._event_get(*args, **kwargs)
+
+        router = get_router()
+        scene = router.current[0] if router is not None and router.current else None
+        if scene != self._scene:
+            self._scene = scene
+            self._file.write(json.dumps({"scene": scene}) + "\n")
+
+        entry = {"t": pygame.time.get_ticks(), "pos": list(pygame.mouse.get_pos())}
+        pressed = pygame.key.get_pressed()
+        keys = [key for key in RECORDED_KEYS if pressed[key]]
+        if keys:
+            entry["keys"] = keys
+        recorded = [encode_event(event) for event in events if event.type in RECORDED_EVENTS]
+        if recorded:
+            entry["events"] = recorded
+        self._file.write(json.dumps(entry) + "\n")
+        self.polls += 1
+        return events
+
+
+class SessionReplayer:
+    """
+    SessionReplayer plays a recording back at full speed.
+
+    While installed it stands in for pygame.event.get(), the mouse and keyboard state
+    and both clocks (pygame.time.get_ticks() and time.time()). Each event poll returns
+    the next recorded input and moves the clock to the time it was recorded at, and the
+    replayer is the frame hook of frame_scheduler, so frames are never waited for. With
+    the same seed, the screens make the same choices and see the same input as in the
+    recorded session, only faster.
+
+    Attributes:
+    - header: dict, first line of the recording
+    - polls: int, number of event polls replayed
+    - frames: int, number of frames replayed
+    - diverged: str or None, description of the first divergence
+    """
+
+    def __init__(self, path, strict=True):
+        """
+        Parameters:
+        - path: str, recording file
+        - strict: bool, stop with ReplayDiverged when the replay leaves the recorded screen
+        """
+        self.path = path
+        self.strict = strict
+        self.polls = 0
+        self.frames = 0
+        self.diverged = None
+        self._file = open_recording(path, "r")
+        self.header = json.loads(self._file.readline())
+        if self.header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"[SessionReplayer] Unsupported recording version in {path}")
+        self._now = 0
+        self._wall_start = self.header.get("wall_clock", 0.0)
+        self._next = None
+        self._scene = None
+        self._pos = (0, 0)
+        self._keys = PressedKeys()
+        self._saved = None
+
+    # ----- Recording -----
+
+    def _read(self):
+        line = self._file.readline()
+        return json.loads(line) if line else None
+
+    def _next_poll(self):
+        """
+        Return the next recorded poll, consuming the screen changes in front of it.
+        """
+        if self._next is None:
+            entry = self._read()
+            while entry is not None and "scene" in entry:
+                self._scene = entry["scene"]
+                entry = self._read()
+            self._next = entry
+        return self._next
+
+    # ----- Stand-ins -----
+
+    def _get(self, *args, **kwargs):
+        # Anything SDL queued by itself (window events of the dummy driver) is dropped
+        self._saved["event.get"]()
+        entry = self._next_poll()
+        if entry is None:
+            raise ReplayFinished()
+        self._next = None
+
+        router = get_router()
+        scene = router.current[0] if router is not None and router.current else None
+        if self._scene is not None and scene != self._scene and self.diverged is None:
+            self.diverged = f"poll {self.polls}: replay is on {scene}, recording on {self._scene}"
+            if self.strict:
+                raise ReplayDiverged(self.diverged)
+
+        self.polls += 1
+        self._now = entry["t"]
+        self._pos = tuple(entry["pos"])
+        self._keys = PressedKeys(entry.get("keys", ()))
+        return [decode_event(data) for data in entry.get("events", ())]
+
+    def _get_ticks(self):
+        return self._now
+
+    def _time(self):
+        return self._wall_start + self._now / 1000
+
+    def _get_pos(self):
+        return self._pos
+
+    def _get_pressed(self):
+        return self._keys
+
+    def _delay(self, milliseconds):
+        return 0
+
+    # ----- Frame hook -----
+
+    def tick(self, scheduler, animating):
+        self.frames += 1
+        entry = self._next_poll()
+        if entry is None:
+            return 0
+        # Report the frame time the recorded session saw
+        return max(0, entry["t"] - self._now)
+
+    def mark_draw(self, scheduler):
+        pass
+
+    # ----- Installation -----
+
+    def install(self):
+        """
+        Seed the random module and replace pygame's input and clocks with the recording.
+        """
+        random.seed(self.header["seed"])
+        self._saved = {
+            "event.get": pygame.event.get,
+            "mouse.get_pos": pygame.mouse.get_pos,
+            "key.get_pressed": pygame.key.get_pressed,
+            "time.get_ticks": pygame.time.get_ticks,
+            "time.delay": pygame.time.delay,
+            "time.wait": pygame.time.wait,
+            "time": time.time,
+        }
+        pygame.event.get = self._get
+        pygame.mouse.get_pos = self._get_pos
+        pygame.key.get_pressed = self._get_pressed
+        pygame.time.get_ticks = self._get_ticks
+        pygame.time.delay = self._delay
+        pygame.time.wait = self._delay
+        time.time = self._time
+        frame_scheduler.set_frame_hook(self)
+
+    def uninstall(self):
+        """
+        Put pygame's input and clocks back and close the recording.
+        """
+        frame_scheduler.set_frame_hook(None)
+        if self._saved is not None:
+            pygame.event.get = self._saved["event.get"]
+            pygame.mouse.get_pos = self._saved["mouse.get_pos"]
+            pygame.key.get_pressed = self._saved["key.get_pressed"]
+            pygame.time.get_ticks = self._saved["time.get_ticks"]
+            pygame.time.delay = self._saved["time.delay"]
+            pygame.time.wait = self._saved["time.wait"]
+            time.time = self._saved["time"]
+            self._saved = None
+        self._file.close()
+
+
+def reset_data_files(source, workdir):
+    """
+    Make the data files in `workdir` match those in `source` again.
+    """
+    for name in os.listdir(workdir):
+        if any(fnmatch.fnmatch(name, pattern) for pattern in DATA_FILES):
+            os.remove(os.path.join(workdir, name))
+    for name in os.listdir(source):
+        if any(fnmatch.fnmatch(name, pattern) for pattern in DATA_FILES):
+            shutil.copy2(os.path.join(source, name), os.path.join(workdir, name))
+
+
+def replay(path, scene=None, base_dir=BASE_DIR, strict=True):
+    """
+    Replay a recording offscreen and at full speed.
+
+    Parameters:
+    - path: str, recording file
+    - scene: str, screen to start from instead of the recorded one (e.g. to replay a
+      Level 1 session against "memorymathl2.py")
+    - base_dir: str, game directory to run in
+    - strict: bool, stop at the first divergence from the recording
+
+    Returns:
+    - dict with polls, frames, recorded_s (session length), wall_s, speedup, status
+      ("finished", "exited", "diverged" or "error") and diverged/error details
+    """
+    replayer = SessionReplayer(path, strict=strict)
+    script, args = replayer.header["start"]
+    if scene is not None:
+        script, args = scene, []
+        # The recorded screen names no longer apply
+        replayer.strict = False
+
+    router = SceneRouter(base_dir=base_dir)
+    router.session = SessionContext.from_dict(replayer.header["session"])
+
+    status, error = "exited", None
+    started = time.perf_counter()
+    replayer.install()
+    try:
+        router.run(script, args)
+    except ReplayFinished:
+        status = "finished"
+    except ReplayDiverged:
+        status = "diverged"
+    except Exception as e:
+        status, error = "error", f"{type(e).__name__}: {e}"
+    finally:
+        replayer.uninstall()
+    wall = time.perf_counter() - started
+
+    return {
+        "recording": path,
+        "status": status,
+        "polls": replayer.polls,
+        "frames": replayer.frames,
+        "recorded_s": round(replayer._now / 1000, 3),
+        "wall_s": round(wall, 3),
+        "speedup": round(replayer._now / 1000 / wall, 1) if wall > 0 else None,
+        "diverged": replayer.diverged,
+        "error": error,
+    }
+
+
+def main():
+    """
+    Replay recorded sessions, e.g. as a regression and throughput test.
+
+    Usage:
+      python scene_router.py --record session.jsonl.gz        (record a session)
+      python input_replay.py session.jsonl.gz [more.jsonl.gz ...] [--scene memorymathl2.py]
+                             [--profile replay.prof] [--in-place] [--keep-going]
+
+    Exits with status 1 if any replay diverged from its recording or failed.
+    """
+    parser = argparse.ArgumentParser(description="Replay recorded SkillScape sessions offscreen")
+    parser.add_argument("recordings", nargs="+")
+    parser.add_argument("--scene", help="screen to replay the input against instead of the recorded one")
+    parser.add_argument("--profile", metavar="FILE", help="run under cProfile and write the stats to FILE")
+    parser.add_argument("--in-place", action="store_true",
+                        help="use the real data files instead of a scratch copy of the game directory")
+    parser.add_argument("--keep-going", action="store_true", help="do not stop a replay when it diverges")
+    parser.add_argument("--output", help="write the per-recording results as JSON to this file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    workdir = BASE_DIR
+    if not args.in_place:
+        workdir = tempfile.mkdtemp(prefix="skillscape_replay_")
+        shutil.copytree(BASE_DIR, workdir, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns("__pycache__", "*.pyc", "session_snapshot.json"))
+
+    results = []
+    failed = 0
+    try:
+        for path in args.recordings:
+            path = os.path.abspath(path)
+            if not args.in_place:
+                reset_data_files(BASE_DIR, workdir)
+            if profiler is not None:
+                profiler.enable()
+            try:
+                result = replay(path, scene=args.scene, base_dir=workdir, strict=not args.keep_going)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+            results.append(result)
+            if result["status"] in ("diverged", "error") or (result["diverged"] and not args.scene):
+                failed += 1
+            print(f"[Replay] {os.path.basename(path)}: {result['status']}, {result['frames']} frames, "
+                  f"{result['recorded_s']}s of play in {result['wall_s']}s"
+                  + (f" ({result['speedup']}x)" if result["speedup"] else "")
+                  + (f" - {result['diverged'] or result['error']}" if result["diverged"] or result["error"] else ""))
+    finally:
+        if not args.in_place:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    total_wall = sum(result["wall_s"] for result in results)
+    total_frames = sum(result["frames"] for result in results)
+    print(f"[Replay] {len(results)} recordings, {failed} failed, {total_frames} frames in {total_wall:.1f}s"
+          + (f" ({total_frames / total_wall:.0f} frames/s)" if total_wall > 0 else ""))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if profiler is not None:
+        profiler.dump_stats(args.profile)
+        print(f"[Replay] Profile written to {args.profile}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from data_manager import DataManager
+
+# Result files written by the games before sessions went to the database
+LEGACY_FILES = {
+    "memorymath_data.txt", "word_builder_score.txt", "word_builder_data.txt", "englishpro_score.txt",
+    "englishpro_data.txt", "football_quiz_score.txt", "football_quiz_data.txt", "highscores.json",
+    "carparking_data.txt",
+}
+
+# Player of sessions found directly in the scanned directory; elsewhere it is the
+# name of the directory holding the files (e.g. one directory per kiosk)
+LEGACY_PLAYER = "legacy"
+
+# Values for what the files do not record, as in final_summary.load_game_scores
+DEFAULT_LEVEL = 1
+DEFAULT_DURATION = 60.0
+
+# Sessions saved per transaction
+INGEST_BATCH_SIZE = 5000
+
+
+def _read_lines(directory, name):
+    with open(os.path.join(directory, name), "r", encoding="utf-8", errors="replace") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def _record_key(*parts):
+    """
+    Return the import key of a record: a hash of the file names and contents it was read from.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _kiosk_id(relative):
+    """
+    Return the kiosk a directory's files came from: the first directory of its path
+    under the scan root ("." for files directly in it), with "/" separators, so it does
+    not change with the file times or the system the share is read on.
+    """
+    return relative.replace(os.sep, "/").split("/")[0]
+
+
+def _file_parts(directory, names):
+    parts = []
+    for name in names:
+        with open(os.path.join(directory, name), "rb") as f:
+            parts += [name, f.read()]
+    return parts
+
+
+def _parse_memory_math(directory, present):
+    # score, matches, attempts, flips, time (memorymath_summery.py)
+    lines = _read_lines(directory, "memorymath_data.txt")
+    attempts = int(lines[2]) if len(lines) > 2 else 0
+    return [("Memory Math", ["memorymath_data.txt"], {
+        "score": int(lines[0]),
+        "duration": float(lines[4]) if len(lines) > 4 else DEFAULT_DURATION,
+        "accuracy": int(lines[1]) / attempts if attempts > 0 else None,
+    })]
+
+
+def _parse_word_builder(directory, present):
+    # word_builder_score.txt: score; word_builder_data.txt: words solved, hints used, time, bonus
+    if "word_builder_score.txt" not in present:
+        return []
+    names = ["word_builder_score.txt"]
+    session = {"score": int(_read_lines(directory, "word_builder_score.txt")[0])}
+    if "word_builder_data.txt" in present:
+        names.append("word_builder_data.txt")
+        lines = _read_lines(directory, "word_builder_data.txt")
+        if len(lines) > 2:
+            session["duration"] = float(lines[2])
+    return [("Word Builder", names, session)]
+
+
+def _parse_english_pro(directory, present):
+    # englishpro_data.txt: score, time, completion score, memory score; else englishpro_score.txt: score
+    names = [name for name in ("englishpro_data.txt", "englishpro_score.txt") if name in present]
+    lines = _read_lines(directory, names[0])
+    session = {"score": int(float(lines[0]))}
+    if names[0] == "englishpro_data.txt" and len(lines) > 1:
+        session["duration"] = float(lines[1])
+    return [("English Pro", names, session)]
+
+
+def _parse_football_quiz(directory, present):
+    # football_quiz_data.txt: score, questions, success, accuracy %; else football_quiz_score.txt: score
+    records = []
+    names = [name for name in ("football_quiz_data.txt", "football_quiz_score.txt") if name in present]
+    latest = None
+    if names:
+        lines = _read_lines(directory, names[0])
+        latest = int(lines[0])
+        session = {"score": latest}
+        if names[0] == "football_quiz_data.txt" and len(lines) > 3:
+            session["accuracy"] = int(lines[3]) / 100
+        records.append(("Football Quiz", names, session))
+    if "highscores.json" in present:
+        # The best five quiz scores, without dates. Each entry is keyed by its value and
+        # position among equal values, so a list that gained a score only adds that one;
+        # the latest game's entry is already covered by the record above.
+        with open(os.path.join(directory, "highscores.json"), "r", encoding="utf-8") as f:
+            scores = json.load(f)
+        occurrences = {}
+        for score in scores:
+            occurrence = occurrences[score] = occurrences.get(score, 0) + 1
+            if score == latest and occurrence == 1:
+                continue
+            records.append(("Football Quiz", None, {"score": int(score), "key": ("highscores.json", score, occurrence)}))
+    return records
+
+
+def _parse_car_parking(directory, present):
+    # moves, stars, perfect moves, efficiency % (carparking_summary.py); scored as in final_summary
+    lines = _read_lines(directory, "carparking_data.txt")
+    stars = int(lines[1])
+    return [("Car Parking Puzzle", ["carparking_data.txt"], {
+        "score": stars * 10,
+        "level": stars,
+        "accuracy": int(lines[3]) / 100 if len(lines) > 3 else None,
+    })]
+
+
+# Parser per game, with the files that trigger it
+PARSERS = [
+    ({"memorymath_data.txt"}, _parse_memory_math),
+    ({"word_builder_score.txt"}, _parse_word_builder),
+    ({"englishpro_data.txt", "englishpro_score.txt"}, _parse_english_pro),
+    ({"football_quiz_data.txt", "football_quiz_score.txt", "highscores.json"}, _parse_football_quiz),
+    ({"carparking_data.txt"}, _parse_car_parking),
+]
+
+
+def parse_directory(root, directory, names, player_name=None):
+    """
+    Parse the legacy result files of one directory into sessions.
+
+    Runs in a worker process, so it only takes and returns plain data.
+
+    Parameters:
+    - root: str, directory the scan started from
+    - directory: str, directory holding the files
+    - names: list of str, legacy file names present in `directory`
+    - player_name: str or None, player of all sessions (default: from the directory name)
+
+    Returns:
+    - (records, errors): list of (import key, session dict) and list of error messages
+    """
+    present = set(names)
+    relative = os.path.relpath(directory, root)
+    kiosk = _kiosk_id(relative)
+    if player_name is None:
+        player_name = LEGACY_PLAYER if relative == os.curdir else os.path.basename(directory)
+    records = []
+    errors = []
+    for triggers, parser in PARSERS:
+        if not triggers & present:
+            continue
+        try:
+            for mode, sources, values in parser(directory, present):
+                if sources is None:
+                    # Keyed by content within this kiosk (highscores.json entries)
+                    key = _record_key(mode, kiosk, *values.pop("key"))
+                    sources = ["highscores.json"]
+                else:
+                    # Keyed by kiosk and content: another kiosk with the same score is a
+                    # session of its own, a copy of the same files (whatever their times) is not
+                    key = _record_key(mode, kiosk, *_file_parts(directory, sources))
+                mtime = max(os.path.getmtime(os.path.join(directory, name)) for name in sources)
+                session = {"player_name": player_name, "level": DEFAULT_LEVEL, "duration": DEFAULT_DURATION,
+                           "accuracy": None, "mode": mode,
+                           "timestamp": datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")}
+                session.update(values)
+                records.append((key, session))
+        except (OSError, ValueError, IndexError, TypeError) as e:
+            errors.append(f"{directory}: {parser.__name__[7:]}: {e}")
+    return records, errors
+
+
+def scan(root):
+    """
+    Yield (directory, legacy file names) for every directory under `root` holding any.
+    """
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        names = sorted(LEGACY_FILES.intersection(files))
+        if names:
+            yield directory, names
+
+
+def ingest(root, db_name="game_data.db", workers=None, player_name=None, batch_size=INGEST_BATCH_SIZE,
+           bulk=False):
+    """
+    Import the legacy result files found under `root` into the sessions database.
+
+    Directories are parsed in parallel by a process pool; the sessions are then saved
+    in batches of `batch_size`, one transaction each. Every session carries an import
+    key hashed from its kiosk and the contents of its source files, so running the
+    ingest again, or on a fresh copy of the same files, imports nothing twice.
+
+    Parameters:
+    - root: str, directory to scan
+    - db_name: str, path to the SQLite database file
+    - workers: int or None, parser processes (None: one per CPU, 1: parse in this process)
+    - player_name: str or None, player of all sessions (default: from the directory names)
+    - batch_size: int, sessions per transaction
+    - bulk: bool, save batches with save_sessions(bulk=True) semantics
+
+    Returns:
+    - dict with directories, records, duplicates, imported and errors
+    """
+    root = os.path.abspath(root)
+    directories = list(scan(root))
+    results = []
+    if workers == 1 or len(directories) <= 1:
+        results = [parse_directory(root, directory, names, player_name) for directory, names in directories]
+    elif directories:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(parse_directory, [root] * len(directories), *zip(*directories),
+                                    [player_name] * len(directories), chunksize=16))
+
+    records = {}
+    errors = []
+    parsed = 0
+    for directory_records, directory_errors in results:
+        errors += directory_errors
+        for key, session in directory_records:
+            parsed += 1
+            records.setdefault(key, session)
+    for error in errors:
+        print(f"[LegacyIngest] Skipped {error}")
+
+    # Oldest first, so session ids follow the order the games were played in
+    ordered = sorted(records.items(), key=lambda item: item[1]["timestamp"])
+    imported = 0
+    dm = DataManager(db_name, cache_size=0, use_daemon=False)
+    try:
+        for start in range(0, len(ordered), batch_size):
+            batch = ordered[start:start + batch_size]
+            imported += dm.import_sessions([session for key, session in batch], [key for key, session in batch],
+                                           source=root, bulk=bulk)
+    finally:
+        dm.close()
+    return {
+        "directories": len(directories),
+        "records": parsed,
+        "duplicates": parsed - len(records),
+        "imported": imported,
+        "errors": len(errors),
+    }
+
+
+def main():
+    """
+    Import legacy result files, e.g. nightly from a share the kiosks copy them to.
+
+    Usage: python legacy_ingest.py DIRECTORY [--db game_data.db] [--workers N] [--player NAME]
+                                   [--batch-size 5000] [--bulk]
+    """
+    parser = argparse.ArgumentParser(description="Import legacy SkillScape result files into the sessions database")
+    parser.add_argument("directory")
+    parser.add_argument("--db", default="game_data.db")
+    parser.add_argument("--workers", type=int, help="parser processes (default: one per CPU)")
+    parser.add_argument("--player", help="player of all imported sessions (default: the directory names)")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    parser.add_argument("--bulk", action="store_true", help="rebuild indexes once per batch (large backfills)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = ingest(args.directory, args.db, args.workers, args.player, args.batch_size, args.bulk)
+    print(f"[LegacyIngest] {summary['imported']} sessions imported from {summary['directories']} directories "
+          f"({summary['records']} records, {summary['duplicates']} duplicates, {summary['errors']} errors) "
+          f"in {time.perf_counter() - start:.2f}s")
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
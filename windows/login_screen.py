@@ -1,9 +1,13 @@
 import pygame
 import sys
 import os
-import subprocess
 import math
 import random
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler, AMBIENT_FPS
 
 # Initialize pygame
 pygame.init()
@@ -36,23 +40,24 @@ CHALK_WHITE = (235, 235, 235)
 # Screen setup
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("SkillScape - Login")
-clock = pygame.time.Clock()
+# Floating elements keep drifting while idle, so idle at a gentler rate
+frames = FrameScheduler(idle_fps=AMBIENT_FPS)
 
 # Fonts - Using more childlike fonts for primary school vibe
 try:
     # Try to use Comic Sans or similar fonts if available
-    title_font = pygame.font.SysFont('comicsansms', 48, bold=True)
-    heading_font = pygame.font.SysFont('comicsansms', 36, bold=True)
-    button_font = pygame.font.SysFont('comicsansms', 24, bold=True)
-    text_font = pygame.font.SysFont('comicsansms', 24)
-    small_font = pygame.font.SysFont('comicsansms', 18)
+    title_font = get_font('comicsansms', 48, bold=True)
+    heading_font = get_font('comicsansms', 36, bold=True)
+    button_font = get_font('comicsansms', 24, bold=True)
+    text_font = get_font('comicsansms', 24)
+    small_font = get_font('comicsansms', 18)
 except:
     # Fall back to Arial if Comic Sans is not available
-    title_font = pygame.font.SysFont('Arial', 48, bold=True)
-    heading_font = pygame.font.SysFont('Arial', 36, bold=True)
-    button_font = pygame.font.SysFont('Arial', 24, bold=True)
-    text_font = pygame.font.SysFont('Arial', 24)
-    small_font = pygame.font.SysFont('Arial', 18)
+    title_font = get_font('Arial', 48, bold=True)
+    heading_font = get_font('Arial', 36, bold=True)
+    button_font = get_font('Arial', 24, bold=True)
+    text_font = get_font('Arial', 24)
+    small_font = get_font('Arial', 18)
 
 # Global variables for resources
 background_img = None
@@ -174,7 +179,7 @@ class Button:
         pygame.draw.rect(screen, BLACK, button_rect, width=2, border_radius=self.border_radius)
 
         # Draw text
-        text_surf = button_font.render(self.text, True, self.text_color)
+        text_surf = render_text(button_font, self.text, True, self.text_color)
         text_rect = text_surf.get_rect(center=button_rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -234,7 +239,7 @@ class ScrollableList:
                 pygame.draw.rect(screen, LIGHT_YELLOW, item_rect, border_radius=5)
 
             # Draw item text
-            text_surf = text_font.render(self.items[i], True, BLACK)
+            text_surf = render_text(text_font, self.items[i], True, BLACK)
             text_rect = text_surf.get_rect(midleft=(item_rect.x + 20, item_rect.centery))
             screen.blit(text_surf, text_rect)
 
@@ -485,7 +490,7 @@ def show_login_screen():
         speed = random.uniform(0.3, 1.0)
 
         # Create a surface with the skill symbol
-        symbol_surface = text_font.render(symbol, True, color)
+        symbol_surface = render_text(text_font, symbol, True, color)
 
         # Create the floating element
         element = FloatingElement(x, y, image=symbol_surface, size=size, speed=speed)
@@ -509,8 +514,7 @@ def show_login_screen():
                         # Launch teacher login screen
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "teacher_login.py"])
+                        navigate("teacher_login.py")
                         return
 
                     # Check if parent button is clicked
@@ -519,8 +523,7 @@ def show_login_screen():
                         # Launch parent login screen
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "parent_login.py"])
+                        navigate("parent_login.py")
                         return
 
                     # Check if scroll list is clicked
@@ -537,15 +540,11 @@ def show_login_screen():
                             if music_loaded:
                                 pygame.mixer.music.stop()
 
+                            # Store the student in the session for the main screen to read
+                            get_session().login_student(selected_student)
+
                             # Launch main screen with the selected student
-                            pygame.quit()
-                            # Save student data to a file for the main screen to read
-                            with open("current_student.txt", "w") as f:
-                                f.write(f"{selected_student['name']}\n")
-                                f.write(f"{selected_student['level']}\n")
-                                f.write(f"{selected_student['icon']}\n")
-
-                            subprocess.run(["python", "main_screen.py"])
+                            navigate("main_screen.py")
                             return
 
             # Handle scrolling and other events in the scroll list
@@ -560,14 +559,8 @@ def show_login_screen():
             screen.blit(background_img, (0, 0))
         else:
             # Create a more colorful gradient background as fallback
-            for y in range(SCREEN_HEIGHT):
-                # Create a gradient from blue to light blue with a hint of purple
-                color = (
-                    int(50 + (180 - 50) * y / SCREEN_HEIGHT),  # R
-                    int(150 + (230 - 150) * y / SCREEN_HEIGHT),  # G
-                    int(255)  # B - keep blue high for a cheerful sky color
-                )
-                pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+            # Gradient from blue to light blue, keeping blue high for a cheerful sky color
+            screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), ((50, 150, 255), (180, 230, 255))), (0, 0))
 
         # Draw floating elements behind everything else
         for element in floating_elements:
@@ -579,11 +572,11 @@ def show_login_screen():
             screen.blit(logo_img, logo_rect)
         else:
             # Draw title text as fallback
-            title_text = title_font.render("SkillScape", True, CRAYON_PURPLE)
+            title_text = render_text(title_font, "SkillScape", True, CRAYON_PURPLE)
             title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, logo_y))
 
             # Add a shadow for better visibility
-            shadow_text = title_font.render("SkillScape", True, BLACK)
+            shadow_text = render_text(title_font, "SkillScape", True, BLACK)
             shadow_rect = title_rect.copy()
             shadow_rect.x += 3
             shadow_rect.y += 3
@@ -604,7 +597,7 @@ def show_login_screen():
             pygame.draw.circle(screen, CRAYON_ORANGE, (x, footer_rect.top), scallop_radius)
 
         # Draw a colorful welcome message
-        welcome_text = heading_font.render("Welcome to SkillScape!", True, CRAYON_PURPLE)
+        welcome_text = render_text(heading_font, "Welcome to SkillScape!", True, CRAYON_PURPLE)
         welcome_rect = welcome_text.get_rect(center=(SCREEN_WIDTH // 2, welcome_y))
 
         # Add a fun background for the welcome message
@@ -620,7 +613,7 @@ def show_login_screen():
         screen.blit(welcome_text, welcome_rect)
 
         # Draw instruction with consistent center alignment
-        instruction_text = text_font.render("Please select your name to begin:", True, BLACK)
+        instruction_text = render_text(text_font, "Please select your name to begin:", True, BLACK)
         instruction_rect = instruction_text.get_rect(center=(SCREEN_WIDTH // 2, instruction_y))
         screen.blit(instruction_text, instruction_rect)
 
@@ -631,7 +624,8 @@ def show_login_screen():
         login_button.draw()
 
         pygame.display.flip()
-        clock.tick(60)
+        # Stay at full rate while a hovered button pulses
+        frames.tick(animating=any(button.pulsing for button in (teacher_button, parent_button, login_button)))
 
     # Stop music if we're exiting
     if music_loaded:
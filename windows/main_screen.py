@@ -1,9 +1,13 @@
 import pygame
 import sys
 import os
-import subprocess
 import math
 import random
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler, AMBIENT_FPS
 
 # Initialize pygame
 pygame.init()
@@ -36,23 +40,24 @@ CHALK_WHITE = (235, 235, 235)
 # Screen setup
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("SkillScape - Main Menu")
-clock = pygame.time.Clock()
+# Floating elements keep drifting while idle, so idle at a gentler rate
+frames = FrameScheduler(idle_fps=AMBIENT_FPS)
 
 # Fonts - Using more childlike fonts for primary school vibe
 try:
     # Try to use Comic Sans or similar fonts if available
-    title_font = pygame.font.SysFont('comicsansms', 48, bold=True)
-    heading_font = pygame.font.SysFont('comicsansms', 36, bold=True)
-    button_font = pygame.font.SysFont('comicsansms', 24, bold=True)
-    text_font = pygame.font.SysFont('comicsansms', 24)
-    small_font = pygame.font.SysFont('comicsansms', 18)
+    title_font = get_font('comicsansms', 48, bold=True)
+    heading_font = get_font('comicsansms', 36, bold=True)
+    button_font = get_font('comicsansms', 24, bold=True)
+    text_font = get_font('comicsansms', 24)
+    small_font = get_font('comicsansms', 18)
 except:
     # Fall back to Arial if Comic Sans is not available
-    title_font = pygame.font.SysFont('Arial', 48, bold=True)
-    heading_font = pygame.font.SysFont('Arial', 36, bold=True)
-    button_font = pygame.font.SysFont('Arial', 24, bold=True)
-    text_font = pygame.font.SysFont('Arial', 24)
-    small_font = pygame.font.SysFont('Arial', 18)
+    title_font = get_font('Arial', 48, bold=True)
+    heading_font = get_font('Arial', 36, bold=True)
+    button_font = get_font('Arial', 24, bold=True)
+    text_font = get_font('Arial', 24)
+    small_font = get_font('Arial', 18)
 
 # Global variables for resources
 background_img = None
@@ -67,16 +72,8 @@ current_student = {
     "icon": None
 }
 
-try:
-    if os.path.exists("current_student.txt"):
-        with open("current_student.txt", "r") as f:
-            lines = f.readlines()
-            if len(lines) >= 3:
-                current_student["name"] = lines[0].strip()
-                current_student["level"] = lines[1].strip()
-                current_student["icon"] = lines[2].strip()
-except Exception as e:
-    print(f"Error loading student data: {e}")
+if get_session().student:
+    current_student.update(get_session().student)
 
 # Load images
 try:
@@ -178,7 +175,7 @@ class Button:
         pygame.draw.rect(screen, BLACK, button_rect, width=2, border_radius=self.border_radius)
 
         # Draw text
-        text_surf = button_font.render(self.text, True, self.text_color)
+        text_surf = render_text(button_font, self.text, True, self.text_color)
         text_rect = text_surf.get_rect(center=button_rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -270,7 +267,7 @@ def show_main_screen():
         speed = random.uniform(0.3, 1.0)
 
         # Create a surface with the skill symbol
-        symbol_surface = text_font.render(symbol, True, color)
+        symbol_surface = render_text(text_font, symbol, True, color)
 
         # Create the floating element
         element = FloatingElement(x, y, image=symbol_surface, size=size, speed=speed)
@@ -292,8 +289,7 @@ def show_main_screen():
                         if music_loaded:
                             pygame.mixer.music.stop()
                         # Launch instructions screen
-                        pygame.quit()
-                        subprocess.run(["python", "MemoryMath_instructions.py"])
+                        navigate("MemoryMath_instructions.py")
                         return
 
                     elif logout_button.is_clicked(mouse_pos):
@@ -301,8 +297,8 @@ def show_main_screen():
                         if music_loaded:
                             pygame.mixer.music.stop()
                         # Return to login screen
-                        pygame.quit()
-                        subprocess.run(["python", "login_screen.py"])
+                        get_session().logout()
+                        navigate("login_screen.py")
                         return
 
                     elif rankings_button.is_clicked(mouse_pos):
@@ -310,8 +306,7 @@ def show_main_screen():
                         if music_loaded:
                             pygame.mixer.music.stop()
                         # Launch rankings screen
-                        pygame.quit()
-                        subprocess.run(["python", "student_rankings.py"])
+                        navigate("student_rankings.py")
                         return
 
         # Update floating elements
@@ -323,14 +318,8 @@ def show_main_screen():
             screen.blit(background_img, (0, 0))
         else:
             # Create a more colorful gradient background as fallback
-            for y in range(SCREEN_HEIGHT):
-                # Create a gradient from blue to light blue with a hint of purple
-                color = (
-                    int(50 + (180 - 50) * y / SCREEN_HEIGHT),  # R
-                    int(150 + (230 - 150) * y / SCREEN_HEIGHT),  # G
-                    int(255)  # B - keep blue high for a cheerful sky color
-                )
-                pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+            # Gradient from blue to light blue, keeping blue high for a cheerful sky color
+            screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), ((50, 150, 255), (180, 230, 255))), (0, 0))
 
         # Draw floating elements behind everything else
         for element in floating_elements:
@@ -342,11 +331,11 @@ def show_main_screen():
             screen.blit(logo_img, logo_rect)
         else:
             # Draw title text as fallback
-            title_text = title_font.render("SkillScape", True, CRAYON_PURPLE)
+            title_text = render_text(title_font, "SkillScape", True, CRAYON_PURPLE)
             title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, logo_y))
 
             # Add a shadow for better visibility
-            shadow_text = title_font.render("SkillScape", True, BLACK)
+            shadow_text = render_text(title_font, "SkillScape", True, BLACK)
             shadow_rect = title_rect.copy()
             shadow_rect.x += 3
             shadow_rect.y += 3
@@ -389,17 +378,17 @@ def show_main_screen():
             pygame.draw.circle(screen, BLACK, (profile_rect.x + 30, profile_rect.y + 30), 24, width=2)
 
             # Add initial with slight shadow for depth
-            shadow_text = small_font.render(current_student["name"][0], True, BLACK)
+            shadow_text = render_text(small_font, current_student["name"][0], True, BLACK)
             shadow_rect = shadow_text.get_rect(center=(profile_rect.x + 32, profile_rect.y + 32))
             screen.blit(shadow_text, shadow_rect)
 
-            text = small_font.render(current_student["name"][0], True, WHITE)
+            text = render_text(small_font, current_student["name"][0], True, WHITE)
             text_rect = text.get_rect(center=(profile_rect.x + 30, profile_rect.y + 30))
             screen.blit(text, text_rect)
             name_x = profile_rect.x + 60
 
         # Draw student name with better styling
-        name_text = small_font.render(current_student["name"], True, BLACK)
+        name_text = render_text(small_font, current_student["name"], True, BLACK)
         screen.blit(name_text, (name_x, profile_rect.y + 15))
 
         # Extract just the level number (e.g., "Level 2" from "Level 2 - Explorer")
@@ -407,7 +396,7 @@ def show_main_screen():
         level_number = level_parts[0] if len(level_parts) > 0 else current_student["level"]
 
         # Draw simplified level
-        level_text = small_font.render(level_number, True, BLUE)
+        level_text = render_text(small_font, level_number, True, BLUE)
         screen.blit(level_text, (name_x, profile_rect.y + 35))
 
         # Draw a colorful banner at the BOTTOM of the screen
@@ -423,7 +412,7 @@ def show_main_screen():
             pygame.draw.circle(screen, CRAYON_ORANGE, (x, footer_rect.top), scallop_radius)
 
         # Draw welcome message with decorative background
-        welcome_text = heading_font.render(f"Hello, {current_student['name']}!", True, CRAYON_PURPLE)
+        welcome_text = render_text(heading_font, f"Hello, {current_student['name']}!", True, CRAYON_PURPLE)
         welcome_rect = welcome_text.get_rect(center=(SCREEN_WIDTH // 2, welcome_y))
 
         # Add a fun background for the welcome message
@@ -439,11 +428,11 @@ def show_main_screen():
         screen.blit(welcome_text, welcome_rect)
 
         # Draw big heading with shadow for better visibility
-        heading_text = title_font.render("Start Your Learning Journey", True, WHITE)
+        heading_text = render_text(title_font, "Start Your Learning Journey", True, WHITE)
         heading_rect = heading_text.get_rect(center=(SCREEN_WIDTH // 2, 280))
 
         # Add shadow
-        shadow_heading = title_font.render("Start Your Learning Journey", True, BLACK)
+        shadow_heading = render_text(title_font, "Start Your Learning Journey", True, BLACK)
         shadow_heading_rect = heading_rect.copy()
         shadow_heading_rect.x += 3
         shadow_heading_rect.y += 3
@@ -457,7 +446,8 @@ def show_main_screen():
         rankings_button.draw()
 
         pygame.display.flip()
-        clock.tick(60)
+        # Stay at full rate while a hovered button pulses
+        frames.tick(animating=any(button.pulsing for button in (start_button, logout_button, rankings_button)))
 
     # Stop music if we're exiting
     if music_loaded:
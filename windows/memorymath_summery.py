@@ -1,6 +1,12 @@
 import pygame
 import sys
 import os
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from dirty_rects import DirtyRenderer
 
 # Constants
 SCREEN_WIDTH = 800
@@ -48,9 +54,9 @@ def show_summary(screen, game_data):
         pygame.mixer.music.play(-1)  # -1 means loop indefinitely
 
     # Prepare fonts
-    big_font = pygame.font.SysFont('Arial', 48, bold=True)
-    medium_font = pygame.font.SysFont('Arial', 32)
-    font = pygame.font.SysFont('Arial', 24)
+    big_font = get_font('Arial', 48, bold=True)
+    medium_font = get_font('Arial', 32)
+    font = get_font('Arial', 24)
 
     # Calculate star rating based on score
     if game_data['score'] >= 50:
@@ -91,10 +97,13 @@ def show_summary(screen, game_data):
     # Main loop for the summary screen
     summary_running = True
     action = None
+    frames = FrameScheduler()
+    renderer = DirtyRenderer(screen)
 
     while summary_running:
         # Handle events
         for event in pygame.event.get():
+            renderer.handle_event(event)
             if event.type == pygame.QUIT:
                 return "quit"
             # Check for button clicks
@@ -111,22 +120,18 @@ def show_summary(screen, game_data):
                         if music_loaded:
                             pygame.mixer.music.stop()
                         # Simply run wordbuilderl1.py and quit
-                        pygame.quit()
-                        os.system(f"{sys.executable} wordbuilder_instructions.py")
+                        navigate("wordbuilder_instructions.py")
                         sys.exit()
 
+        if not renderer.begin_frame():
+            frames.tick()
+            continue
+
         # Draw background with gradient
-        for y in range(SCREEN_HEIGHT):
-            # Create a gradient from dark blue to light blue
-            color = (
-                int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-            )
-            pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+        screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Title
-        title_text = big_font.render("Well Done! Congratulations!", True, WHITE)
+        title_text = render_text(big_font, "Well Done! Congratulations!", True, WHITE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 70))
 
         # Add a fancy box around the title
@@ -142,7 +147,7 @@ def show_summary(screen, game_data):
         screen.blit(title_text, title_rect)
 
         # Performance message
-        performance_text = medium_font.render(performance_msg, True, WHITE)
+        performance_text = render_text(medium_font, performance_msg, True, WHITE)
         screen.blit(performance_text,
                     (SCREEN_WIDTH // 2 - performance_text.get_width() // 2, 130))
 
@@ -182,7 +187,7 @@ def show_summary(screen, game_data):
         pygame.draw.rect(screen, BLACK, summary_box, width=2, border_radius=10)
 
         # Summary heading
-        summary_heading = medium_font.render("Game Summary", True, BLACK)
+        summary_heading = render_text(medium_font, "Game Summary", True, BLACK)
         screen.blit(summary_heading,
                     (SCREEN_WIDTH // 2 - summary_heading.get_width() // 2, 240))
 
@@ -195,32 +200,32 @@ def show_summary(screen, game_data):
         y_pos = 300
 
         # Final score
-        final_score_text = font.render(f"Final Score: {game_data['score']}", True, BLACK)
+        final_score_text = render_text(font, f"Final Score: {game_data['score']}", True, BLACK)
         screen.blit(final_score_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Matches
-        matches_text = font.render(f"Matches Found: {game_data['matches']}/6", True, BLACK)
+        matches_text = render_text(font, f"Matches Found: {game_data['matches']}/6", True, BLACK)
         screen.blit(matches_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Efficiency
-        efficiency_text = font.render(f"Efficiency: {efficiency}%", True, BLACK)
+        efficiency_text = render_text(font, f"Efficiency: {efficiency}%", True, BLACK)
         screen.blit(efficiency_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Attempts
-        attempts_text = font.render(f"Total Attempts: {game_data['attempts']}", True, BLACK)
+        attempts_text = render_text(font, f"Total Attempts: {game_data['attempts']}", True, BLACK)
         screen.blit(attempts_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Flips
-        flips_text = font.render(f"Total Card Flips: {game_data['flips']}", True, BLACK)
+        flips_text = render_text(font, f"Total Card Flips: {game_data['flips']}", True, BLACK)
         screen.blit(flips_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Time taken
-        time_text = font.render(f"Time Taken: {game_data['time']} seconds", True, BLACK)
+        time_text = render_text(font, f"Time Taken: {game_data['time']} seconds", True, BLACK)
         screen.blit(time_text, (summary_box.left + 30, y_pos))
 
         # Continue button
@@ -229,12 +234,12 @@ def show_summary(screen, game_data):
         pygame.draw.rect(screen, GREEN, continue_rect, border_radius=10)
         pygame.draw.rect(screen, BLACK, continue_rect, width=2, border_radius=10)
 
-        continue_text = font.render("Continue", True, BLACK)
+        continue_text = render_text(font, "Continue", True, BLACK)
         continue_text_rect = continue_text.get_rect(center=continue_rect.center)
         screen.blit(continue_text, continue_text_rect)
 
-        pygame.display.flip()
-        pygame.time.Clock().tick(60)
+        renderer.present()
+        frames.tick()
 
     return action
 
@@ -246,6 +251,8 @@ def save_game_data(game_data):
     Parameters:
     game_data (dict): Dictionary containing game statistics
     """
+    get_session().record_result("Memory Math", game_data)
+
     try:
         # Save core data to a file that the final summary can read
         with open("memorymath_data.txt", "w") as f:
@@ -266,27 +273,9 @@ if __name__ == "__main__":
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Summary Screen")
 
-    # Get game data from command line arguments if provided
-    if len(sys.argv) >= 6:
-        try:
-            test_data = {
-                'score': int(sys.argv[1]),
-                'matches': int(sys.argv[2]),
-                'attempts': int(sys.argv[3]),
-                'flips': int(sys.argv[4]),
-                'time': int(sys.argv[5])
-            }
-        except (ValueError, IndexError):
-            # Use default test data if there's a problem with args
-            test_data = {
-                'score': 45,
-                'matches': 6,
-                'attempts': 8,
-                'flips': 16,
-                'time': 65
-            }
-    else:
-        # Test data if no arguments provided
+    # Get game data from the session, or test data if no game was played
+    test_data = get_session().get_result("Memory Math")
+    if test_data is None:
         test_data = {
             'score': 45,
             'matches': 6,
@@ -2,9 +2,14 @@ import pygame
 import random
 import sys
 import time
-import subprocess
 import os
 import math
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from card_atlas import CardAtlas
 
 # Initialize pygame
 pygame.init()
@@ -39,10 +44,13 @@ LIGHT_RED = (255, 100, 100)
 # Screen setup
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Arithmetic Card Matching Game")
-clock = pygame.time.Clock()
-font = pygame.font.SysFont('Arial', 24, bold=True)
-big_font = pygame.font.SysFont('Arial', 36, bold=True)
-small_font = pygame.font.SysFont('Arial', 18)
+frames = FrameScheduler()
+font = get_font('Arial', 24, bold=True)
+big_font = get_font('Arial', 36, bold=True)
+small_font = get_font('Arial', 18)
+
+# Pre-rendered card sprites, rebuilt for every new board
+card_atlas = CardAtlas(CARD_WIDTH, CARD_HEIGHT, font, big_font)
 
 # Global variables for resources
 card_flip_sound = None
@@ -186,6 +194,8 @@ class Card:
             return (int(v * 255), int(p * 255), int(q * 255))
 
     def draw(self):
+        colors = (self.color, self.light_color)
+
         # Handle flip animation
         if self.animating:
             self.flip_progress += self.flip_speed
@@ -198,135 +208,25 @@ class Card:
 
             # Ensure width doesn't go below 1 pixel to avoid errors
             width = max(1, int(self.width * scale_factor))
-            height = self.height
 
             # Center the card during animation
             x_offset = (self.width - width) // 2
-            adjusted_x = self.x + x_offset
 
             # First half of animation shows back/front, second half shows front/back
             if self.flip_progress < 90:
-                if self.is_flipped:  # Flipping from back to front
-                    self.draw_card_back(adjusted_x, self.y, width, height)
-                else:  # Flipping from front to back
-                    self.draw_card_front(adjusted_x, self.y, width, height)
+                face = "back" if self.is_flipped else "front"
             else:
-                if self.is_flipped:  # Flipping from back to front
-                    self.draw_card_front(adjusted_x, self.y, width, height)
-                else:  # Flipping from front to back
-                    self.draw_card_back(adjusted_x, self.y, width, height)
+                face = "front" if self.is_flipped else "back"
+            screen.blit(card_atlas.get_flip_frame(self.problem, colors, face, width), (self.x + x_offset, self.y))
         else:
             # Normal drawing (no animation)
             if self.is_matched:
-                self.draw_matched_card()
+                state = "matched"
             elif self.is_flipped:
-                self.draw_card_front(self.x, self.y, self.width, self.height)
+                state = "front"
             else:
-                self.draw_card_back(self.x, self.y, self.width, self.height)
-
-    def draw_card_front(self, x, y, width, height):
-        # Enhanced card front with gradient effect
-        rect = pygame.Rect(x, y, width, height)
-
-        # Draw shadow (only if width is not too small during animation)
-        if width > 10:
-            shadow_offset = 4
-            shadow_rect = pygame.Rect(x + shadow_offset, y + shadow_offset, width, height)
-            pygame.draw.rect(screen, DARK_GRAY, shadow_rect, border_radius=10)
-
-        # Draw card with gradient effect
-        for i in range(5):
-            blend_factor = i / 5
-            color = (
-                int(self.color[0] * (1 - blend_factor) + self.light_color[0] * blend_factor),
-                int(self.color[1] * (1 - blend_factor) + self.light_color[1] * blend_factor),
-                int(self.color[2] * (1 - blend_factor) + self.light_color[2] * blend_factor)
-            )
-            inner_rect = pygame.Rect(x, y + i * height // 5, width, height // 5)
-            pygame.draw.rect(screen, color, inner_rect, border_radius=10)
-
-        # Draw border
-        pygame.draw.rect(screen, BLACK, rect, width=2, border_radius=10)
-
-        # Create background for text (making sure dimensions are positive)
-        text_bg_width = max(1, width - 20)  # Ensure width is at least 1
-        text_bg_height = 40
-
-        # Skip text rendering if the card is too narrow during animation
-        if text_bg_width < 10:
-            return
-
-        text_bg_rect = pygame.Rect(
-            x + (width - text_bg_width) // 2,
-            y + (height - text_bg_height) // 2,
-            text_bg_width,
-            text_bg_height
-        )
-
-        # Draw text background with slightly transparent white
-        s = pygame.Surface((text_bg_width, text_bg_height), pygame.SRCALPHA)
-        s.fill((255, 255, 255, 220))  # White with alpha
-        screen.blit(s, text_bg_rect)
-        pygame.draw.rect(screen, BLACK, text_bg_rect, width=1, border_radius=5)
-
-        # Draw problem text
-        text = font.render(self.problem, True, BLACK)
-        text_rect = text.get_rect(center=(x + width // 2, y + height // 2))
-        screen.blit(text, text_rect)
-
-    def draw_card_back(self, x, y, width, height):
-        # Enhanced card back with decorative elements
-        rect = pygame.Rect(x, y, width, height)
-
-        # Draw shadow (only if width is not too small during animation)
-        if width > 10:
-            shadow_offset = 4
-            shadow_rect = pygame.Rect(x + shadow_offset, y + shadow_offset, width, height)
-            pygame.draw.rect(screen, DARK_GRAY, shadow_rect, border_radius=10)
-
-        # Draw main background with gradient
-        for i in range(5):
-            blend_factor = i / 5
-            color = (
-                int(DARK_BLUE[0] * (1 - blend_factor) + BLUE[0] * blend_factor),
-                int(DARK_BLUE[1] * (1 - blend_factor) + BLUE[1] * blend_factor),
-                int(DARK_BLUE[2] * (1 - blend_factor) + BLUE[2] * blend_factor)
-            )
-            inner_rect = pygame.Rect(x, y + i * height // 5, width, height // 5)
-            pygame.draw.rect(screen, color, inner_rect, border_radius=10)
-
-        # Draw a border around the card
-        pygame.draw.rect(screen, BLACK, rect, width=2, border_radius=10)
-
-        # Skip decorative elements if card is too narrow during animation
-        if width < 20:
-            return
-
-        # Add decorative pattern
-        # Inner border
-        margin = 10
-        inner_rect = pygame.Rect(x + margin, y + margin, width - 2 * margin, height - 2 * margin)
-        pygame.draw.rect(screen, LIGHT_BLUE, inner_rect, width=2, border_radius=5)
-
-        # Draw "?" in the center
-        q_text = big_font.render("?", True, WHITE)
-        q_rect = q_text.get_rect(center=(x + width // 2, y + height // 2))
-        screen.blit(q_text, q_rect)
-
-    def draw_matched_card(self):
-        # Special appearance for matched cards
-        # Draw the card front with green tint
-        self.draw_card_front(self.x, self.y, self.width, self.height)
-
-        # Add green overlay to indicate matched status
-        s = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        s.fill((100, 255, 100, 128))  # Semi-transparent green
-        screen.blit(s, (self.x, self.y))
-
-        # Add a small checkmark
-        check_text = font.render("✓", True, GREEN)
-        check_rect = check_text.get_rect(center=(self.x + self.width - 20, self.y + self.height - 20))
-        screen.blit(check_text, check_rect)
+                state = "back"
+            screen.blit(card_atlas.get(self.problem, colors, state), (self.x, self.y))
 
     def is_clicked(self, pos):
         return self.rect.collidepoint(pos) and not self.is_matched and not self.animating
@@ -396,6 +296,7 @@ class ArithmeticCardGame:
                     card_list[index].rect = pygame.Rect(x, y, CARD_WIDTH, CARD_HEIGHT)
 
         self.cards = card_list
+        card_atlas.build(self.cards)
 
     def handle_click(self, pos):
         # If we're waiting for cards to flip back, ignore clicks
@@ -460,6 +361,12 @@ class ArithmeticCardGame:
                 # We found a card to flip, so stop checking
                 break
 
+    def is_animating(self):
+        """
+        Return True while a card is flipping or a mismatched pair is waiting to flip back.
+        """
+        return self.wait_time > 0 or any(card.animating for card in self.cards)
+
     def update(self):
         # Update wait time and flip back cards if needed
         if self.wait_time > 0:
@@ -485,14 +392,7 @@ class ArithmeticCardGame:
 
     def draw(self):
         # Draw gradient background
-        for y in range(SCREEN_HEIGHT):
-            # Create a gradient from dark blue to light blue
-            color = (
-                int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-            )
-            pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+        screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Draw all cards
         for card in self.cards:
@@ -507,7 +407,7 @@ class ArithmeticCardGame:
         pygame.draw.rect(screen, BLACK, panel_rect, width=2, border_radius=10)
 
         # Add a title to the panel
-        panel_title = font.render("Game Stats", True, BLACK)
+        panel_title = render_text(font, "Game Stats", True, BLACK)
         screen.blit(panel_title, (panel_rect.centerx - panel_title.get_width() // 2, panel_rect.y + 10))
 
         # Draw a line under the title
@@ -517,38 +417,38 @@ class ArithmeticCardGame:
                          2)
 
         # Draw the score with colored background (like original)
-        score_label = font.render("Score:", True, BLACK)
+        score_label = render_text(font, "Score:", True, BLACK)
         screen.blit(score_label, (panel_rect.x + 15, panel_rect.y + 50))
 
         score_bg = pygame.Rect(panel_rect.x + 90, panel_rect.y + 50, 65, 30)
         pygame.draw.rect(screen, GREEN, score_bg, border_radius=5)
         pygame.draw.rect(screen, BLACK, score_bg, width=1, border_radius=5)
 
-        score_text = font.render(str(self.score), True, WHITE)
+        score_text = render_text(font, str(self.score), True, WHITE)
         screen.blit(score_text, (score_bg.centerx - score_text.get_width() // 2,
                                  score_bg.centery - score_text.get_height() // 2))
 
         # Attempts
-        attempts_label = font.render("Tries:", True, BLACK)
+        attempts_label = render_text(font, "Tries:", True, BLACK)
         screen.blit(attempts_label, (panel_rect.x + 15, panel_rect.y + 90))
 
         attempts_bg = pygame.Rect(panel_rect.x + 90, panel_rect.y + 90, 65, 30)
         pygame.draw.rect(screen, BLUE, attempts_bg, border_radius=5)
         pygame.draw.rect(screen, BLACK, attempts_bg, width=1, border_radius=5)
 
-        attempts_text = font.render(str(self.attempts), True, WHITE)
+        attempts_text = render_text(font, str(self.attempts), True, WHITE)
         screen.blit(attempts_text, (attempts_bg.centerx - attempts_text.get_width() // 2,
                                     attempts_bg.centery - attempts_text.get_height() // 2))
 
         # Flips
-        flips_label = font.render("Flips:", True, BLACK)
+        flips_label = render_text(font, "Flips:", True, BLACK)
         screen.blit(flips_label, (panel_rect.x + 15, panel_rect.y + 130))
 
         flips_bg = pygame.Rect(panel_rect.x + 90, panel_rect.y + 130, 65, 30)
         pygame.draw.rect(screen, PURPLE, flips_bg, border_radius=5)
         pygame.draw.rect(screen, BLACK, flips_bg, width=1, border_radius=5)
 
-        flips_value = font.render(str(self.flips), True, WHITE)
+        flips_value = render_text(font, str(self.flips), True, WHITE)
         screen.blit(flips_value, (flips_bg.centerx - flips_value.get_width() // 2,
                                   flips_bg.centery - flips_value.get_height() // 2))
 
@@ -558,15 +458,15 @@ class ArithmeticCardGame:
         pygame.draw.rect(screen, PINK, free_flips_bg, border_radius=5)
         pygame.draw.rect(screen, BLACK, free_flips_bg, width=1, border_radius=5)
 
-        free_text = font.render(str(free_flips), True, WHITE)
+        free_text = render_text(font, str(free_flips), True, WHITE)
         screen.blit(free_text, (free_flips_bg.centerx - free_text.get_width() // 2,
                                 free_flips_bg.centery - free_text.get_height() // 2))
 
-        free_label = font.render("Free:", True, BLACK)
+        free_label = render_text(font, "Free:", True, BLACK)
         screen.blit(free_label, (panel_rect.x + 15, panel_rect.y + 170))
 
         # Time
-        time_label = font.render("Time:", True, BLACK)
+        time_label = render_text(font, "Time:", True, BLACK)
         screen.blit(time_label, (panel_rect.x + 15, panel_rect.y + 210))
 
         # Calculate time based on whether game is over or not
@@ -584,7 +484,7 @@ class ArithmeticCardGame:
         pygame.draw.rect(screen, ORANGE, time_bg, border_radius=5)
         pygame.draw.rect(screen, BLACK, time_bg, width=1, border_radius=5)
 
-        time_text = font.render(time_str, True, WHITE)
+        time_text = render_text(font, time_str, True, WHITE)
         screen.blit(time_text, (time_bg.centerx - time_text.get_width() // 2,
                                 time_bg.centery - time_text.get_height() // 2))
 
@@ -610,17 +510,17 @@ class ArithmeticCardGame:
         pygame.draw.rect(screen, GREEN, continue_btn, border_radius=10)
         pygame.draw.rect(screen, BLACK, continue_btn, width=2, border_radius=10)
 
-        continue_text = font.render("Continue", True, WHITE)
+        continue_text = render_text(font, "Continue", True, WHITE)
         continue_rect = continue_text.get_rect(center=continue_btn.center)
         screen.blit(continue_text, continue_rect)
 
         # Draw congratulations message
-        congrats = big_font.render("Congratulations!", True, WHITE)
+        congrats = render_text(big_font, "Congratulations!", True, WHITE)
         congrats_rect = congrats.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
         screen.blit(congrats, congrats_rect)
 
         # Draw final score
-        score_text = big_font.render(f"Score: {self.score}", True, WHITE)
+        score_text = render_text(big_font, f"Score: {self.score}", True, WHITE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         screen.blit(score_text, score_rect)
 
@@ -630,7 +530,7 @@ class ArithmeticCardGame:
         seconds = elapsed_time % 60
         time_str = f"Time: {minutes}:{seconds:02d}"
 
-        time_text = font.render(time_str, True, WHITE)
+        time_text = render_text(font, time_str, True, WHITE)
         time_rect = time_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
         screen.blit(time_text, time_rect)
 
@@ -679,29 +579,21 @@ def main():
                                 success_sound.play()
                                 pygame.time.delay(500)  # Wait for sound to play a bit
 
-                            # Exit to summary screen
-                            pygame.quit()
-
-                            # Pass game data to summary screen
-                            game_data = game.get_game_data()
-                            subprocess.run([
-                                "python", "memorymath_summery.py",
-                                str(game_data['score']),
-                                str(game_data['matches']),
-                                str(game_data['attempts']),
-                                str(game_data['flips']),
-                                str(game_data['time'])
-                            ])
+                            # Exit to summary screen, passing the game data through the session
+                            get_session().record_result("Memory Math", game.get_game_data())
+                            navigate("memorymath_summery.py")
                             return  # Exit function to prevent further game updates
 
         # Update game state
         game.update()
 
+        frames.mark_draw()
+
         # Draw the game
         game.draw()
 
         pygame.display.flip()
-        clock.tick(60)
+        frames.tick(animating=game.is_animating())
 
     pygame.quit()
     sys.exit()
@@ -1,7 +1,11 @@
 import pygame
 import sys
 import os
-import subprocess
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
 
 # Initialize pygame
 pygame.init()
@@ -29,14 +33,14 @@ LIGHT_RED = (255, 100, 100)
 # Screen setup
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("MemoryMath - Parent Login")
-clock = pygame.time.Clock()
+frames = FrameScheduler()
 
 # Fonts
-title_font = pygame.font.SysFont('Arial', 48, bold=True)
-heading_font = pygame.font.SysFont('Arial', 36, bold=True)
-button_font = pygame.font.SysFont('Arial', 24, bold=True)
-text_font = pygame.font.SysFont('Arial', 24)
-small_font = pygame.font.SysFont('Arial', 18)
+title_font = get_font('Arial', 48, bold=True)
+heading_font = get_font('Arial', 36, bold=True)
+button_font = get_font('Arial', 24, bold=True)
+text_font = get_font('Arial', 24)
+small_font = get_font('Arial', 18)
 
 # Global variables for resources
 background_img = None
@@ -98,7 +102,7 @@ class Button:
 
         pygame.draw.rect(screen, BLACK, self.rect, width=2, border_radius=self.border_radius)
 
-        text_surf = button_font.render(self.text, True, self.text_color)
+        text_surf = render_text(button_font, self.text, True, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -126,9 +130,9 @@ class TextInput:
         if self.text:
             # Show asterisks if password
             display_text = '*' * len(self.text) if self.is_password else self.text
-            text_surface = text_font.render(display_text, True, BLACK)
+            text_surface = render_text(text_font, display_text, True, BLACK)
         else:
-            text_surface = small_font.render(self.placeholder, True, DARK_GRAY)
+            text_surface = render_text(small_font, self.placeholder, True, DARK_GRAY)
 
         # Ensure text fits within the box
         text_rect = text_surface.get_rect(midleft=(self.rect.x + 10, self.rect.centery))
@@ -229,8 +233,7 @@ def show_parent_login():
                         # Return to main login screen
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "login_screen.py"])
+                        navigate("login_screen.py")
                         return
 
                     if login_button.is_clicked(mouse_pos):
@@ -239,22 +242,17 @@ def show_parent_login():
                         password = password_input.text
 
                         if username in parent_accounts and parent_accounts[username]["password"] == password:
-                            # Login successful - save parent username to file
-                            try:
-                                with open("current_parent.txt", "w") as f:
-                                    f.write(username)
-                                # Also save child data for easy access
-                                with open("current_child.txt", "w") as f:
-                                    f.write(parent_accounts[username]["child_name"] + "\n")
-                                    f.write(parent_accounts[username]["child_level"])
-                            except Exception as e:
-                                print(f"Error saving parent data: {e}")
+                            # Login successful - store parent and child in the session
+                            get_session().login_parent(
+                                username,
+                                parent_accounts[username]["child_name"],
+                                parent_accounts[username]["child_level"]
+                            )
 
                             # Launch parent dashboard
                             if music_loaded:
                                 pygame.mixer.music.stop()
-                            pygame.quit()
-                            subprocess.run(["python", "parent_main.py"])
+                            navigate("parent_main.py")
                             return
                         else:
                             # Login failed
@@ -267,35 +265,28 @@ def show_parent_login():
             screen.blit(background_img, (0, 0))
         else:
             # Gradient background as fallback
-            for y in range(SCREEN_HEIGHT):
-                # Create a gradient from dark blue to light blue
-                color = (
-                    int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-                )
-                pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+            screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Draw logo if available
         if logo_img:
             screen.blit(logo_img, (SCREEN_WIDTH // 2 - logo_img.get_width() // 2, 50))
         else:
             # Draw title text as fallback
-            title_text = title_font.render("Memory Math", True, WHITE)
+            title_text = render_text(title_font, "Memory Math", True, WHITE)
             title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 80))
             screen.blit(title_text, title_rect)
 
         # Draw login heading
-        login_text = heading_font.render("Parent Login", True, WHITE)
+        login_text = render_text(heading_font, "Parent Login", True, WHITE)
         login_rect = login_text.get_rect(center=(SCREEN_WIDTH // 2, 200))
         screen.blit(login_text, login_rect)
 
         # Draw text inputs
-        username_label = text_font.render("Username:", True, WHITE)
+        username_label = render_text(text_font, "Username:", True, WHITE)
         screen.blit(username_label, (SCREEN_WIDTH // 2 - 150, 270))
         username_input.draw()
 
-        password_label = text_font.render("Password:", True, WHITE)
+        password_label = render_text(text_font, "Password:", True, WHITE)
         screen.blit(password_label, (SCREEN_WIDTH // 2 - 150, 330))
         password_input.draw()
 
@@ -307,7 +298,7 @@ def show_parent_login():
 
         # Draw error message if needed
         if show_error and error_timer > 0:
-            error_text = text_font.render(error_message, True, RED)
+            error_text = render_text(text_font, error_message, True, RED)
             error_rect = error_text.get_rect(center=(SCREEN_WIDTH // 2, 500))
             screen.blit(error_text, error_rect)
             error_timer -= 1
@@ -315,7 +306,7 @@ def show_parent_login():
                 show_error = False
 
         pygame.display.flip()
-        clock.tick(60)
+        frames.tick()
 
     # Stop music and quit if window is closed
     if music_loaded:
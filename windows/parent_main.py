@@ -1,7 +1,12 @@
 import pygame
 import sys
 import os
-import subprocess
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from dirty_rects import DirtyRenderer
 
 # Initialize pygame
 pygame.init()
@@ -28,15 +33,16 @@ GOLD = (255, 215, 0)
 # Screen setup
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("MemoryMath - Parent Dashboard")
-clock = pygame.time.Clock()
+frames = FrameScheduler()
+renderer = DirtyRenderer(screen)
 
 # Fonts
-title_font = pygame.font.SysFont('Arial', 48, bold=True)
-heading_font = pygame.font.SysFont('Arial', 36, bold=True)
-subheading_font = pygame.font.SysFont('Arial', 28, bold=True)
-button_font = pygame.font.SysFont('Arial', 24, bold=True)
-text_font = pygame.font.SysFont('Arial', 24)
-small_font = pygame.font.SysFont('Arial', 18)
+title_font = get_font('Arial', 48, bold=True)
+heading_font = get_font('Arial', 36, bold=True)
+subheading_font = get_font('Arial', 28, bold=True)
+button_font = get_font('Arial', 24, bold=True)
+text_font = get_font('Arial', 24)
+small_font = get_font('Arial', 18)
 
 # Global variables for resources
 background_img = None
@@ -49,20 +55,12 @@ child_name = "Student"
 child_level = "Level 1"
 child_scores = {}
 
-try:
-    if os.path.exists("current_parent.txt"):
-        with open("current_parent.txt", "r") as f:
-            parent_username = f.read().strip()
-
-    if os.path.exists("current_child.txt"):
-        with open("current_child.txt", "r") as f:
-            lines = f.readlines()
-            if len(lines) >= 1:
-                child_name = lines[0].strip()
-            if len(lines) >= 2:
-                child_level = lines[1].strip()
-except Exception as e:
-    print(f"Error loading parent/child data: {e}")
+session = get_session()
+if session.parent:
+    parent_username = session.parent
+if session.child:
+    child_name = session.child.get("name", child_name)
+    child_level = session.child.get("level", child_level)
 
 # Load child scores - in a real app, this would be retrieved from a database
 # For now, we'll use hardcoded data based on the parent account
@@ -155,7 +153,7 @@ class Button:
 
         pygame.draw.rect(screen, BLACK, self.rect, width=2, border_radius=self.border_radius)
 
-        text_surf = button_font.render(self.text, True, self.text_color)
+        text_surf = render_text(button_font, self.text, True, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -180,6 +178,7 @@ def show_parent_dashboard():
     running = True
     while running:
         for event in pygame.event.get():
+            renderer.handle_event(event)
             if event.type == pygame.QUIT:
                 running = False
 
@@ -192,8 +191,8 @@ def show_parent_dashboard():
                         # Return to main login screen
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "login_screen.py"])
+                        get_session().logout()
+                        navigate("login_screen.py")
                         return
 
                     if view_rankings_button.is_clicked(mouse_pos):
@@ -201,8 +200,7 @@ def show_parent_dashboard():
                         # Go to rankings screen
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "view_rankings_parent.py"])
+                        navigate("view_rankings_parent.py")
                         return
 
                     if info_button.is_clicked(mouse_pos):
@@ -213,26 +211,28 @@ def show_parent_dashboard():
             if event.type == pygame.KEYDOWN and show_info_popup:
                 show_info_popup = False
 
+        # Report what can change so that only those regions are repainted
+        for button in (logout_button, view_rankings_button):
+            renderer.track_hover(button.rect)
+        renderer.track_hover((SCREEN_WIDTH - 70, 180, 40, 40))  # Info button as drawn below
+        renderer.track("info_popup", screen.get_rect(), show_info_popup)
+        if not renderer.begin_frame():
+            frames.tick()
+            continue
+
         # Draw the background
         if background_img:
             screen.blit(background_img, (0, 0))
         else:
             # Gradient background as fallback
-            for y in range(SCREEN_HEIGHT):
-                # Create a gradient from dark blue to light blue
-                color = (
-                    int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-                )
-                pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+            screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Draw logo if available
         if logo_img:
             screen.blit(logo_img, (SCREEN_WIDTH // 2 - logo_img.get_width() // 2, 30))
         else:
             # Draw title text as fallback
-            title_text = title_font.render("Memory Math", True, WHITE)
+            title_text = render_text(title_font, "Memory Math", True, WHITE)
             title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 60))
             screen.blit(title_text, title_rect)
 
@@ -266,13 +266,13 @@ def show_parent_dashboard():
         pygame.draw.rect(screen, BLACK, name_bar_rect, width=2, border_radius=15)
 
         # Draw child name on the left side of the bar
-        child_progress_text = subheading_font.render(f"{child_name}'s Progress", True, WHITE)
+        child_progress_text = render_text(subheading_font, f"{child_name}'s Progress", True, WHITE)
         child_progress_rect = child_progress_text.get_rect(midleft=(name_bar_rect.left + 20, name_bar_rect.centery))
         screen.blit(child_progress_text, child_progress_rect)
 
         # Draw level on the right side of the bar
         level_name = child_level.split(" - ")[0] if " - " in child_level else child_level
-        level_text = text_font.render(level_name, True, WHITE)
+        level_text = render_text(text_font, level_name, True, WHITE)
         level_rect = level_text.get_rect(midright=(name_bar_rect.right - 20, name_bar_rect.centery))
         screen.blit(level_text, level_rect)
 
@@ -307,8 +307,8 @@ def show_parent_dashboard():
                          border_radius=5)
 
         # Draw headers
-        game_header = text_font.render("Game", True, BLACK)
-        score_header = text_font.render("Score", True, BLACK)
+        game_header = render_text(text_font, "Game", True, BLACK)
+        score_header = render_text(text_font, "Score", True, BLACK)
 
         screen.blit(game_header, (info_box.left + 50, header_y + 5))
         screen.blit(score_header, (info_box.right - 120, header_y + 5))
@@ -329,11 +329,11 @@ def show_parent_dashboard():
                 pygame.draw.rect(screen, GRAY, row_rect)
 
             # Game name
-            game_text = small_font.render(game, True, BLACK)
+            game_text = render_text(small_font, game, True, BLACK)
             screen.blit(game_text, (info_box.left + 50, row_y + i * row_height + 8))
 
             # Score
-            score_text = small_font.render(str(score), True, BLACK)
+            score_text = render_text(small_font, str(score), True, BLACK)
             screen.blit(score_text, (info_box.right - 120, row_y + i * row_height + 8))
 
         # Draw total score with nice styling
@@ -346,8 +346,8 @@ def show_parent_dashboard():
         pygame.draw.rect(screen, BLACK, total_rect, width=1, border_radius=5)
 
         # Total text
-        total_label = text_font.render("TOTAL SCORE:", True, WHITE)
-        total_value = text_font.render(str(total_score), True, GOLD)
+        total_label = render_text(text_font, "TOTAL SCORE:", True, WHITE)
+        total_value = render_text(text_font, str(total_score), True, GOLD)
 
         screen.blit(total_label, (info_box.left + 50, total_y + 10))
         screen.blit(total_value, (info_box.right - 120, total_y + 10))
@@ -381,7 +381,7 @@ def show_parent_dashboard():
             pygame.draw.rect(screen, BLACK, popup_rect, width=2, border_radius=15)
 
             # Popup title
-            popup_title = heading_font.render("Game Information", True, BLUE)
+            popup_title = render_text(heading_font, "Game Information", True, BLUE)
             popup_title_rect = popup_title.get_rect(center=(popup_rect.centerx, popup_rect.top + 30))
             screen.blit(popup_title, popup_title_rect)
 
@@ -429,23 +429,23 @@ def show_parent_dashboard():
                     game_bg_rect = pygame.Rect(content_area.left, info_y, content_area.width, 30)
                     pygame.draw.rect(screen, LIGHT_BLUE, game_bg_rect, border_radius=5)
 
-                    game_text = text_font.render(game, True, BLACK)
+                    game_text = render_text(text_font, game, True, BLACK)
                     screen.blit(game_text, (content_area.left + 10, info_y + 5))
                     info_y += 35
 
                     # Game description with label
                     if info_y < content_area.bottom:
-                        desc_label = small_font.render("Description:", True, DARK_BLUE)
+                        desc_label = render_text(small_font, "Description:", True, DARK_BLUE)
                         screen.blit(desc_label, (content_area.left + 10, info_y))
                         info_y += line_spacing + 2
 
-                        desc_text = small_font.render(info["description"], True, BLACK)
+                        desc_text = render_text(small_font, info["description"], True, BLACK)
                         screen.blit(desc_text, (content_area.left + 20, info_y))
                         info_y += line_spacing + 5
 
                     # Educational benefits with label
                     if info_y < content_area.bottom:
-                        benefit_label = small_font.render("How it helps:", True, DARK_BLUE)
+                        benefit_label = render_text(small_font, "How it helps:", True, DARK_BLUE)
                         screen.blit(benefit_label, (content_area.left + 10, info_y))
                         info_y += line_spacing + 2
 
@@ -462,7 +462,7 @@ def show_parent_dashboard():
                             if test_width < max_width:
                                 line = test_line
                             else:
-                                line_text = small_font.render(line, True, BLACK)
+                                line_text = render_text(small_font, line, True, BLACK)
                                 if info_y < content_area.bottom:
                                     screen.blit(line_text, (content_area.left + 20, info_y))
                                     info_y += line_spacing
@@ -470,7 +470,7 @@ def show_parent_dashboard():
 
                         # Render last line
                         if info_y < content_area.bottom:
-                            last_line = small_font.render(line, True, BLACK)
+                            last_line = render_text(small_font, line, True, BLACK)
                             screen.blit(last_line, (content_area.left + 20, info_y))
 
                     info_y += line_spacing + 15  # Space between games
@@ -481,12 +481,12 @@ def show_parent_dashboard():
                     info_y += 35 + line_spacing * 5 + 15
 
             # Draw close instruction
-            close_text = small_font.render("Press any key to close this window", True, DARK_GRAY)
+            close_text = render_text(small_font, "Press any key to close this window", True, DARK_GRAY)
             close_rect = close_text.get_rect(center=(popup_rect.centerx, popup_rect.bottom - 20))
             screen.blit(close_text, close_rect)
 
-        pygame.display.flip()
-        clock.tick(60)
+        renderer.present()
+        frames.tick()
 
     # Stop music and quit if window is closed
     if music_loaded:
@@ -0,0 +1,664 @@
+import os
+import sys
+import time
+import heapq
+import bisect
+import sqlite3
+import calendar
+import argparse
+from collections import deque
+from datetime import datetime, timedelta
+
+from data_manager import DataManager, ALL_LEVELS, SECONDS_PER_DAY, TIMESTAMP_FORMAT, get_data_manager
+
+# Mode of the rankings over every game: each player's best result in any game
+ALL_GAMES = None
+
+# Seconds between checks for new sessions while the rankings are being read
+RANKINGS_REFRESH_INTERVAL = 1.0
+
+# Entries per page returned by RankingsEngine.get_page()
+RANKINGS_PAGE_SIZE = 10
+
+# Players listed on each side of a player by RankingsEngine.get_standing()
+RANKINGS_NEIGHBOURS = 1
+
+# Windows of the rolling leaderboards, in seconds: the past day, week and school term
+ROLLING_WINDOWS = {"day": SECONDS_PER_DAY, "week": 7 * SECONDS_PER_DAY, "term": 13 * 7 * SECONDS_PER_DAY}
+
+# Past versions of its top rows a RollingLeaderboard keeps to compute changes from
+ROLLING_HISTORY = 32
+
+# Sessions read at a time when a RollingLeaderboard reads its window
+ROLLING_LOAD_CHUNK_SIZE = 5000
+
+# Columns of the new sessions folded into the rankings by refresh()
+_NEW_SESSION_COLUMNS = "id, player_name, mode, level, score, duration, played_at"
+
+
+def _wall_clock():
+    # Now as stored in sessions.played_at: local wall-clock time read as UTC epoch seconds
+    return calendar.timegm(datetime.now().timetuple())
+
+
+def _sort_key(score, duration, played_at, player_name):
+    # Best score first, then shortest time; sessions without a time go after those with one
+    return (-score, duration if duration is not None else float("inf"), played_at, player_name)
+
+
+class _Ranking:
+    """
+    One ranking: the best result of every player, kept sorted.
+
+    `order` holds the sort key of every player's entry, so a page is a slice of it and
+    a rank is a bisection. New results are inserted in place instead of sorting again.
+
+    Attributes:
+    - entries: dict of player name -> (sort key, duration, session id, mode)
+    - order: sorted list of the sort keys in `entries`
+    - by_score: bool, only replace a player's entry by a higher score or the same score
+      in less time (per game, as the leaderboard table does); otherwise by any better
+      sort key (over all games)
+    """
+
+    def __init__(self, by_score):
+        self.entries = {}
+        self.order = []
+        self.by_score = by_score
+
+    def load(self, entries):
+        """
+        Replace the ranking with `entries` ({player name: (sort key, duration, session id, mode)}).
+        """
+        self.entries = entries
+        self.order = sorted(entry[0] for entry in entries.values())
+
+    def offer(self, key, duration, session_id, mode):
+        """
+        Put a result on the ranking if it improves its player's entry.
+
+        Returns:
+        - bool, True if the ranking changed
+        """
+        current = self.entries.get(key[3])
+        if current is not None and ((key[:2] >= current[0][:2]) if self.by_score else (key >= current[0])):
+            return False
+        self.put(key, duration, session_id, mode)
+        return True
+
+    def put(self, key, duration, session_id, mode):
+        """
+        Make a result its player's entry, better or not.
+        """
+        self.remove(key[3])
+        bisect.insort(self.order, key)
+        self.entries[key[3]] = (key, duration, session_id, mode)
+
+    def remove(self, player_name):
+        """
+        Take a player off the ranking, if they are on it.
+        """
+        current = self.entries.pop(player_name, None)
+        if current is not None:
+            del self.order[bisect.bisect_left(self.order, current[0])]
+
+    def rank(self, key):
+        # Players with the same score and time share a rank
+        return bisect.bisect_left(self.order, key[:2]) + 1
+
+    def worse(self, key):
+        # Players with a lower score, or the same score and a longer time
+        return len(self.order) - bisect.bisect_left(self.order, key[:2] + (float("inf"),))
+
+    def entry(self, key):
+        player_name = key[3]
+        key, duration, session_id, mode = self.entries[player_name]
+        return {
+            "rank": self.rank(key),
+            "player_name": player_name,
+            "score": -key[0],
+            "time": duration,
+            "mode": mode,
+            "session_id": session_id,
+            "timestamp": time.strftime(TIMESTAMP_FORMAT, time.gmtime(key[2])),
+        }
+
+
+class RankingsEngine:
+    """
+    RankingsEngine ranks players by their best result, score first and time (session
+    duration) as the tiebreaker, per game level and per game mode.
+
+    Every ranking is an order-statistic structure: the sort keys of its players in a
+    sorted list, so a player's rank, percentile and neighbours are a bisection away,
+    and a page is a slice. New results are inserted in place instead of sorting again.
+
+    The rankings of a level are loaded from the leaderboard table the first time they
+    are read, so opening them costs one query over the players' best sessions rather
+    than over every session; the leaderboard table is what persists them across
+    restarts. After that they are kept up to date incrementally: reads fold in the
+    sessions committed since the last check (those with a larger id) at most once every
+    `refresh_interval` seconds, moving only the players whose best result improved.
+    Refreshes never wait for the DataManager's write-behind queue, so they are safe on
+    the UI thread; queued sessions are folded in by a later refresh once committed.
+
+    A player's result in a game is their fastest session with their best score in it
+    (the first of those on a tie), as on the leaderboards; over all games it is the
+    best of those. Sessions deleted or edited after being ranked are only noticed by
+    reload() or rebuild().
+
+    Attributes:
+    - data_manager: DataManager the rankings are read from
+    - refresh_interval: float, seconds between checks for new sessions
+    - last_session_id: int or None, id of the newest session folded in
+    - sessions_folded: int, sessions folded in by refresh() so far
+    """
+
+    def __init__(self, data_manager, refresh_interval=RANKINGS_REFRESH_INTERVAL):
+        """
+        Parameters:
+        - data_manager: DataManager to read sessions from
+        - refresh_interval: float, seconds between checks for new sessions
+        """
+        self.data_manager = data_manager
+        self.refresh_interval = refresh_interval
+        self.last_session_id = None
+        self.sessions_folded = 0
+        self._last_refresh = 0.0
+        self._levels = set()
+        self._rankings = {}
+
+    def _ranking(self, mode, level):
+        ranking = self._rankings.get((mode, level))
+        if ranking is None:
+            ranking = self._rankings[(mode, level)] = _Ranking(by_score=mode is not ALL_GAMES)
+        return ranking
+
+    def _get(self, level, mode):
+        self.refresh()
+        if level not in self._levels:
+            self._load(level)
+        return self._ranking(mode or ALL_GAMES, level)
+
+    def _load(self, level):
+        """
+        Load every ranking of a level from the players' best sessions.
+        """
+        if self.last_session_id is None:
+            # Read first: sessions committed during the load are folded in again by the
+            # next refresh, which leaves entries they are already part of unchanged
+            self.last_session_id = self.data_manager.get_last_session_id()
+            self._last_refresh = time.monotonic()
+        self._build(level, self.data_manager.get_best_sessions(level))
+
+    def _build(self, level, rows):
+        """
+        Build every ranking of a level from (player_name, mode, best_score, duration,
+        session_id, played_at) rows, as returned by DataManager.get_best_sessions().
+        """
+        per_mode = {}
+        overall = {}
+        for player_name, mode, best_score, duration, session_id, played_at in rows:
+            key = _sort_key(best_score, duration, played_at, player_name)
+            entry = (key, duration, session_id, mode)
+            per_mode.setdefault(mode, {})[player_name] = entry
+            best = overall.get(player_name)
+            if best is None or key < best[0]:
+                overall[player_name] = entry
+        for mode, entries in per_mode.items():
+            self._ranking(mode, level).load(entries)
+        self._ranking(ALL_GAMES, level).load(overall)
+        self._levels.add(level)
+
+    def _fold(self, session):
+        """
+        Put one new session (_NEW_SESSION_COLUMNS) on the loaded rankings it improves.
+        """
+        session_id, player_name, mode, level, score, duration, played_at = session
+        key = _sort_key(score, duration, played_at, player_name)
+        for ranking_level in (level, ALL_LEVELS):
+            if ranking_level in self._levels and \
+                    self._ranking(mode, ranking_level).offer(key, duration, session_id, mode):
+                self._ranking(ALL_GAMES, ranking_level).offer(key, duration, session_id, mode)
+
+    def refresh(self, force=False):
+        """
+        Fold the sessions committed since the last refresh into the loaded rankings.
+
+        Parameters:
+        - force: bool, check now even if the last check was less than refresh_interval ago
+
+        Returns:
+        - int, number of new sessions read
+        """
+        now = time.monotonic()
+        if self.last_session_id is None or (not force and now - self._last_refresh < self.refresh_interval):
+            return 0
+        self._last_refresh = now
+        folded = 0
+        try:
+            for chunk in self.data_manager.iter_session_chunks(columns=_NEW_SESSION_COLUMNS,
+                                                               after_id=self.last_session_id, flush=False):
+                for session in chunk:
+                    self._fold(session)
+                self.last_session_id = chunk[-1][0]
+                folded += len(chunk)
+        except sqlite3.Error:
+            pass  # Already reported by the DataManager; the next refresh continues from here
+        self.sessions_folded += folded
+        return folded
+
+    def reload(self):
+        """
+        Forget every loaded ranking, so they are read again from the leaderboards.
+        """
+        self.last_session_id = None
+        self._levels.clear()
+        self._rankings.clear()
+
+    def rebuild(self):
+        """
+        Regenerate the leaderboards from the sessions table and reload the rankings from
+        them, e.g. after sessions were deleted or edited.
+        """
+        self.data_manager.rebuild_leaderboards()
+        self.reload()
+
+    def count(self, level=ALL_LEVELS, mode=ALL_GAMES):
+        """
+        Return the number of ranked players of a level and game mode.
+        """
+        return len(self._get(level, mode).order)
+
+    def get_page(self, level=ALL_LEVELS, mode=ALL_GAMES, offset=0, limit=RANKINGS_PAGE_SIZE):
+        """
+        Return a slice of a ranking, best player first.
+
+        Parameters:
+        - level: int, game level, or ALL_LEVELS for each player's best over all levels
+        - mode: str, game mode, or ALL_GAMES for each player's best over all games
+        - offset: int, number of players to skip
+        - limit: int, number of players
+
+        Returns:
+        - List of dicts with rank, player_name, score, time (seconds, or None if not
+          recorded), mode, session_id and timestamp
+        """
+        ranking = self._get(level, mode)
+        return [ranking.entry(key) for key in ranking.order[max(0, offset):max(0, offset) + limit]]
+
+    def get_player_entry(self, player_name, level=ALL_LEVELS, mode=ALL_GAMES):
+        """
+        Return a player's own entry of a ranking (see get_page), or None if the player
+        has not played that level and game mode.
+        """
+        ranking = self._get(level, mode)
+        entry = ranking.entries.get(player_name)
+        return ranking.entry(entry[0]) if entry is not None else None
+
+    def get_player_offset(self, player_name, level=ALL_LEVELS, mode=ALL_GAMES):
+        """
+        Return the position of a player in a ranking (0 for the first entry), e.g. to
+        open the page holding the player, or None if the player is not ranked.
+        """
+        ranking = self._get(level, mode)
+        entry = ranking.entries.get(player_name)
+        return bisect.bisect_left(ranking.order, entry[0]) if entry is not None else None
+
+    def get_standing(self, player_name, level=ALL_LEVELS, mode=ALL_GAMES, neighbours=RANKINGS_NEIGHBOURS):
+        """
+        Return where a player stands in a ranking: "#rank of total".
+
+        Parameters:
+        - player_name: str, name of the player
+        - level: int, game level, or ALL_LEVELS
+        - mode: str, game mode, or ALL_GAMES
+        - neighbours: int, players to list on each side
+
+        Returns:
+        - The player's entry (see get_page) with total (ranked players), percentile
+          (share of them with a worse result, 0-100), above and below (the nearest
+          entries on each side, best first), or None if the player is not ranked
+        """
+        ranking = self._get(level, mode)
+        entry = ranking.entries.get(player_name)
+        if entry is None:
+            return None
+        key = entry[0]
+        position = bisect.bisect_left(ranking.order, key)
+        standing = ranking.entry(key)
+        standing["total"] = len(ranking.order)
+        standing["percentile"] = 100.0 * ranking.worse(key) / len(ranking.order)
+        standing["above"] = [ranking.entry(other) for other in ranking.order[max(0, position - neighbours):position]]
+        standing["below"] = [ranking.entry(other) for other in ranking.order[position + 1:position + 1 + neighbours]]
+        return standing
+
+
+class RollingLeaderboard:
+    """
+    RollingLeaderboard ranks players by their best result over a rolling time window
+    (e.g. the past day or week), score first and time as the tiebreaker, for one game
+    mode and level.
+
+    The sessions of the window are read once; after that, reads fold in the sessions
+    committed since (those with a larger id) at most once every `refresh_interval`
+    seconds. Sessions leaving the window are expired lazily, when the board is read:
+    for every player it keeps only the sessions that can still become their best
+    before they leave the window (each better than all of that player's later ones),
+    oldest first, so the next best takes over without querying the database.
+
+    Every refresh that changes the top `limit` rows starts a new version, and
+    get_changes() returns only the rows that differ from an earlier version, so a
+    screen can update just the rows that moved.
+
+    Attributes:
+    - data_manager: DataManager the sessions are read from
+    - window: int, length of the window in seconds (see ROLLING_WINDOWS)
+    - mode: str, game mode, or ALL_GAMES
+    - level: int, game level, or ALL_LEVELS
+    - limit: int, rows of the board tracked by versions
+    - refresh_interval: float, seconds between checks for new sessions
+    - version: int, version of the top rows (0 while there are none)
+    - last_session_id: int or None, id of the newest session read
+    """
+
+    def __init__(self, data_manager, window, mode=ALL_GAMES, level=ALL_LEVELS, limit=RANKINGS_PAGE_SIZE,
+                 refresh_interval=RANKINGS_REFRESH_INTERVAL):
+        """
+        Parameters:
+        - data_manager: DataManager to read sessions from
+        - window: int, length of the window in seconds
+        - mode: str, game mode, or ALL_GAMES for each player's best over all games
+        - level: int, game level, or ALL_LEVELS for each player's best over all levels
+        - limit: int, rows of the board returned by get_top() and get_changes()
+        - refresh_interval: float, seconds between checks for new sessions
+        """
+        self.data_manager = data_manager
+        self.window = window
+        self.mode = mode or ALL_GAMES
+        self.level = level
+        self.limit = limit
+        self.refresh_interval = refresh_interval
+        self.version = 0
+        self.last_session_id = None
+        self._last_refresh = 0.0
+        self._ranking = _Ranking(by_score=False)
+        # Per player, the sessions that can still become their best: deque of
+        # (played_at, sort key, duration, session id, mode), oldest and best first
+        self._candidates = {}
+        # Heap of (played_at, player name) of the players' best sessions, oldest first
+        self._expiry = []
+        self._top = ()
+        self._history = deque(maxlen=ROLLING_HISTORY)
+
+    def _load(self, start):
+        self.last_session_id = self.data_manager.get_last_session_id()
+        start_date = datetime(1970, 1, 1) + timedelta(seconds=start)
+        for chunk in self.data_manager.iter_session_chunks(mode=self.mode, start_date=start_date,
+                                                           chunk_size=ROLLING_LOAD_CHUNK_SIZE,
+                                                           columns=_NEW_SESSION_COLUMNS, flush=False):
+            for session in chunk:
+                self._add(session, start)
+            self.last_session_id = max(self.last_session_id, chunk[-1][0])
+
+    def _add(self, session, start):
+        """
+        Put a session (_NEW_SESSION_COLUMNS) among its player's candidates.
+        """
+        session_id, player_name, mode, level, score, duration, played_at = session
+        if played_at < start or (self.mode is not ALL_GAMES and mode != self.mode) or \
+                (self.level != ALL_LEVELS and level != self.level):
+            return
+        candidate = (played_at, _sort_key(score, duration, played_at, player_name), duration, session_id, mode)
+        candidates = self._candidates.setdefault(player_name, deque())
+        if candidates and played_at < candidates[-1][0]:
+            # Saved out of time order (e.g. imported): sort it in, then drop what it outdoes
+            merged = sorted(list(candidates) + [candidate])
+            candidates.clear()
+            for other in merged:
+                self._append(candidates, other)
+        else:
+            self._append(candidates, candidate)
+        best = candidates[0]
+        current = self._ranking.entries.get(player_name)
+        if current is None or current[0] != best[1]:
+            self._ranking.put(*best[1:])
+            heapq.heappush(self._expiry, (best[0], player_name))
+
+    @staticmethod
+    def _append(candidates, candidate):
+        # Earlier sessions that are not better than this one can no longer be the best
+        while candidates and candidates[-1][1] > candidate[1]:
+            candidates.pop()
+        candidates.append(candidate)
+
+    def _expire(self, start):
+        """
+        Drop the sessions played before `start`, promoting each player's next best.
+        """
+        while self._expiry and self._expiry[0][0] < start:
+            played_at, player_name = heapq.heappop(self._expiry)
+            candidates = self._candidates.get(player_name)
+            if not candidates or candidates[0][0] >= start:
+                continue  # The player's best has changed since this entry was pushed
+            while candidates and candidates[0][0] < start:
+                candidates.popleft()
+            if candidates:
+                best = candidates[0]
+                self._ranking.put(*best[1:])
+                heapq.heappush(self._expiry, (best[0], player_name))
+            else:
+                del self._candidates[player_name]
+                self._ranking.remove(player_name)
+
+    def refresh(self, force=False):
+        """
+        Fold in the sessions committed since the last refresh and expire those that left
+        the window.
+
+        Parameters:
+        - force: bool, check now even if the last check was less than refresh_interval ago
+
+        Returns:
+        - bool, True if the top rows changed (and a new version started)
+        """
+        now = time.monotonic()
+        if self.last_session_id is not None and not force and now - self._last_refresh < self.refresh_interval:
+            return False
+        self._last_refresh = now
+        start = _wall_clock() - self.window
+        try:
+            if self.last_session_id is None:
+                self._load(start)
+            else:
+                for chunk in self.data_manager.iter_session_chunks(columns=_NEW_SESSION_COLUMNS,
+                                                                   after_id=self.last_session_id,
+                                                                   flush=False):
+                    for session in chunk:
+                        self._add(session, start)
+                    self.last_session_id = chunk[-1][0]
+        except sqlite3.Error:
+            pass  # Already reported by the DataManager; the next refresh continues from here
+        self._expire(start)
+
+        ranking = self._ranking
+        top = tuple((ranking.rank(key),) + ranking.entries[key[3]] for key in ranking.order[:self.limit])
+        if top == self._top:
+            return False
+        self.version += 1
+        self._top = top
+        self._history.append((self.version, top))
+        return True
+
+    @staticmethod
+    def _row_entry(row):
+        rank, key, duration, session_id, mode = row
+        return {
+            "rank": rank,
+            "player_name": key[3],
+            "score": -key[0],
+            "time": duration,
+            "mode": mode,
+            "session_id": session_id,
+            "timestamp": time.strftime(TIMESTAMP_FORMAT, time.gmtime(key[2])),
+        }
+
+    def get_top(self):
+        """
+        Return the top `limit` rows of the board (see RankingsEngine.get_page).
+        """
+        self.refresh()
+        return [self._row_entry(row) for row in self._top]
+
+    def get_changes(self, since_version=0):
+        """
+        Return the rows of the board that changed since an earlier version.
+
+        Parameters:
+        - since_version: int, version the caller's rows are from (0: no rows yet)
+
+        Returns:
+        - (version, changes): the current version and a dict of row position -> entry
+          (see RankingsEngine.get_page), or None where the board has no row any more.
+          Every row is returned if `since_version` is too old to compare with.
+        """
+        self.refresh()
+        if since_version == self.version:
+            return self.version, {}
+        previous = () if since_version == 0 else None
+        for version, top in self._history:
+            if version == since_version:
+                previous = top
+        if previous is None:
+            positions = range(self.limit)
+            previous = (None,) * self.limit
+        else:
+            positions = range(max(len(previous), len(self._top)))
+        changes = {}
+        for position in positions:
+            before = previous[position] if position < len(previous) else None
+            after = self._top[position] if position < len(self._top) else None
+            if before != after:
+                changes[position] = self._row_entry(after) if after is not None else None
+        return self.version, changes
+
+    def count(self):
+        """
+        Return the number of players on the board.
+        """
+        self.refresh()
+        return len(self._ranking.order)
+
+    def get_page(self, offset=0, limit=RANKINGS_PAGE_SIZE):
+        """
+        Return a slice of the whole board, beyond the top rows too (see RankingsEngine.get_page).
+        """
+        self.refresh()
+        ranking = self._ranking
+        return [ranking.entry(key) for key in ranking.order[max(0, offset):max(0, offset) + limit]]
+
+
+# Shared RankingsEngines, one per database file, and RollingLeaderboards, one per
+# database file, window, game mode, level and size
+_shared_engines = {}
+_shared_boards = {}
+
+
+def get_rankings_engine(db_name="game_data.db"):
+    """
+    Return the process-wide RankingsEngine of a database file.
+
+    Screens should use this rather than creating their own engine, so rankings loaded by
+    one screen are only refreshed, not loaded again, when another one opens.
+    """
+    path = os.path.abspath(db_name)
+    engine = _shared_engines.get(path)
+    if engine is None:
+        engine = RankingsEngine(get_data_manager(path))
+        _shared_engines[path] = engine
+    return engine
+
+
+def get_rolling_leaderboard(window, mode=ALL_GAMES, level=ALL_LEVELS, limit=RANKINGS_PAGE_SIZE,
+                            db_name="game_data.db"):
+    """
+    Return the process-wide RollingLeaderboard of a window (a ROLLING_WINDOWS name or a
+    number of seconds), game mode, level and size.
+    """
+    path = os.path.abspath(db_name)
+    seconds = ROLLING_WINDOWS.get(window, window)
+    key = (path, seconds, mode or ALL_GAMES, level, limit)
+    board = _shared_boards.get(key)
+    if board is None:
+        board = RollingLeaderboard(get_data_manager(path), seconds, mode, level, limit)
+        _shared_boards[key] = board
+    return board
+
+
+def format_time(seconds):
+    """
+    Format a ranking time as m:ss ("-" if it was not recorded).
+    """
+    if seconds is None:
+        return "-"
+    seconds = int(round(seconds))
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def main():
+    """
+    Print a ranking and how long it took to load, or rebuild the rankings.
+
+    Usage: python rankings_engine.py [database] [--level N] [--game MODE] [--page N] [--player NAME]
+           python rankings_engine.py [database] --window day|week|term [--level N] [--game MODE] [--page N]
+           python rankings_engine.py [database] --rebuild
+    """
+    parser = argparse.ArgumentParser(description="Show SkillScape rankings")
+    parser.add_argument("database", nargs="?", default="game_data.db")
+    parser.add_argument("--level", type=int, default=ALL_LEVELS, help="game level (default: all levels)")
+    parser.add_argument("--game", help="game mode (default: all games)")
+    parser.add_argument("--page", type=int, default=1)
+    parser.add_argument("--player", help="also show where this player stands")
+    parser.add_argument("--window", choices=sorted(ROLLING_WINDOWS), help="only rank the sessions of this period")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="regenerate the leaderboards from the sessions")
+    args = parser.parse_args()
+
+    dm = DataManager(args.database, cache_size=0, use_daemon=False)
+    engine = RankingsEngine(dm)
+    start = time.perf_counter()
+    if args.rebuild:
+        engine.rebuild()
+        print(f"[RankingsEngine] Rebuilt the rankings in {time.perf_counter() - start:.2f}s")
+        dm.close()
+        return 0
+    if args.window:
+        board = RollingLeaderboard(dm, ROLLING_WINDOWS[args.window], args.game, args.level)
+        page = board.get_page((args.page - 1) * RANKINGS_PAGE_SIZE)
+        elapsed = time.perf_counter() - start
+        for entry in page:
+            print(f"{entry['rank']:>5}. {entry['player_name']:<24} {entry['score']:>6}  {format_time(entry['time']):>6}")
+        print(f"[RollingLeaderboard] {board.count()} players ranked over the past {args.window}, "
+              f"loaded in {elapsed * 1000:.1f} ms")
+        dm.close()
+        return 0
+    page = engine.get_page(args.level, args.game, (args.page - 1) * RANKINGS_PAGE_SIZE)
+    elapsed = time.perf_counter() - start
+    for entry in page:
+        print(f"{entry['rank']:>5}. {entry['player_name']:<24} {entry['score']:>6}  {format_time(entry['time']):>6}")
+    if args.player:
+        standing = engine.get_standing(args.player, args.level, args.game)
+        if standing is None:
+            print(f"{args.player}: not ranked")
+        else:
+            print(f"{args.player}: #{standing['rank']} of {standing['total']} "
+                  f"(ahead of {standing['percentile']:.0f}%), score {standing['score']}, "
+                  f"time {format_time(standing['time'])}")
+    print(f"[RankingsEngine] {engine.count(args.level, args.game)} players ranked, "
+          f"loaded in {elapsed * 1000:.1f} ms")
+    dm.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
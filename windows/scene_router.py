@@ -0,0 +1,246 @@
+import os
+import sys
+import time
+import subprocess
+
+import pygame
+
+from session_context import SessionContext, get_session, set_session
+
+# Directory holding every screen script and its assets
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# First screen shown when the suite is started through the router
+START_SCENE = "login_screen.py"
+
+
+class SceneChange(Exception):
+    """
+    Raised by navigate() to unwind the current scene when running under the router.
+
+    The router catches it and starts the requested scene on the same display and mixer,
+    so the old screen's loops are left without spawning a new interpreter.
+    """
+
+    def __init__(self, script, args=()):
+        super().__init__(script)
+        self.script = script
+        self.args = [str(arg) for arg in args]
+
+
+class SceneRouter:
+    """
+    SceneRouter runs every screen of the suite inside one long-lived process.
+
+    Each screen script is executed as "__main__" in a fresh namespace, exactly as if it
+    had been started with `python <script>`, but pygame, the display and the mixer are
+    initialised once and shared by all of them. Navigation between screens goes through
+    navigate(), which the router turns into a SceneChange instead of a process spawn.
+
+    The SessionContext of the run is kept in memory and handed to every scene as the
+    global `session`; it is only written to disk when snapshots are enabled.
+
+    Attributes:
+    - history: list of (script, args) tuples, the stack of scenes visited so far
+    - current: (script, args) of the scene that is currently running, or None
+    - session: SessionContext shared by all scenes
+    """
+
+    def __init__(self, base_dir=BASE_DIR, snapshot=False, resume=False):
+        """
+        Parameters:
+        - base_dir: str, directory containing the screen scripts and their assets.
+        - snapshot: bool, save the session to its snapshot file on every scene change
+        - resume: bool, start from the last session snapshot instead of a fresh session
+        """
+        self.base_dir = base_dir
+        self.snapshot = snapshot
+        self.session = SessionContext.load_snapshot() if resume else SessionContext()
+        self.history = []
+        self.current = None
+        self._code_cache = {}
+
+    def resolve(self, script):
+        """
+        Return the absolute path of a screen script.
+
+        Script names are matched case-insensitively as a fallback, because some screens
+        were written on case-insensitive filesystems (e.g. "MemoryMath_instructions.py").
+        """
+        path = os.path.join(self.base_dir, script)
+        if os.path.exists(path):
+            return path
+        lowered = script.lower()
+        for name in os.listdir(self.base_dir):
+            if name.lower() == lowered:
+                return os.path.join(self.base_dir, name)
+        raise FileNotFoundError(f"[SceneRouter] No such screen: {script}")
+
+    def load(self, path):
+        """
+        Return the compiled code object for a screen, compiling it only on first use.
+        """
+        code = self._code_cache.get(path)
+        if code is None:
+            with open(path, "r", encoding="utf-8") as f:
+                code = compile(f.read(), path, "exec")
+            self._code_cache[path] = code
+        return code
+
+    def run_scene(self, script, args=()):
+        """
+        Execute a single screen script as "__main__" with the given argv.
+
+        Returns:
+        - (script, args) of the next scene if the screen navigated away, otherwise None.
+        """
+        path = self.resolve(script)
+        code = self.load(path)
+        self.current = (script, list(args))
+        self.history.append(self.current)
+        self.session.record_visit(script, args)
+        if self.snapshot:
+            self.session.save_snapshot()
+
+        namespace = {
+            "__name__": "__main__",
+            "__file__": path,
+            "__builtins__": __builtins__,
+            "session": self.session,
+        }
+        saved_argv = sys.argv
+        sys.argv = [path] + list(args)
+        try:
+            exec(code, namespace)
+        except SceneChange as change:
+            return change.script, change.args
+        except SystemExit:
+            return None
+        finally:
+            sys.argv = saved_argv
+            self.current = None
+        return None
+
+    def start(self):
+        """
+        Initialise pygame and make this the active router of the process.
+
+        Called by run(); tools that drive scenes themselves (e.g. the benchmark
+        harness) call start(), then run_scene() as often as they like, then stop().
+        """
+        global _active_router
+
+        os.chdir(self.base_dir)
+        if self.base_dir not in sys.path:
+            sys.path.insert(0, self.base_dir)
+
+        pygame.init()
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"[SceneRouter] Could not initialize mixer: {e}")
+
+        _active_router = self
+        set_session(self.session)
+
+    def stop(self):
+        """
+        Stop being the active router and shut pygame down.
+        """
+        global _active_router
+
+        _active_router = None
+        pygame.quit()
+
+    def run(self, script=START_SCENE, args=()):
+        """
+        Run scenes one after another, starting from `script`, until a scene exits
+        without navigating anywhere else.
+        """
+        self.start()
+        scene = (script, list(args))
+        try:
+            while scene is not None:
+                start = time.perf_counter()
+                next_scene = self.run_scene(*scene)
+                if next_scene is not None:
+                    print(f"[SceneRouter] {scene[0]} -> {next_scene[0]} "
+                          f"(scene ran {time.perf_counter() - start:.1f}s)")
+                scene = next_scene
+        finally:
+            self.stop()
+
+
+# Router driving the current process, if the suite was started through it
+_active_router = None
+
+
+def get_router():
+    """
+    Return the active SceneRouter, or None when a screen was started on its own.
+    """
+    return _active_router
+
+
+def navigate(script, *args):
+    """
+    Leave the current screen and open another one.
+
+    Under the router this raises SceneChange, which unwinds the current screen and
+    starts `script` on the shared display. When the screen was started directly with
+    `python <script>` it falls back to the old behaviour: quit pygame and run the next
+    screen as a child process, handing the session over through its snapshot file.
+
+    Parameters:
+    - script: str, file name of the screen to open (e.g. "main_screen.py")
+    - args: values passed to the next screen as command line arguments
+    """
+    if _active_router is not None:
+        raise SceneChange(script, args)
+
+    get_session().save_snapshot()
+    pygame.quit()
+    subprocess.run([sys.executable, script] + [str(arg) for arg in args])
+
+
+def main():
+    """
+    Start the whole suite in a single process.
+
+    Usage: python scene_router.py [--snapshot] [--resume] [--record FILE] [start_screen.py] [args...]
+
+    --record writes the session's input and random seed to FILE, so it can be replayed
+    with input_replay.py.
+    """
+    argv = sys.argv[1:]
+    record_path = None
+    if "--record" in argv:
+        index = argv.index("--record")
+        record_path = argv[index + 1] if index + 1 < len(argv) else "session.jsonl.gz"
+        del argv[index:index + 2]
+
+    flags = [arg for arg in argv if arg in ("--snapshot", "--resume")]
+    rest = [arg for arg in argv if arg not in flags]
+    start_script = rest[0] if rest else START_SCENE
+
+    router = SceneRouter(snapshot="--snapshot" in flags, resume="--resume" in flags)
+    if record_path is None:
+        router.run(start_script, rest[1:])
+        return
+
+    from input_replay import SessionRecorder
+    recorder = SessionRecorder(record_path)
+    recorder.start(router, start_script, rest[1:])
+    try:
+        router.run(start_script, rest[1:])
+    finally:
+        recorder.stop()
+
+
+# Start the program if this file is run directly
+if __name__ == "__main__":
+    # Go through the importable module so that screens doing
+    # `from scene_router import navigate` see the same active router
+    import scene_router
+
+    scene_router.main()
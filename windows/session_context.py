@@ -0,0 +1,222 @@
+import os
+import json
+
+# Single file used to snapshot the session for crash recovery and for handing
+# the session to a screen that was started as a separate process
+SNAPSHOT_FILE = "session_snapshot.json"
+
+# Game modes in the order they are played, as used by the final summary and DataManager
+GAME_MODES = [
+    "Memory Math",
+    "Word Builder",
+    "English Pro",
+    "Football Quiz",
+    "Car Parking Puzzle",
+]
+
+
+class SessionContext:
+    """
+    SessionContext holds everything the screens share during one run of the suite.
+
+    It replaces the current_*.txt files and the command line arguments that used to
+    carry state from one screen to the next. Under the scene router a single instance
+    lives in memory for the whole run; screens started on their own restore it from
+    SNAPSHOT_FILE.
+
+    Attributes:
+    - role: str or None, "student", "teacher" or "parent"
+    - student: dict or None, logged-in student with "name", "level" and "icon"
+    - teacher: str or None, logged-in teacher username
+    - parent: str or None, logged-in parent username
+    - child: dict or None, the parent's child with "name" and "level"
+    - results: dict, game mode -> game data dict for the games finished in this run
+    - history: list of (script, args) tuples, screens visited in this run
+    """
+
+    def __init__(self):
+        self.role = None
+        self.student = None
+        self.teacher = None
+        self.parent = None
+        self.child = None
+        self.results = {}
+        self.history = []
+
+    # ----- Identity -----
+
+    def login_student(self, student):
+        """
+        Log in a student and start a new run of games.
+
+        Parameters:
+        - student: dict with "name", "level" and "icon"
+        """
+        self.logout()
+        self.role = "student"
+        self.student = {
+            "name": student.get("name", "Guest"),
+            "level": student.get("level", "Level 1 - Beginner"),
+            "icon": student.get("icon"),
+        }
+
+    def login_teacher(self, username):
+        """
+        Log in a teacher.
+
+        Parameters:
+        - username: str, teacher username
+        """
+        self.logout()
+        self.role = "teacher"
+        self.teacher = username
+
+    def login_parent(self, username, child_name, child_level):
+        """
+        Log in a parent together with the child they follow.
+
+        Parameters:
+        - username: str, parent username
+        - child_name: str, name of the child
+        - child_level: str, level of the child (e.g. "Level 2")
+        """
+        self.logout()
+        self.role = "parent"
+        self.parent = username
+        self.child = {"name": child_name, "level": child_level}
+
+    def logout(self):
+        """
+        Forget the logged-in identity and the results of the current run.
+        """
+        self.role = None
+        self.student = None
+        self.teacher = None
+        self.parent = None
+        self.child = None
+        self.results = {}
+
+    @property
+    def player_name(self):
+        """
+        Name under which game sessions are saved ("Guest" if nobody is logged in).
+        """
+        if self.student:
+            return self.student["name"]
+        return "Guest"
+
+    # ----- Game results -----
+
+    def record_result(self, mode, game_data):
+        """
+        Store the result of a finished game for the rest of the run.
+
+        Parameters:
+        - mode: str, game mode name (one of GAME_MODES)
+        - game_data: dict, game statistics as shown on the game's summary screen
+        """
+        self.results[mode] = dict(game_data)
+
+    def get_result(self, mode, default=None):
+        """
+        Return the stored result of a game mode, or `default` if it was not played.
+        """
+        return self.results.get(mode, default)
+
+    # ----- Navigation -----
+
+    def record_visit(self, script, args=()):
+        """
+        Append a screen to the navigation history.
+        """
+        self.history.append((script, [str(arg) for arg in args]))
+
+    # ----- Snapshots -----
+
+    def to_dict(self):
+        """
+        Return the session as a JSON-serialisable dict.
+        """
+        return {
+            "role": self.role,
+            "student": self.student,
+            "teacher": self.teacher,
+            "parent": self.parent,
+            "child": self.child,
+            "results": self.results,
+            "history": [list(entry) for entry in self.history],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a session from a dict produced by to_dict().
+        """
+        session = cls()
+        session.role = data.get("role")
+        session.student = data.get("student")
+        session.teacher = data.get("teacher")
+        session.parent = data.get("parent")
+        session.child = data.get("child")
+        session.results = data.get("results") or {}
+        session.history = [tuple(entry) for entry in data.get("history") or []]
+        return session
+
+    def save_snapshot(self, path=SNAPSHOT_FILE):
+        """
+        Write the session to a single file, atomically replacing any older snapshot.
+
+        Parameters:
+        - path: str, snapshot file path
+        """
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.to_dict(), f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[SessionContext] Error saving snapshot: {e}")
+
+    @classmethod
+    def load_snapshot(cls, path=SNAPSHOT_FILE):
+        """
+        Restore a session from a snapshot file.
+
+        Returns:
+        - SessionContext, empty if the snapshot is missing or unreadable.
+        """
+        try:
+            with open(path, "r") as f:
+                return cls.from_dict(json.load(f))
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError) as e:
+            print(f"[SessionContext] Error loading snapshot: {e}")
+            return cls()
+
+
+# Session shared by every screen running in this process
+_session = None
+
+
+def get_session():
+    """
+    Return the session of the current process.
+
+    The first call restores the last snapshot, so that a screen started as its own
+    process picks up the state left by the screen that launched it.
+    """
+    global _session
+    if _session is None:
+        _session = SessionContext.load_snapshot()
+    return _session
+
+
+def set_session(session):
+    """
+    Install `session` as the session of the current process.
+    """
+    global _session
+    _session = session
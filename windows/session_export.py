@@ -0,0 +1,227 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import threading
+
+from data_manager import DataManager, SESSION_COLUMNS
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+    pyarrow_available = True
+except ImportError:
+    pyarrow = None
+    pyarrow_available = False
+
+# Output formats, chosen from the file extension unless given explicitly
+EXPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".parquet": "parquet"}
+
+# Rows read from the database, and written to the file, at a time
+EXPORT_CHUNK_SIZE = 5000
+
+# Exported columns, in order
+EXPORT_COLUMNS = [name.strip() for name in SESSION_COLUMNS.split(",")]
+
+# Parquet files store the timestamp as a timestamp type, read straight from the epoch seconds
+PARQUET_COLUMNS = SESSION_COLUMNS.replace("timestamp", "played_at")
+
+
+def _parquet_schema():
+    return pyarrow.schema([
+        ("id", pyarrow.int64()),
+        ("player_name", pyarrow.string()),
+        ("score", pyarrow.int64()),
+        ("level", pyarrow.int64()),
+        ("timestamp", pyarrow.timestamp("s")),
+        ("duration", pyarrow.float64()),
+        ("accuracy", pyarrow.float64()),
+        ("mode", pyarrow.string()),
+    ])
+
+
+class SessionExport:
+    """
+    SessionExport writes the sessions matching a set of filters to a CSV, JSON Lines
+    or Parquet file on a background thread.
+
+    Rows are streamed from the database in chunks (DataManager.iter_session_chunks)
+    and written as they arrive, so memory use does not depend on the number of
+    sessions. The file is written under a temporary name and only moved into place
+    once complete, so a failed or cancelled export leaves no partial file behind.
+
+    Attributes:
+    - path: str, output file
+    - format: str, "csv", "jsonl" or "parquet"
+    - total_rows: int or None, sessions to export (known once the export has started)
+    - rows_written: int, sessions written so far
+    - error: Exception or None, why the export failed
+    - finished: bool, True once the export has ended (successfully or not)
+    """
+
+    def __init__(self, path, db_name="game_data.db", format=None, player_name=None, mode=None,
+                 start_date=None, end_date=None, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Parameters:
+        - path: str, output file
+        - db_name: str, path to the SQLite database file
+        - format: str, "csv", "jsonl" or "parquet" (default: from the extension of `path`)
+        - player_name, mode, start_date, end_date: filters, as for DataManager.get_player_history
+        - chunk_size: int, rows read and written at a time
+        """
+        self.path = path
+        self.db_name = db_name
+        self.format = format or EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+        if self.format not in EXPORT_FORMATS.values():
+            raise ValueError(f"unknown export format for {path!r}; use one of {', '.join(EXPORT_FORMATS)}")
+        if self.format == "parquet" and not pyarrow_available:
+            raise ValueError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.filters = {"player_name": player_name, "mode": mode, "start_date": start_date, "end_date": end_date}
+        self.chunk_size = chunk_size
+        self.total_rows = None
+        self.rows_written = 0
+        self.error = None
+        self.finished = False
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Run the export on a background thread and return at once.
+        """
+        self._thread = threading.Thread(target=self.run, name="SessionExport", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """
+        Ask a running export to stop after the current chunk.
+        """
+        self._cancelled.set()
+
+    def wait(self, timeout=None):
+        """
+        Wait for a background export to end.
+
+        Returns:
+        - bool, True if the export has ended
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.finished
+
+    def progress(self):
+        """
+        Return the fraction of sessions exported so far (0.0 to 1.0).
+        """
+        if self.finished and self.error is None:
+            return 1.0
+        if not self.total_rows:
+            return 0.0
+        return min(1.0, self.rows_written / self.total_rows)
+
+    def run(self):
+        """
+        Export on the calling thread.
+
+        Returns:
+        - bool, True if the file was written
+        """
+        temp_path = self.path + ".part"
+        dm = None
+        try:
+            # A connection of its own: the export may run on a different thread than the caller
+            dm = DataManager(self.db_name, cache_size=0, use_daemon=False)
+            self.total_rows = dm.count_sessions(**self.filters)
+            columns = PARQUET_COLUMNS if self.format == "parquet" else SESSION_COLUMNS
+            chunks = dm.iter_session_chunks(chunk_size=self.chunk_size, columns=columns, **self.filters)
+            writer = {"csv": self._write_csv, "jsonl": self._write_jsonl, "parquet": self._write_parquet}
+            writer[self.format](temp_path, chunks)
+            if self._cancelled.is_set():
+                os.remove(temp_path)
+                print(f"[SessionExport] Export to {self.path} cancelled")
+            else:
+                os.replace(temp_path, self.path)
+                print(f"[SessionExport] Exported {self.rows_written} sessions to {self.path}")
+        except Exception as e:
+            self.error = e
+            print(f"[SessionExport] Error exporting to {self.path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        finally:
+            if dm is not None:
+                dm.close()
+            self.finished = True
+        return self.error is None and not self._cancelled.is_set()
+
+    def _chunks(self, chunks):
+        for chunk in chunks:
+            if self._cancelled.is_set():
+                chunks.close()
+                return
+            yield chunk
+            self.rows_written += len(chunk)
+
+    def _write_csv(self, path, chunks):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_COLUMNS)
+            for chunk in self._chunks(chunks):
+                writer.writerows(chunk)
+
+    def _write_jsonl(self, path, chunks):
+        with open(path, "w", encoding="utf-8") as f:
+            for chunk in self._chunks(chunks):
+                f.writelines(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in chunk)
+
+    def _write_parquet(self, path, chunks):
+        schema = _parquet_schema()
+        # One row group per chunk, so only one chunk is ever held in memory
+        with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+            for chunk in self._chunks(chunks):
+                arrays = [pyarrow.array(column, type=field.type) for column, field in zip(zip(*chunk), schema)]
+                writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+
+
+def main():
+    """
+    Export sessions from the command line.
+
+    Usage: python session_export.py FILE.csv|FILE.jsonl|FILE.parquet [--db game_data.db]
+                                    [--player NAME] [--mode MODE] [--start DATE] [--end DATE]
+    """
+    parser = argparse.ArgumentParser(description="Export SkillScape game sessions")
+    parser.add_argument("output")
+    parser.add_argument("--db", default="game_data.db")
+    parser.add_argument("--format", choices=sorted(set(EXPORT_FORMATS.values())))
+    parser.add_argument("--player")
+    parser.add_argument("--mode")
+    parser.add_argument("--start", help="first date (YYYY-MM-DD or full timestamp)")
+    parser.add_argument("--end", help="last date (YYYY-MM-DD or full timestamp)")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    try:
+        export = SessionExport(args.output, args.db, args.format, args.player, args.mode, args.start, args.end,
+                               args.chunk_size)
+    except ValueError as e:
+        print(f"[SessionExport] {e}")
+        return 1
+    start = time.perf_counter()
+    export.start()
+    while not export.wait(0.5):
+        print(f"[SessionExport] {export.progress():.0%} ({export.rows_written} sessions)")
+    if export.error is not None:
+        return 1
+    print(f"[SessionExport] Done in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,14 @@
 import pygame
 import sys
 import os
-import subprocess
 import json
 import random
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from dirty_rects import DirtyRenderer
 
 # Initialize pygame
 pygame.init()
@@ -31,16 +36,17 @@ LIGHT_RED = (255, 150, 150)
 # Screen setup
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("MemoryMath - Student Details")
-clock = pygame.time.Clock()
+frames = FrameScheduler()
+renderer = DirtyRenderer(screen)
 
 # Fonts
-title_font = pygame.font.SysFont('Arial', 48, bold=True)
-heading_font = pygame.font.SysFont('Arial', 36, bold=True)
-subheading_font = pygame.font.SysFont('Arial', 28, bold=True)
-button_font = pygame.font.SysFont('Arial', 24, bold=True)
-text_font = pygame.font.SysFont('Arial', 24)
-small_font = pygame.font.SysFont('Arial', 18)
-table_font = pygame.font.SysFont('Arial', 20)
+title_font = get_font('Arial', 48, bold=True)
+heading_font = get_font('Arial', 36, bold=True)
+subheading_font = get_font('Arial', 28, bold=True)
+button_font = get_font('Arial', 24, bold=True)
+text_font = get_font('Arial', 24)
+small_font = get_font('Arial', 18)
+table_font = get_font('Arial', 20)
 
 # Global variables for resources
 background_img = None
@@ -48,13 +54,7 @@ logo_img = None
 images_loaded = False
 
 # Get teacher username
-teacher_username = "Teacher"
-try:
-    if os.path.exists("current_teacher.txt"):
-        with open("current_teacher.txt", "r") as f:
-            teacher_username = f.read().strip()
-except Exception as e:
-    print(f"Error loading teacher data: {e}")
+teacher_username = get_session().teacher or "Teacher"
 
 # Load images
 try:
@@ -111,7 +111,7 @@ class Button:
 
         pygame.draw.rect(screen, BLACK, self.rect, width=2, border_radius=self.border_radius)
 
-        text_surf = button_font.render(self.text, True, self.text_color)
+        text_surf = render_text(button_font, self.text, True, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -136,7 +136,7 @@ class Dropdown:
         # Draw selected option
         pygame.draw.rect(screen, WHITE, self.rect)
         pygame.draw.rect(screen, BLACK, self.rect, width=2)
-        text_surf = text_font.render(self.options[self.selected_index], True, BLACK)
+        text_surf = render_text(text_font, self.options[self.selected_index], True, BLACK)
         text_rect = text_surf.get_rect(midleft=(self.rect.x + 10, self.rect.centery))
         screen.blit(text_surf, text_rect)
 
@@ -153,7 +153,7 @@ class Dropdown:
             for i, option_rect in enumerate(self.option_rects):
                 pygame.draw.rect(screen, WHITE, option_rect)
                 pygame.draw.rect(screen, BLACK, option_rect, width=1)
-                option_text = text_font.render(self.options[i], True, BLACK)
+                option_text = render_text(text_font, self.options[i], True, BLACK)
                 option_text_rect = option_text.get_rect(midleft=(option_rect.x + 10, option_rect.centery))
                 screen.blit(option_text, option_text_rect)
 
@@ -261,6 +261,7 @@ def show_student_details():
     running = True
     while running:
         for event in pygame.event.get():
+            renderer.handle_event(event)
             if event.type == pygame.QUIT:
                 running = False
 
@@ -276,8 +277,7 @@ def show_student_details():
                         print("Going back to teacher dashboard")
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "teacher_main.py"])
+                        navigate("teacher_main.py")
                         return
 
                     # Check student buttons
@@ -309,31 +309,34 @@ def show_student_details():
                             selected_student["level"] = new_level
                             print(f"Updated {selected_student['name']}'s level to {new_level}")
 
+        # Report what can change so that only those regions are repainted
+        for button in student_buttons + [back_button, update_button]:
+            renderer.track_hover(button.rect)
+        renderer.track("details", screen.get_rect(),
+                       (selected_index, selected_student and selected_student["level"],
+                        level_dropdown.is_open, level_dropdown.selected_index))
+        if not renderer.begin_frame():
+            frames.tick()
+            continue
+
         # Draw the background
         if background_img:
             screen.blit(background_img, (0, 0))
         else:
             # Gradient background as fallback
-            for y in range(SCREEN_HEIGHT):
-                # Create a gradient from dark blue to light blue
-                color = (
-                    int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-                )
-                pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+            screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Draw logo if available
         if logo_img:
             screen.blit(logo_img, (SCREEN_WIDTH // 2 - logo_img.get_width() // 2, 20))
 
         # Draw main heading - centered on screen
-        heading_text = heading_font.render("Student Details", True, WHITE)
+        heading_text = render_text(heading_font, "Student Details", True, WHITE)
         heading_rect = heading_text.get_rect(center=(SCREEN_WIDTH // 2, 120))
         screen.blit(heading_text, heading_rect)
 
         # Draw student list heading - moved down to avoid overlap
-        student_list_text = subheading_font.render("Select a Student:", True, WHITE)
+        student_list_text = render_text(subheading_font, "Select a Student:", True, WHITE)
         screen.blit(student_list_text, (50, 150))
 
         # Draw student details section if a student is selected
@@ -344,7 +347,7 @@ def show_student_details():
             pygame.draw.rect(screen, BLACK, details_box, width=2, border_radius=10)
 
             # Draw student details heading - LEFT ALIGNED
-            details_heading = subheading_font.render(f"{selected_student['name']}'s Details", True, BLACK)
+            details_heading = render_text(subheading_font, f"{selected_student['name']}'s Details", True, BLACK)
             details_heading_rect = details_heading.get_rect(midleft=(details_box.left + 30, details_box.top + 30))
             screen.blit(details_heading, details_heading_rect)
 
@@ -355,7 +358,7 @@ def show_student_details():
 
             # Simplified level text (without "Beginner", etc.)
             level_name = selected_student["level"].split(" - ")[0]  # Get just "Level 1", "Level 2", etc.
-            level_text = small_font.render(level_name, True, WHITE)
+            level_text = render_text(small_font, level_name, True, WHITE)
             level_rect = level_text.get_rect(center=(level_box.centerx, level_box.centery))
             screen.blit(level_text, level_rect)
 
@@ -375,8 +378,8 @@ def show_student_details():
             pygame.draw.rect(screen, BLACK, header_rect, width=1, border_radius=5)
 
             # Header text - using smaller font
-            game_header = small_font.render("Game", True, BLACK)
-            score_header = small_font.render("Score", True, BLACK)
+            game_header = render_text(small_font, "Game", True, BLACK)
+            score_header = render_text(small_font, "Score", True, BLACK)
 
             # Position headers with proper spacing
             screen.blit(game_header, (header_rect.x + 20, header_rect.centery - game_header.get_height() // 2))
@@ -399,8 +402,8 @@ def show_student_details():
                 pygame.draw.rect(screen, BLACK, row_rect, width=1)
 
                 # Game name and score
-                game_text = small_font.render(game, True, BLACK)
-                score_text = small_font.render(str(score), True, BLACK)
+                game_text = render_text(small_font, game, True, BLACK)
+                score_text = render_text(small_font, str(score), True, BLACK)
 
                 # Left-align game name, right-align score
                 screen.blit(game_text, (row_rect.x + 20, row_rect.centery - game_text.get_height() // 2))
@@ -415,8 +418,8 @@ def show_student_details():
             pygame.draw.rect(screen, DARK_BLUE, total_row_rect, border_radius=5)
             pygame.draw.rect(screen, BLACK, total_row_rect, width=1, border_radius=5)
 
-            total_text = small_font.render("TOTAL", True, WHITE)
-            total_score_text = small_font.render(str(total_score), True, WHITE)
+            total_text = render_text(small_font, "TOTAL", True, WHITE)
+            total_score_text = render_text(small_font, str(total_score), True, WHITE)
 
             screen.blit(total_text, (total_row_rect.x + 20, total_row_rect.centery - total_text.get_height() // 2))
             screen.blit(total_score_text,
@@ -452,7 +455,7 @@ def show_student_details():
             update_button.draw()
         else:
             # Draw instruction when no student is selected
-            select_text = text_font.render("← Please select a student to view details", True, WHITE)
+            select_text = render_text(text_font, "← Please select a student to view details", True, WHITE)
             select_rect = select_text.get_rect(center=(SCREEN_WIDTH - 250, 250))
             screen.blit(select_text, select_rect)
 
@@ -463,8 +466,8 @@ def show_student_details():
         # Draw back button
         back_button.draw()
 
-        pygame.display.flip()
-        clock.tick(60)
+        renderer.present()
+        frames.tick()
 
     # Stop music and quit if window is closed
     if music_loaded:
@@ -1,8 +1,12 @@
 import pygame
 import sys
 import os
-import subprocess
-import random
+from scene_router import navigate
+from session_context import get_session, GAME_MODES
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from rankings_engine import get_rankings_engine, format_time, ALL_GAMES
 
 # Initialize pygame
 pygame.init()
@@ -29,19 +33,22 @@ GOLD = (255, 215, 0)
 SILVER = (192, 192, 192)
 BRONZE = (205, 127, 50)
 
+# Rows of the rankings table, the current student's own rows included
+RANKINGS_ROWS = 7
+
 # Screen setup
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("MemoryMath - Student Rankings")
-clock = pygame.time.Clock()
+frames = FrameScheduler()
 
 # Fonts
-title_font = pygame.font.SysFont('Arial', 48, bold=True)
-heading_font = pygame.font.SysFont('Arial', 36, bold=True)
-button_font = pygame.font.SysFont('Arial', 24, bold=True)
-text_font = pygame.font.SysFont('Arial', 24)
-small_font = pygame.font.SysFont('Arial', 18)
-table_font = pygame.font.SysFont('Arial', 20)
-rank_font = pygame.font.SysFont('Arial', 22, bold=True)
+title_font = get_font('Arial', 48, bold=True)
+heading_font = get_font('Arial', 36, bold=True)
+button_font = get_font('Arial', 24, bold=True)
+text_font = get_font('Arial', 24)
+small_font = get_font('Arial', 18)
+table_font = get_font('Arial', 20)
+rank_font = get_font('Arial', 22, bold=True)
 
 # Global variables for resources
 background_img = None
@@ -55,79 +62,12 @@ current_student = {
     "level": "Level 1 - Beginner"
 }
 
-try:
-    if os.path.exists("current_student.txt"):
-        with open("current_student.txt", "r") as f:
-            lines = f.readlines()
-            if len(lines) >= 2:
-                current_student["name"] = lines[0].strip()
-                current_student["level"] = lines[1].strip()
-except Exception as e:
-    print(f"Error loading student data: {e}")
-
-# Sample student data - in a real app, this would come from a database
-# We'll create 3 levels of students
-level1_students = [
-    {"name": "Alex", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Taylor", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Jordan", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Casey", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Morgan", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Riley", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Jamie", "score": random.randint(30, 100), "time": random.randint(30, 120)}
-]
-
-level2_students = [
-    {"name": "Taylor", "score": random.randint(40, 120), "time": random.randint(25, 100)},
-    {"name": "Casey", "score": random.randint(40, 120), "time": random.randint(25, 100)},
-    {"name": "Avery", "score": random.randint(40, 120), "time": random.randint(25, 100)},
-    {"name": "Quinn", "score": random.randint(40, 120), "time": random.randint(25, 100)},
-    {"name": "Rowan", "score": random.randint(40, 120), "time": random.randint(25, 100)}
-]
-
-level3_students = [
-    {"name": "Morgan", "score": random.randint(60, 150), "time": random.randint(20, 90)},
-    {"name": "Skyler", "score": random.randint(60, 150), "time": random.randint(20, 90)},
-    {"name": "Dakota", "score": random.randint(60, 150), "time": random.randint(20, 90)},
-    {"name": "Jordan", "score": random.randint(60, 150), "time": random.randint(20, 90)}
-]
-
-# Sort students by score (higher is better), with time as tiebreaker (lower is better)
-level1_students.sort(key=lambda x: (x["score"], -x["time"]), reverse=True)
-level2_students.sort(key=lambda x: (x["score"], -x["time"]), reverse=True)
-level3_students.sort(key=lambda x: (x["score"], -x["time"]), reverse=True)
-
-# Add current student to each level if not present
-if current_student["name"]:
-    # Check if the student is already in the level lists
-    in_level1 = any(s["name"] == current_student["name"] for s in level1_students)
-    in_level2 = any(s["name"] == current_student["name"] for s in level2_students)
-    in_level3 = any(s["name"] == current_student["name"] for s in level3_students)
-
-    # Add to appropriate level if not present
-    if not in_level1 and "Level 1" in current_student["level"]:
-        level1_students.append({
-            "name": current_student["name"],
-            "score": random.randint(30, 100),
-            "time": random.randint(30, 120)
-        })
-        level1_students.sort(key=lambda x: (x["score"], -x["time"]), reverse=True)
-
-    if not in_level2 and "Level 2" in current_student["level"]:
-        level2_students.append({
-            "name": current_student["name"],
-            "score": random.randint(40, 120),
-            "time": random.randint(25, 100)
-        })
-        level2_students.sort(key=lambda x: (x["score"], -x["time"]), reverse=True)
-
-    if not in_level3 and "Level 3" in current_student["level"]:
-        level3_students.append({
-            "name": current_student["name"],
-            "score": random.randint(60, 150),
-            "time": random.randint(20, 90)
-        })
-        level3_students.sort(key=lambda x: (x["score"], -x["time"]), reverse=True)
+if get_session().student:
+    current_student["name"] = get_session().student["name"]
+    current_student["level"] = get_session().student["level"]
+
+# Rankings of the recorded game sessions, one per game level (tab) and game
+rankings = get_rankings_engine()
 
 # Load images
 try:
@@ -191,7 +131,7 @@ class Button:
 
         pygame.draw.rect(screen, BLACK, self.rect, width=2, border_radius=self.border_radius)
 
-        text_surf = button_font.render(self.text, True, self.text_color)
+        text_surf = render_text(button_font, self.text, True, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -228,7 +168,7 @@ class TabButton:
 
         pygame.draw.rect(screen, BLACK, self.rect, width=2, border_radius=10)
 
-        text_surf = button_font.render(self.text, True, text_color)
+        text_surf = render_text(button_font, self.text, True, text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -248,7 +188,7 @@ def draw_medal(rank, x, y):
         # Fallback colors if medal images not available
         medal_colors = [GOLD, SILVER, BRONZE]
         pygame.draw.circle(screen, medal_colors[medal_index], (x + 15, y + 15), 15)
-        medal_text = rank_font.render(str(rank), True, BLACK)
+        medal_text = render_text(rank_font, str(rank), True, BLACK)
         medal_rect = medal_text.get_rect(center=(x + 15, y + 15))
         screen.blit(medal_text, medal_rect)
 
@@ -262,6 +202,11 @@ def show_student_rankings():
     # Variable to track info popup state
     show_info_popup = False
 
+    # Game whose rankings are shown (ALL_GAMES: each student's best game), cycled by the Game button
+    game_button = Button(130, 20, 100, 40, "Game", BLUE, LIGHT_BLUE, WHITE)
+    game_options = [ALL_GAMES] + GAME_MODES
+    game_index = 0
+
     # Create tabs for different levels with improved design
     tab_width = 160
     tab_height = 40
@@ -303,14 +248,16 @@ def show_student_rankings():
                         # Return to main screen
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "main_screen.py"])
+                        navigate("main_screen.py")
                         sys.exit()
 
                     if info_button.is_clicked(mouse_pos):
                         # Toggle info popup
                         show_info_popup = not show_info_popup
 
+                    if game_button.is_clicked(mouse_pos):
+                        game_index = (game_index + 1) % len(game_options)
+
                     # Check tab clicks
                     for i, tab in enumerate(tabs):
                         if tab.is_clicked(mouse_pos):
@@ -325,19 +272,23 @@ def show_student_rankings():
             if event.type == pygame.KEYDOWN and show_info_popup:
                 show_info_popup = False
 
+        # Top of the selected level and game; if the current student is ranked below it,
+        # the last rows are the student and their neighbours. New sessions are included
+        # as they are saved
+        level = active_tab + 1
+        game = game_options[game_index]
+        standing = rankings.get_standing(current_student["name"], level, game) if current_student["name"] else None
+        students_list = rankings.get_page(level, game, 0, RANKINGS_ROWS)
+        if standing is not None and all(s["player_name"] != standing["player_name"] for s in students_list):
+            own_rows = standing["above"] + [standing] + standing["below"]
+            students_list[RANKINGS_ROWS - len(own_rows):] = own_rows
+
         # Draw the background
         if background_img:
             screen.blit(background_img, (0, 0))
         else:
             # Gradient background as fallback
-            for y in range(SCREEN_HEIGHT):
-                # Create a gradient from dark blue to light blue
-                color = (
-                    int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-                )
-                pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+            screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Draw logo if available
         if logo_img:
@@ -354,7 +305,7 @@ def show_student_rankings():
         pygame.draw.rect(screen, BLACK, heading_bar_rect, width=2, border_radius=15)
 
         # Draw rankings text
-        rankings_text = heading_font.render("Student Rankings", True, WHITE)
+        rankings_text = render_text(heading_font, f"{game} Rankings" if game else "Student Rankings", True, WHITE)
         rankings_rect = rankings_text.get_rect(center=(heading_bar_rect.centerx, heading_bar_rect.centery))
         screen.blit(rankings_text, rankings_rect)
 
@@ -362,8 +313,9 @@ def show_student_rankings():
         for tab in tabs:
             tab.draw()
 
-        # Draw info button
+        # Draw info and game buttons
         info_button.draw()
+        game_button.draw()
 
         # Draw rankings table
         # Table header
@@ -379,7 +331,7 @@ def show_student_rankings():
 
         header_texts = ["Rank", "Student Name", "Score", "Time"]
         for i, text in enumerate(header_texts):
-            text_surf = table_font.render(text, True, WHITE)
+            text_surf = render_text(table_font, text, True, WHITE)
             if i == 0:  # Center rank
                 text_rect = text_surf.get_rect(center=(col_x + col_widths[i] // 2, header_rect.centery))
             elif i == 1:  # Left align name
@@ -390,14 +342,10 @@ def show_student_rankings():
             screen.blit(text_surf, text_rect)
             col_x += col_widths[i]
 
-        # Table rows based on active tab
-        students_list = [level1_students, level2_students, level3_students][active_tab]
+        # Table rows
         row_y = header_rect.bottom
 
         for i, student in enumerate(students_list):
-            if i >= 10:  # Show max 10 rows
-                break
-
             row_rect = pygame.Rect(header_rect.x, row_y, table_width, table_height)
 
             # Alternate row colors
@@ -407,7 +355,7 @@ def show_student_rankings():
                 pygame.draw.rect(screen, LIGHT_BLUE, row_rect)
 
             # Highlight the current student's row with a more prominent color
-            if current_student["name"] and student["name"] == current_student["name"]:
+            if current_student["name"] and student["player_name"] == current_student["name"]:
                 pygame.draw.rect(screen, LIGHT_ORANGE, row_rect)
                 # Add an indicator arrow
                 pygame.draw.polygon(screen, ORANGE, [
@@ -422,32 +370,30 @@ def show_student_rankings():
             col_x = row_rect.x
 
             # Rank column with medal for top 3
-            rank_text = table_font.render(str(i + 1), True, BLACK)
+            rank_text = render_text(table_font, str(student["rank"]), True, BLACK)
             rank_rect = rank_text.get_rect(center=(col_x + col_widths[0] // 2, row_rect.centery))
             screen.blit(rank_text, rank_rect)
 
             # Draw medal if top 3
-            if i < 3:
-                draw_medal(i + 1, col_x + 10, row_rect.y + 5)
+            if student["rank"] <= 3:
+                draw_medal(student["rank"], col_x + 10, row_rect.y + 5)
 
             col_x += col_widths[0]
 
             # Name column
-            name_text = table_font.render(student["name"], True, BLACK)
+            name_text = render_text(table_font, student["player_name"], True, BLACK)
             name_rect = name_text.get_rect(midleft=(col_x + 10, row_rect.centery))
             screen.blit(name_text, name_rect)
             col_x += col_widths[1]
 
             # Score column
-            score_text = table_font.render(str(student["score"]), True, BLACK)
+            score_text = render_text(table_font, str(student["score"]), True, BLACK)
             score_rect = score_text.get_rect(center=(col_x + col_widths[2] // 2, row_rect.centery))
             screen.blit(score_text, score_rect)
             col_x += col_widths[2]
 
             # Time column (formatted as mm:ss)
-            minutes = student["time"] // 60
-            seconds = student["time"] % 60
-            time_text = table_font.render(f"{minutes}:{seconds:02d}", True, BLACK)
+            time_text = render_text(table_font, format_time(student["time"]), True, BLACK)
             time_rect = time_text.get_rect(center=(col_x + col_widths[3] // 2, row_rect.centery))
             screen.blit(time_text, time_rect)
 
@@ -455,20 +401,25 @@ def show_student_rankings():
 
         # Draw note if there are no students for this level
         if len(students_list) == 0:
-            no_data_text = text_font.render("No rankings data available for this level", True, WHITE)
+            no_data_text = render_text(text_font, "No rankings data available for this level", True, WHITE)
             no_data_rect = no_data_text.get_rect(center=(SCREEN_WIDTH // 2, 300))
             screen.blit(no_data_text, no_data_rect)
 
         # Draw notes at bottom for students in an attractive box - made smaller
-        note_box = pygame.Rect(SCREEN_WIDTH // 2 - 350, row_y + 10, 700, 50)
+        note_box = pygame.Rect(SCREEN_WIDTH // 2 - 350, max(row_y, 320) + 10, 700, 50)  # Below the no data note
         pygame.draw.rect(screen, DARK_BLUE, note_box, border_radius=10, width=0)
         pygame.draw.rect(screen, BLACK, note_box, border_radius=10, width=2)
 
-        note_text = small_font.render("Rankings are based on highest score. Time is used as a tiebreaker.", True, WHITE)
+        note_text = render_text(small_font, "Rankings are based on highest score. Time is used as a tiebreaker.", True, WHITE)
         note_rect = note_text.get_rect(midleft=(note_box.left + 20, note_box.centery - 10))
         screen.blit(note_text, note_rect)
 
-        student_note = small_font.render("Keep practicing to improve your ranking!", True, YELLOW)
+        if standing is not None:
+            student_label = (f"You are #{standing['rank']} of {standing['total']}, ahead of "
+                             f"{standing['percentile']:.0f}% of players. Keep practicing!")
+        else:
+            student_label = "Keep practicing to improve your ranking!"
+        student_note = render_text(small_font, student_label, True, YELLOW)
         student_note_rect = student_note.get_rect(midleft=(note_box.left + 20, note_box.centery + 10))
         screen.blit(student_note, student_note_rect)
 
@@ -500,7 +451,7 @@ def show_student_rankings():
             pygame.draw.rect(screen, BLACK, popup_rect, width=2, border_radius=15)
 
             # Popup title
-            popup_title = heading_font.render("Rankings Information", True, BLUE)
+            popup_title = render_text(heading_font, "Rankings Information", True, BLUE)
             popup_title_rect = popup_title.get_rect(center=(popup_rect.centerx, popup_rect.top + 30))
             screen.blit(popup_title, popup_title_rect)
 
@@ -514,24 +465,24 @@ def show_student_rankings():
                 "Rankings are based on the highest score achieved by each student.",
                 "Time is used as a tiebreaker when students have the same score.",
                 "Faster completion times result in higher rankings.",
-                "Your row is highlighted in orange for easy identification.",
+                "Your row is highlighted in orange, and always shown if you have played.",
                 "Keep practicing to improve your score and climb the rankings!"
             ]
 
             # Display explanation text
             for i, line in enumerate(explanation_lines):
-                line_text = small_font.render(line, True, BLACK)
+                line_text = render_text(small_font, line, True, BLACK)
                 y_pos = popup_rect.top + 90 + i * 25
                 line_rect = line_text.get_rect(midleft=(popup_rect.left + 30, y_pos))
                 screen.blit(line_text, line_rect)
 
             # Close instruction
-            close_text = small_font.render("Press any key to close this window", True, DARK_GRAY)
+            close_text = render_text(small_font, "Press any key to close this window", True, DARK_GRAY)
             close_rect = close_text.get_rect(center=(popup_rect.centerx, popup_rect.bottom - 20))
             screen.blit(close_text, close_rect)
 
         pygame.display.flip()
-        clock.tick(60)
+        frames.tick()
 
     # Stop music and quit if window is closed
     if music_loaded:
@@ -1,7 +1,11 @@
 import pygame
 import sys
 import os
-import subprocess
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
 
 # Initialize pygame
 pygame.init()
@@ -29,14 +33,14 @@ YELLOW = (255, 230, 0)
 # Screen setup
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("MemoryMath - Teacher Login")
-clock = pygame.time.Clock()
+frames = FrameScheduler()
 
 # Fonts
-title_font = pygame.font.SysFont('Arial', 48, bold=True)
-heading_font = pygame.font.SysFont('Arial', 36, bold=True)
-button_font = pygame.font.SysFont('Arial', 24, bold=True)
-text_font = pygame.font.SysFont('Arial', 24)
-small_font = pygame.font.SysFont('Arial', 18)
+title_font = get_font('Arial', 48, bold=True)
+heading_font = get_font('Arial', 36, bold=True)
+button_font = get_font('Arial', 24, bold=True)
+text_font = get_font('Arial', 24)
+small_font = get_font('Arial', 18)
 
 # Global variables for resources
 background_img = None
@@ -102,7 +106,7 @@ class Button:
 
         pygame.draw.rect(screen, BLACK, self.rect, width=2, border_radius=self.border_radius)
 
-        text_surf = button_font.render(self.text, True, self.text_color)
+        text_surf = render_text(button_font, self.text, True, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -119,8 +123,8 @@ class TextInput:
         self.is_password = is_password
         self.active = False
         self.cursor_visible = True
-        self.cursor_timer = 0
-        self.cursor_blink_speed = 30  # Frames per blink
+        self.cursor_timer = pygame.time.get_ticks()
+        self.cursor_blink_speed = 500  # Milliseconds per blink
 
     def draw(self):
         # Draw the input box
@@ -139,9 +143,9 @@ class TextInput:
             else:
                 display_text = self.text
 
-            text_surf = text_font.render(display_text, True, BLACK)
+            text_surf = render_text(text_font, display_text, True, BLACK)
         else:
-            text_surf = text_font.render(self.placeholder, True, GRAY)
+            text_surf = render_text(text_font, self.placeholder, True, GRAY)
 
         # Position text on the left side with some padding
         text_rect = text_surf.get_rect(midleft=(self.rect.x + 10, self.rect.centery))
@@ -163,10 +167,10 @@ class TextInput:
                              (cursor_x, self.rect.bottom - 10), 2)
 
     def update(self):
-        # Update cursor blink
-        self.cursor_timer += 1
-        if self.cursor_timer >= self.cursor_blink_speed:
-            self.cursor_timer = 0
+        # Update cursor blink (time based, so it keeps its pace at the idle frame rate)
+        now = pygame.time.get_ticks()
+        if now - self.cursor_timer >= self.cursor_blink_speed:
+            self.cursor_timer = now
             self.cursor_visible = not self.cursor_visible
 
     def handle_event(self, event):
@@ -177,7 +181,7 @@ class TextInput:
                 self.active = False
 
             self.cursor_visible = True
-            self.cursor_timer = 0
+            self.cursor_timer = pygame.time.get_ticks()
 
         if event.type == pygame.KEYDOWN and self.active:
             if event.key == pygame.K_BACKSPACE:
@@ -189,7 +193,7 @@ class TextInput:
                     self.text += event.unicode
 
             self.cursor_visible = True
-            self.cursor_timer = 0
+            self.cursor_timer = pygame.time.get_ticks()
 
 
 def show_teacher_login_screen():
@@ -225,8 +229,7 @@ def show_teacher_login_screen():
                         # Return to main login screen
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "login_screen.py"])
+                        navigate("login_screen.py")
                         return
 
                     elif login_button.is_clicked(mouse_pos):
@@ -234,15 +237,13 @@ def show_teacher_login_screen():
                         if (username_input.text == TEACHER_USERNAME and
                                 password_input.text == TEACHER_PASSWORD):
                             print("Teacher login successful")
-                            # Write teacher username to a file for teacher_main.py
-                            with open("current_teacher.txt", "w") as f:
-                                f.write(username_input.text)
+                            # Store teacher username in the session for teacher_main.py
+                            get_session().login_teacher(username_input.text)
 
                             # Go to teacher main screen
                             if music_loaded:
                                 pygame.mixer.music.stop()
-                            pygame.quit()
-                            subprocess.run(["python", "teacher_main.py"])
+                            navigate("teacher_main.py")
                             return
                         else:
                             error_message = "Invalid username or password"
@@ -256,39 +257,32 @@ def show_teacher_login_screen():
             screen.blit(background_img, (0, 0))
         else:
             # Gradient background as fallback
-            for y in range(SCREEN_HEIGHT):
-                # Create a gradient from dark blue to light blue
-                color = (
-                    int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-                )
-                pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+            screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Draw logo if available
         if logo_img:
             screen.blit(logo_img, (SCREEN_WIDTH // 2 - logo_img.get_width() // 2, 50))
         else:
             # Draw title text as fallback
-            title_text = title_font.render("Memory Math", True, WHITE)
+            title_text = render_text(title_font, "Memory Math", True, WHITE)
             title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 80))
             screen.blit(title_text, title_rect)
 
         # Draw teacher login heading
-        login_text = heading_font.render("Teacher Login", True, WHITE)
+        login_text = render_text(heading_font, "Teacher Login", True, WHITE)
         login_rect = login_text.get_rect(center=(SCREEN_WIDTH // 2, 180))
         screen.blit(login_text, login_rect)
 
         # Draw username and password labels
-        username_label = text_font.render("Username:", True, WHITE)
+        username_label = render_text(text_font, "Username:", True, WHITE)
         screen.blit(username_label, (SCREEN_WIDTH // 2 - 150, 220))
 
-        password_label = text_font.render("Password:", True, WHITE)
+        password_label = render_text(text_font, "Password:", True, WHITE)
         screen.blit(password_label, (SCREEN_WIDTH // 2 - 150, 290))
 
         # Draw error message if any
         if error_message:
-            error_text = text_font.render(error_message, True, RED)
+            error_text = render_text(text_font, error_message, True, RED)
             error_rect = error_text.get_rect(center=(SCREEN_WIDTH // 2, 470))
             screen.blit(error_text, error_rect)
 
@@ -299,7 +293,7 @@ def show_teacher_login_screen():
         password_input.draw()
 
         pygame.display.flip()
-        clock.tick(60)
+        frames.tick()
 
     # Stop music and quit if window is closed
     if music_loaded:
@@ -1,7 +1,12 @@
 import pygame
 import sys
 import os
-import subprocess
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from dirty_rects import DirtyRenderer
 
 # Initialize pygame
 pygame.init()
@@ -27,14 +32,15 @@ YELLOW = (255, 230, 0)
 # Screen setup
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("MemoryMath - Teacher Dashboard")
-clock = pygame.time.Clock()
+frames = FrameScheduler()
+renderer = DirtyRenderer(screen)
 
 # Fonts
-title_font = pygame.font.SysFont('Arial', 48, bold=True)
-heading_font = pygame.font.SysFont('Arial', 36, bold=True)
-button_font = pygame.font.SysFont('Arial', 24, bold=True)
-text_font = pygame.font.SysFont('Arial', 24)
-small_font = pygame.font.SysFont('Arial', 18)
+title_font = get_font('Arial', 48, bold=True)
+heading_font = get_font('Arial', 36, bold=True)
+button_font = get_font('Arial', 24, bold=True)
+text_font = get_font('Arial', 24)
+small_font = get_font('Arial', 18)
 
 # Global variables for resources
 background_img = None
@@ -42,13 +48,7 @@ logo_img = None
 images_loaded = False
 
 # Get teacher username
-teacher_username = "Teacher"
-try:
-    if os.path.exists("current_teacher.txt"):
-        with open("current_teacher.txt", "r") as f:
-            teacher_username = f.read().strip()
-except Exception as e:
-    print(f"Error loading teacher data: {e}")
+teacher_username = get_session().teacher or "Teacher"
 
 # Load images
 try:
@@ -105,7 +105,7 @@ class Button:
 
         pygame.draw.rect(screen, BLACK, self.rect, width=2, border_radius=self.border_radius)
 
-        text_surf = button_font.render(self.text, True, self.text_color)
+        text_surf = render_text(button_font, self.text, True, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -130,6 +130,7 @@ def show_teacher_main():
     running = True
     while running:
         for event in pygame.event.get():
+            renderer.handle_event(event)
             if event.type == pygame.QUIT:
                 running = False
 
@@ -142,8 +143,8 @@ def show_teacher_main():
                         # Return to main login screen
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "login_screen.py"])
+                        get_session().logout()
+                        navigate("login_screen.py")
                         return
 
                     # Handle view students button
@@ -151,8 +152,7 @@ def show_teacher_main():
                         print("Viewing student details")
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "student_details.py"])
+                        navigate("student_details.py")
                         return
 
                     # Handle view rankings button
@@ -160,45 +160,44 @@ def show_teacher_main():
                         print("Viewing student rankings")
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "view_rankings_teacher.py"])
+                        navigate("view_rankings_teacher.py")
                         return
 
+        # Report what can change so that only those regions are repainted
+        for button in (logout_button, view_students_button, view_rankings_button):
+            renderer.track_hover(button.rect)
+        if not renderer.begin_frame():
+            frames.tick()
+            continue
+
         # Draw the background
         if background_img:
             screen.blit(background_img, (0, 0))
         else:
             # Gradient background as fallback
-            for y in range(SCREEN_HEIGHT):
-                # Create a gradient from dark blue to light blue
-                color = (
-                    int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-                )
-                pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+            screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Draw logo if available
         if logo_img:
             screen.blit(logo_img, (SCREEN_WIDTH // 2 - logo_img.get_width() // 2, 50))
         else:
             # Draw title text as fallback
-            title_text = title_font.render("Memory Math", True, WHITE)
+            title_text = render_text(title_font, "Memory Math", True, WHITE)
             title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 80))
             screen.blit(title_text, title_rect)
 
         # Draw teacher dashboard heading
-        dashboard_text = heading_font.render("Teacher Dashboard", True, WHITE)
+        dashboard_text = render_text(heading_font, "Teacher Dashboard", True, WHITE)
         dashboard_rect = dashboard_text.get_rect(center=(SCREEN_WIDTH // 2, 160))
         screen.blit(dashboard_text, dashboard_rect)
 
         # Draw welcome message
-        welcome_text = text_font.render(f"Welcome back, {teacher_username}!", True, WHITE)
+        welcome_text = render_text(text_font, f"Welcome back, {teacher_username}!", True, WHITE)
         welcome_rect = welcome_text.get_rect(center=(SCREEN_WIDTH // 2, 220))
         screen.blit(welcome_text, welcome_rect)
 
         # Draw action message
-        action_text = small_font.render("Please select an option:", True, YELLOW)
+        action_text = render_text(small_font, "Please select an option:", True, YELLOW)
         action_rect = action_text.get_rect(center=(SCREEN_WIDTH // 2, 260))
         screen.blit(action_text, action_rect)
 
@@ -207,8 +206,8 @@ def show_teacher_main():
         view_students_button.draw()
         view_rankings_button.draw()
 
-        pygame.display.flip()
-        clock.tick(60)
+        renderer.present()
+        frames.tick()
 
     # Stop music and quit if window is closed
     if music_loaded:
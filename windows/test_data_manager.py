@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from data_manager import DataManager
+
+
+class DataManagerTestCase(unittest.TestCase):
+    """
+    Base class: a fresh database in a temporary directory for every test, never the
+    game's own game_data.db.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "test.db")
+        self.dm = DataManager(self.path, cache_size=0, use_daemon=False)
+
+    def tearDown(self):
+        self.dm.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def reopen(self):
+        self.dm.close()
+        self.dm = DataManager(self.path, cache_size=0, use_daemon=False)
+
+    def daily_games(self):
+        return self.dm.conn.execute("SELECT coalesce(sum(games), 0) FROM daily_stats;").fetchone()[0]
+
+
+class BulkInsertTest(DataManagerTestCase):
+
+    def test_empty_bulk_batch_leaves_rollups_unchanged(self):
+        self.dm.save_sessions([("Ana", 10, 1, 30.0, 0.5, "Classic"),
+                               ("Ben", 20, 1, 40.0, 0.7, "Classic")], bulk=True)
+        for _ in range(3):
+            # A new connection has no last inserted row to go by
+            self.reopen()
+            self.assertEqual(self.dm.save_sessions([], bulk=True), [])
+        self.assertEqual(self.dm.get_stats()["total_games"], 2)
+        self.assertEqual(self.daily_games(), 2)
+
+    def test_bulk_batch_merges_only_its_own_rows(self):
+        self.dm.save_sessions([("Ana", 10, 1, 30.0, 0.5, "Classic")])
+        self.dm.save_sessions([("Ben", 20, 1, 40.0, 0.7, "Classic")], bulk=True)
+        self.assertEqual(self.dm.get_stats()["total_games"], 2)
+        self.assertEqual(self.daily_games(), 2)
+
+
+class LeaderboardTieTest(DataManagerTestCase):
+    """
+    A player's entry is their best score, and of the sessions with that score the fastest.
+    """
+
+    SESSIONS = [("Ana", 50, 1, 40.0, None, "Classic"),
+                ("Ana", 50, 1, 25.0, None, "Classic"),
+                ("Ana", 50, 2, 30.0, None, "Classic"),
+                ("Ana", 20, 1, 10.0, None, "Classic")]
+
+    def best_durations(self):
+        return {row.player_name: (row.best_score, row.duration) for row in self.dm.get_best_sessions()}
+
+    def test_faster_session_with_same_score_replaces_entry(self):
+        for session in self.SESSIONS:
+            self.dm.save_session(*session)
+        self.assertEqual(self.best_durations(), {"Ana": (50, 25.0)})
+        self.assertEqual({row.duration for row in self.dm.get_best_sessions(level=2)}, {30.0})
+
+    def test_bulk_insert_keeps_fastest_session(self):
+        self.dm.save_sessions(self.SESSIONS[:1])
+        self.dm.save_sessions(self.SESSIONS[1:], bulk=True)
+        self.assertEqual(self.best_durations(), {"Ana": (50, 25.0)})
+
+    def test_rebuild_and_delete_keep_fastest_session(self):
+        self.dm.save_sessions(self.SESSIONS)
+        self.dm.rebuild_leaderboards()
+        self.assertEqual(self.best_durations(), {"Ana": (50, 25.0)})
+        fastest = self.dm.get_best_sessions()[0].session_id
+        with self.dm.conn:
+            self.dm.conn.execute("DELETE FROM sessions WHERE id = ?;", (fastest,))
+        self.assertEqual(self.best_durations(), {"Ana": (50, 30.0)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from legacy_ingest import ingest
+
+
+class IngestRerunTest(unittest.TestCase):
+    """
+    Importing the same legacy files again must not change the database.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.root = os.path.join(self.directory, "share")
+        self.db_name = os.path.join(self.directory, "test.db")
+        self.write_kiosk("kiosk1", {"word_builder_score.txt": "30\n", "memorymath_data.txt": "12\n5\n8\n16\n42.5\n"})
+        self.write_kiosk("kiosk2", {"word_builder_score.txt": "30\n", "carparking_data.txt": "14\n3\n12\n85\n"})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write_kiosk(self, kiosk, files):
+        path = os.path.join(self.root, kiosk)
+        os.makedirs(path, exist_ok=True)
+        for name, text in files.items():
+            with open(os.path.join(path, name), "w", encoding="utf-8") as f:
+                f.write(text)
+
+    def counts(self):
+        conn = sqlite3.connect(self.db_name)
+        try:
+            sessions = conn.execute("SELECT COUNT(*) FROM sessions;").fetchone()[0]
+            games = conn.execute("SELECT coalesce(sum(games), 0) FROM daily_stats;").fetchone()[0]
+            return sessions, games
+        finally:
+            conn.close()
+
+    def test_rerun_imports_nothing(self):
+        self.assertEqual(ingest(self.root, self.db_name, workers=1, bulk=True)["imported"], 4)
+        self.assertEqual(self.counts(), (4, 4))
+        for bulk in (True, True, False):
+            self.assertEqual(ingest(self.root, self.db_name, workers=1, bulk=bulk)["imported"], 0)
+            self.assertEqual(self.counts(), (4, 4))
+
+    def test_copy_with_new_times_imports_nothing(self):
+        ingest(self.root, self.db_name, workers=1)
+        # A copy that does not preserve times, into a folder of its own on the same kiosk
+        copy = os.path.join(self.root, "kiosk1", "2026-10-18")
+        shutil.copytree(os.path.join(self.root, "kiosk1"), copy, copy_function=shutil.copyfile)
+        for name in os.listdir(copy):
+            os.utime(os.path.join(copy, name), (0, 86400))
+        self.assertEqual(ingest(self.root, self.db_name, workers=1)["imported"], 0)
+        self.assertEqual(self.counts(), (4, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
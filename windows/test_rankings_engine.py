@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from data_manager import DataManager
+from rankings_engine import RankingsEngine
+
+
+class RankingsTieTest(unittest.TestCase):
+    """
+    Players are ranked by score, then by time: a faster run with the same score counts.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.dm = DataManager(os.path.join(self.directory, "test.db"), cache_size=0, use_daemon=False)
+        self.dm.save_session("Ana", 50, 1, 40.0, None, "Classic")
+        self.dm.save_session("Ben", 50, 1, 30.0, None, "Classic")
+
+    def tearDown(self):
+        self.dm.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def ranks(self, engine, mode):
+        return [(entry["rank"], entry["player_name"], entry["time"]) for entry in engine.get_page(mode=mode)]
+
+    def test_faster_run_with_same_score_improves_rank(self):
+        engine = RankingsEngine(self.dm)
+        self.assertEqual(self.ranks(engine, "Classic"), [(1, "Ben", 30.0), (2, "Ana", 40.0)])
+        self.dm.save_session("Ana", 50, 1, 20.0, None, "Classic")
+        engine.refresh(force=True)
+        for mode in ("Classic", None):
+            self.assertEqual(self.ranks(engine, mode), [(1, "Ana", 20.0), (2, "Ben", 30.0)])
+        # Loaded from the leaderboard table, the rankings agree with the folded ones
+        self.assertEqual(self.ranks(RankingsEngine(self.dm), "Classic"), [(1, "Ana", 20.0), (2, "Ben", 30.0)])
+
+    def test_slower_run_with_same_score_changes_nothing(self):
+        engine = RankingsEngine(self.dm)
+        engine.get_page(mode="Classic")
+        self.dm.save_session("Ben", 50, 1, 35.0, None, "Classic")
+        engine.refresh(force=True)
+        self.assertEqual(self.ranks(engine, "Classic"), [(1, "Ben", 30.0), (2, "Ana", 40.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
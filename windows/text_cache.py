@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+
+import pygame
+
+# Maximum number of rendered text surfaces kept alive at once
+MAX_ENTRIES = 512
+
+
+class TextCache:
+    """
+    TextCache keeps recently rendered text surfaces so that labels which do not
+    change between frames cost a dictionary lookup instead of a FreeType render.
+
+    Entries are keyed by (font, text, colour, antialias, background) and evicted in
+    least-recently-used order once `max_entries` is reached. Cached surfaces are
+    shared between callers and must be treated as read-only.
+
+    Attributes:
+    - max_entries: int, maximum number of cached surfaces
+    - hits: int, number of renders answered from the cache
+    - misses: int, number of renders that had to call font.render
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        """
+        Parameters:
+        - max_entries: int, maximum number of cached surfaces.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def render(self, font, text, antialias, color, background=None):
+        """
+        Return the surface for `text`, rendering it only on a cache miss.
+
+        Takes the same arguments as pygame.font.Font.render, with the font first.
+        """
+        key = (font, text, antialias, tuple(color),
+               tuple(background) if background is not None else None)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if background is None:
+            surface = font.render(text, antialias, color)
+        else:
+            surface = font.render(text, antialias, color, background)
+        self._entries[key] = surface
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """
+        Drop every cached surface and reset the counters.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+        Return a dict with the cache's hits, misses, hit_rate, size and max_entries.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+
+# Cache shared by every screen running in this process
+text_cache = TextCache()
+
+# System fonts already loaded, keyed by (name, size, bold, italic)
+_font_cache = {}
+
+# Guards loading into _font_cache: charts ask for fonts from background threads
+_font_lock = threading.Lock()
+
+
+def get_font(name, size, bold=False, italic=False):
+    """
+    Return a system font, loading it only the first time it is asked for.
+
+    Drop-in replacement for pygame.font.SysFont. Reusing the same Font object keeps
+    the text cache effective across frames and across screens. Unlike the TextCache,
+    it may be called from background threads (see charts and BackgroundJob): fonts are
+    loaded under a lock, so every thread gets the same Font object.
+    """
+    key = (name, size, bool(bold), bool(italic))
+    font = _font_cache.get(key)
+    if font is None:
+        with _font_lock:
+            font = _font_cache.get(key)
+            if font is None:
+                font = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+                _font_cache[key] = font
+    return font
+
+
+def render_text(font, text, antialias, color, background=None):
+    """
+    Render text through the shared TextCache.
+
+    Drop-in replacement for font.render(text, antialias, color, background).
+    """
+    return text_cache.render(font, text, antialias, color, background)
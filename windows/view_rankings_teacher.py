@@ -1,8 +1,13 @@
 import pygame
 import sys
 import os
-import subprocess
-import random
+from scene_router import navigate
+from session_context import get_session, GAME_MODES
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from session_export import SessionExport
+from rankings_engine import get_rankings_engine, get_rolling_leaderboard, format_time, ALL_GAMES
 
 # Initialize pygame
 pygame.init()
@@ -28,19 +33,26 @@ GOLD = (255, 215, 0)
 SILVER = (192, 192, 192)
 BRONZE = (205, 127, 50)
 
+# Rows of the rankings table per page
+RANKINGS_ROWS = 7
+
+# Periods the rankings can be limited to (rankings_engine.ROLLING_WINDOWS), cycled by the Period button
+RANKINGS_PERIODS = [None, "day", "week", "term"]
+PERIOD_LABELS = {None: "All time", "day": "Past day", "week": "Past week", "term": "Past term"}
+
 # Screen setup
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("MemoryMath - Teacher Rankings View")
-clock = pygame.time.Clock()
+frames = FrameScheduler()
 
 # Fonts
-title_font = pygame.font.SysFont('Arial', 48, bold=True)
-heading_font = pygame.font.SysFont('Arial', 36, bold=True)
-button_font = pygame.font.SysFont('Arial', 24, bold=True)
-text_font = pygame.font.SysFont('Arial', 24)
-small_font = pygame.font.SysFont('Arial', 18)
-table_font = pygame.font.SysFont('Arial', 20)
-rank_font = pygame.font.SysFont('Arial', 22, bold=True)
+title_font = get_font('Arial', 48, bold=True)
+heading_font = get_font('Arial', 36, bold=True)
+button_font = get_font('Arial', 24, bold=True)
+text_font = get_font('Arial', 24)
+small_font = get_font('Arial', 18)
+table_font = get_font('Arial', 20)
+rank_font = get_font('Arial', 22, bold=True)
 
 # Global variables for resources
 background_img = None
@@ -49,45 +61,10 @@ medal_imgs = [None, None, None]  # Gold, Silver, Bronze
 images_loaded = False
 
 # Get teacher username
-teacher_username = "Teacher"
-try:
-    if os.path.exists("current_teacher.txt"):
-        with open("current_teacher.txt", "r") as f:
-            teacher_username = f.read().strip()
-except Exception as e:
-    print(f"Error loading teacher data: {e}")
-
-# Sample student data - in a real app, this would come from a database
-# We'll create 3 levels of students
-level1_students = [
-    {"name": "Alex", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Taylor", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Jordan", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Casey", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Morgan", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Riley", "score": random.randint(30, 100), "time": random.randint(30, 120)},
-    {"name": "Jamie", "score": random.randint(30, 100), "time": random.randint(30, 120)}
-]
-
-level2_students = [
-    {"name": "Taylor", "score": random.randint(40, 120), "time": random.randint(25, 100)},
-    {"name": "Casey", "score": random.randint(40, 120), "time": random.randint(25, 100)},
-    {"name": "Avery", "score": random.randint(40, 120), "time": random.randint(25, 100)},
-    {"name": "Quinn", "score": random.randint(40, 120), "time": random.randint(25, 100)},
-    {"name": "Rowan", "score": random.randint(40, 120), "time": random.randint(25, 100)}
-]
-
-level3_students = [
-    {"name": "Morgan", "score": random.randint(60, 150), "time": random.randint(20, 90)},
-    {"name": "Skyler", "score": random.randint(60, 150), "time": random.randint(20, 90)},
-    {"name": "Dakota", "score": random.randint(60, 150), "time": random.randint(20, 90)},
-    {"name": "Jordan", "score": random.randint(60, 150), "time": random.randint(20, 90)}
-]
-
-# Sort students by score (higher is better), with time as tiebreaker (lower is better)
-level1_students.sort(key=lambda x: (x["score"], -x["time"]), reverse=True)
-level2_students.sort(key=lambda x: (x["score"], -x["time"]), reverse=True)
-level3_students.sort(key=lambda x: (x["score"], -x["time"]), reverse=True)
+teacher_username = get_session().teacher or "Teacher"
+
+# Rankings of the recorded game sessions, one per game level (tab) and game
+rankings = get_rankings_engine()
 
 # Load images
 try:
@@ -151,7 +128,7 @@ class Button:
 
         pygame.draw.rect(screen, BLACK, self.rect, width=2, border_radius=self.border_radius)
 
-        text_surf = button_font.render(self.text, True, self.text_color)
+        text_surf = render_text(button_font, self.text, True, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -188,7 +165,7 @@ class TabButton:
 
         pygame.draw.rect(screen, BLACK, self.rect, width=2, border_radius=10)
 
-        text_surf = button_font.render(self.text, True, text_color)
+        text_surf = render_text(button_font, self.text, True, text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -208,7 +185,7 @@ def draw_medal(rank, x, y):
         # Fallback colors if medal images not available
         medal_colors = [GOLD, SILVER, BRONZE]
         pygame.draw.circle(screen, medal_colors[medal_index], (x + 15, y + 15), 15)
-        medal_text = rank_font.render(str(rank), True, BLACK)
+        medal_text = render_text(rank_font, str(rank), True, BLACK)
         medal_rect = medal_text.get_rect(center=(x + 15, y + 15))
         screen.blit(medal_text, medal_rect)
 
@@ -220,11 +197,31 @@ def show_teacher_rankings():
     export_button = Button(SCREEN_WIDTH - 120, 20, 100, 40, "Export", GREEN, LIGHT_GREEN, WHITE)
     info_button = Button(SCREEN_WIDTH - 70, 140, 40, 40, "?", YELLOW, LIGHT_ORANGE, BLACK)
 
+    # Game whose rankings are shown (ALL_GAMES: each student's best game), cycled by the Game button
+    game_button = Button(130, 20, 100, 40, "Game", BLUE, LIGHT_BLUE, WHITE)
+    game_options = [ALL_GAMES] + GAME_MODES
+    game_index = 0
+
+    # Period the rankings cover (None: all time), cycled by the Period button. Over a period
+    # the top rows come from a rolling leaderboard, and only the rows it reports as changed
+    # since the shown version are replaced.
+    period_button = Button(20, 140, 110, 40, "Period", BLUE, LIGHT_BLUE, WHITE)
+    period_index = 0
+    shown_board = None
+    board_rows = [None] * RANKINGS_ROWS
+    board_version = 0
+
+    # Page of the rankings table shown, changed with the mouse wheel or Page Up / Page Down
+    page = 0
+
     # Variables for export notification
     export_notification = False
     export_notification_time = 0
     NOTIFICATION_DURATION = 2000  # 2 seconds
 
+    # Background export of the recorded game sessions, started by the Export button
+    session_export = None
+
     # Variable to track info popup state
     show_info_popup = False
 
@@ -264,8 +261,7 @@ def show_teacher_rankings():
                         # Return to teacher dashboard
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        subprocess.run(["python", "teacher_main.py"])
+                        navigate("teacher_main.py")
                         sys.exit()  # Changed return to sys.exit()
 
                     if export_button.is_clicked(mouse_pos):
@@ -278,21 +274,31 @@ def show_teacher_rankings():
                             export_filename = f"rankings_level{active_tab + 1}.txt"
                             export_path = os.path.join(desktop_path, export_filename)
 
+                            level = active_tab + 1
+                            game = game_options[game_index]
+                            period = RANKINGS_PERIODS[period_index]
+                            if period is None:
+                                students = rankings.get_page(level, game, 0, rankings.count(level, game))
+                            else:
+                                board = get_rolling_leaderboard(period, game, level, RANKINGS_ROWS)
+                                students = board.get_page(0, board.count())
                             with open(export_path, "w") as f:
-                                f.write(f"# MemoryMath Level {active_tab + 1} Rankings\n")
+                                f.write(f"# MemoryMath Level {level} Rankings ({game or 'All Games'}, "
+                                        f"{PERIOD_LABELS[period]})\n")
                                 f.write(f"# Generated on {pygame.time.get_ticks() // 1000} seconds into session\n\n")
 
-                                students = [level1_students, level2_students, level3_students][active_tab]
-                                for i, student in enumerate(students):
-                                    minutes = student["time"] // 60
-                                    seconds = student["time"] % 60
-                                    time_str = f"{minutes}:{seconds:02d}"
-                                    f.write(
-                                        f"{i + 1}. {student['name']} - Score: {student['score']}, Time: {time_str}\n")
+                                for student in students:
+                                    f.write(f"{student['rank']}. {student['player_name']} - Score: {student['score']}, "
+                                            f"Time: {format_time(student['time'])}\n")
 
                             # Visual feedback for successful export
                             print(f"Rankings exported to {export_path}")
 
+                            # Export every recorded game session alongside, without blocking the screen
+                            if session_export is None or session_export.finished:
+                                sessions_path = os.path.join(desktop_path, "skillscape_sessions.csv")
+                                session_export = SessionExport(sessions_path).start()
+
                             # Create a temporary notification
                             export_notification = True
                             export_notification_time = pygame.time.get_ticks()
@@ -304,6 +310,14 @@ def show_teacher_rankings():
                         # Toggle info popup
                         show_info_popup = not show_info_popup
 
+                    if game_button.is_clicked(mouse_pos):
+                        game_index = (game_index + 1) % len(game_options)
+                        page = 0
+
+                    if period_button.is_clicked(mouse_pos):
+                        period_index = (period_index + 1) % len(RANKINGS_PERIODS)
+                        page = 0
+
                     # Check tab clicks
                     for i, tab in enumerate(tabs):
                         if tab.is_clicked(mouse_pos):
@@ -313,24 +327,49 @@ def show_teacher_rankings():
                             # Activate clicked tab
                             tab.active = True
                             active_tab = i
+                            page = 0
+
+            # Page through the rankings
+            if event.type == pygame.MOUSEWHEEL:
+                page -= event.y
+            if event.type == pygame.KEYDOWN and not show_info_popup:
+                if event.key in (pygame.K_PAGEDOWN, pygame.K_DOWN):
+                    page += 1
+                elif event.key in (pygame.K_PAGEUP, pygame.K_UP):
+                    page -= 1
 
             # Close info popup on any key press
             if event.type == pygame.KEYDOWN and show_info_popup:
                 show_info_popup = False
 
+        # Rankings of the selected level and game, new sessions included as they are saved
+        level = active_tab + 1
+        game = game_options[game_index]
+        period = RANKINGS_PERIODS[period_index]
+        if period is None:
+            page_count = max(1, -(-rankings.count(level, game) // RANKINGS_ROWS))
+            page = max(0, min(page, page_count - 1))
+            students_list = rankings.get_page(level, game, page * RANKINGS_ROWS, RANKINGS_ROWS)
+        else:
+            # The top rows only, kept up to date from the leaderboard's changes
+            page_count = 1
+            page = 0
+            board = get_rolling_leaderboard(period, game, level, RANKINGS_ROWS)
+            if board is not shown_board:
+                shown_board = board
+                board_rows = [None] * RANKINGS_ROWS
+                board_version = 0
+            board_version, changes = board.get_changes(board_version)
+            for position, student in changes.items():
+                board_rows[position] = student
+            students_list = [student for student in board_rows if student is not None]
+
         # Draw the background
         if background_img:
             screen.blit(background_img, (0, 0))
         else:
             # Gradient background as fallback
-            for y in range(SCREEN_HEIGHT):
-                # Create a gradient from dark blue to light blue
-                color = (
-                    int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                    int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-                )
-                pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+            screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Draw logo if available
         if logo_img:
@@ -349,7 +388,7 @@ def show_teacher_rankings():
         pygame.draw.rect(screen, BLACK, heading_bar_rect, width=2, border_radius=15)
 
         # Draw rankings text
-        rankings_text = heading_font.render("Student Rankings", True, WHITE)
+        rankings_text = render_text(heading_font, f"{game} Rankings" if game else "Student Rankings", True, WHITE)
         rankings_rect = rankings_text.get_rect(center=(heading_bar_rect.centerx, heading_bar_rect.centery))
         screen.blit(rankings_text, rankings_rect)
 
@@ -357,8 +396,10 @@ def show_teacher_rankings():
         for tab in tabs:
             tab.draw()
 
-        # Draw info button
+        # Draw info, game and period buttons
         info_button.draw()
+        game_button.draw()
+        period_button.draw()
 
         # Draw rankings table
         # Table header
@@ -374,7 +415,7 @@ def show_teacher_rankings():
 
         header_texts = ["Rank", "Student Name", "Score", "Time"]
         for i, text in enumerate(header_texts):
-            text_surf = table_font.render(text, True, WHITE)
+            text_surf = render_text(table_font, text, True, WHITE)
             if i == 0:  # Center rank
                 text_rect = text_surf.get_rect(center=(col_x + col_widths[i] // 2, header_rect.centery))
             elif i == 1:  # Left align name
@@ -385,14 +426,10 @@ def show_teacher_rankings():
             screen.blit(text_surf, text_rect)
             col_x += col_widths[i]
 
-        # Table rows based on active tab
-        students_list = [level1_students, level2_students, level3_students][active_tab]
+        # Table rows of the current page
         row_y = header_rect.bottom
 
         for i, student in enumerate(students_list):
-            if i >= 10:  # Show max 10 rows
-                break
-
             row_rect = pygame.Rect(header_rect.x, row_y, table_width, table_height)
 
             # Alternate row colors
@@ -407,32 +444,30 @@ def show_teacher_rankings():
             col_x = row_rect.x
 
             # Rank column with medal for top 3
-            rank_text = table_font.render(str(i + 1), True, BLACK)
+            rank_text = render_text(table_font, str(student["rank"]), True, BLACK)
             rank_rect = rank_text.get_rect(center=(col_x + col_widths[0] // 2, row_rect.centery))
             screen.blit(rank_text, rank_rect)
 
             # Draw medal if top 3
-            if i < 3:
-                draw_medal(i + 1, col_x + 10, row_rect.y + 5)
+            if student["rank"] <= 3:
+                draw_medal(student["rank"], col_x + 10, row_rect.y + 5)
 
             col_x += col_widths[0]
 
             # Name column
-            name_text = table_font.render(student["name"], True, BLACK)
+            name_text = render_text(table_font, student["player_name"], True, BLACK)
             name_rect = name_text.get_rect(midleft=(col_x + 10, row_rect.centery))
             screen.blit(name_text, name_rect)
             col_x += col_widths[1]
 
             # Score column
-            score_text = table_font.render(str(student["score"]), True, BLACK)
+            score_text = render_text(table_font, str(student["score"]), True, BLACK)
             score_rect = score_text.get_rect(center=(col_x + col_widths[2] // 2, row_rect.centery))
             screen.blit(score_text, score_rect)
             col_x += col_widths[2]
 
             # Time column (formatted as mm:ss)
-            minutes = student["time"] // 60
-            seconds = student["time"] % 60
-            time_text = table_font.render(f"{minutes}:{seconds:02d}", True, BLACK)
+            time_text = render_text(table_font, format_time(student["time"]), True, BLACK)
             time_rect = time_text.get_rect(center=(col_x + col_widths[3] // 2, row_rect.centery))
             screen.blit(time_text, time_rect)
 
@@ -440,23 +475,27 @@ def show_teacher_rankings():
 
         # Draw note if there are no students for this level
         if len(students_list) == 0:
-            no_data_text = text_font.render("No rankings data available for this level", True, WHITE)
+            no_data_text = render_text(text_font, "No rankings data available for this level", True, WHITE)
             no_data_rect = no_data_text.get_rect(center=(SCREEN_WIDTH // 2, 300))
             screen.blit(no_data_text, no_data_rect)
 
         # Draw notes at bottom for teachers in an attractive box - made smaller
-        note_box = pygame.Rect(SCREEN_WIDTH // 2 - 350, row_y + 10, 700, 50)  # Reduced height, moved up
+        note_box = pygame.Rect(SCREEN_WIDTH // 2 - 350, max(row_y, 320) + 10, 700, 50)  # Below the no data note
         pygame.draw.rect(screen, DARK_BLUE, note_box, border_radius=10, width=0)
         pygame.draw.rect(screen, BLACK, note_box, border_radius=10, width=2)
 
-        note_text = small_font.render("Rankings are based on highest score. Time is used as a tiebreaker.", True, WHITE)
+        note_text = render_text(small_font, "Rankings are based on highest score. Time is used as a tiebreaker.", True, WHITE)
         note_rect = note_text.get_rect(midleft=(note_box.left + 20, note_box.centery - 10))  # Left-aligned
         screen.blit(note_text, note_rect)
 
-        teacher_note = small_font.render("Use the 'Export' button to save rankings to desktop.", True, YELLOW)
+        teacher_note = render_text(small_font, "Use the 'Export' button to save rankings to desktop.", True, YELLOW)
         teacher_note_rect = teacher_note.get_rect(midleft=(note_box.left + 20, note_box.centery + 10))  # Left-aligned
         screen.blit(teacher_note, teacher_note_rect)
 
+        page_label = f"Page {page + 1}/{page_count}" if period is None else PERIOD_LABELS[period]
+        page_note = render_text(small_font, page_label, True, WHITE)
+        screen.blit(page_note, page_note.get_rect(midright=(note_box.right - 20, note_box.centery)))
+
         # Draw back and export buttons
         back_button.draw()
         export_button.draw()
@@ -464,7 +503,8 @@ def show_teacher_rankings():
         # Display export notification if active
         if export_notification:
             current_time = pygame.time.get_ticks()
-            if current_time - export_notification_time < NOTIFICATION_DURATION:
+            exporting = session_export is not None and session_export.running
+            if exporting or current_time - export_notification_time < NOTIFICATION_DURATION:
                 # Create notification with shadow
                 notify_width = 300
                 notify_height = 60
@@ -483,12 +523,18 @@ def show_teacher_rankings():
                 pygame.draw.rect(screen, BLACK, notify_rect, width=2, border_radius=10)
 
                 # Text
-                notify_text = text_font.render("Rankings Exported!", True, WHITE)
+                notify_text = render_text(text_font, "Rankings Exported!", True, WHITE)
                 notify_rect_text = notify_text.get_rect(center=(notify_rect.centerx, notify_rect.centery - 10))
                 screen.blit(notify_text, notify_rect_text)
 
                 # Subtext
-                sub_text = small_font.render("File saved to desktop", True, WHITE)
+                if exporting:
+                    sub_label = f"Exporting sessions... {session_export.progress():.0%}"
+                elif session_export is not None and session_export.error is not None:
+                    sub_label = "Session export failed"
+                else:
+                    sub_label = "File saved to desktop"
+                sub_text = render_text(small_font, sub_label, True, WHITE)
                 sub_rect = sub_text.get_rect(center=(notify_rect.centerx, notify_rect.centery + 15))
                 screen.blit(sub_text, sub_rect)
             else:
@@ -519,7 +565,7 @@ def show_teacher_rankings():
             pygame.draw.rect(screen, BLACK, popup_rect, width=2, border_radius=15)
 
             # Popup title
-            popup_title = heading_font.render("Rankings Information", True, BLUE)
+            popup_title = render_text(heading_font, "Rankings Information", True, BLUE)
             popup_title_rect = popup_title.get_rect(center=(popup_rect.centerx, popup_rect.top + 30))
             screen.blit(popup_title, popup_title_rect)
 
@@ -532,25 +578,25 @@ def show_teacher_rankings():
             explanation_lines = [
                 "Rankings are based on the highest score achieved by each student.",
                 "Time is used as a tiebreaker when students have the same score.",
-                "Students are automatically sorted across all three difficulty levels.",
+                "Use 'Game' and 'Period' to rank one game or recent days; scroll for more.",
                 "The 'Export' button allows you to save these rankings as a text file.",
                 "Use this data to track student progress and identify learning trends."
             ]
 
             # Display explanation text
             for i, line in enumerate(explanation_lines):
-                line_text = small_font.render(line, True, BLACK)
+                line_text = render_text(small_font, line, True, BLACK)
                 y_pos = popup_rect.top + 90 + i * 25
                 line_rect = line_text.get_rect(midleft=(popup_rect.left + 30, y_pos))
                 screen.blit(line_text, line_rect)
 
             # Close instruction
-            close_text = small_font.render("Press any key to close this window", True, DARK_GRAY)
+            close_text = render_text(small_font, "Press any key to close this window", True, DARK_GRAY)
             close_rect = close_text.get_rect(center=(popup_rect.centerx, popup_rect.bottom - 20))
             screen.blit(close_text, close_rect)
 
         pygame.display.flip()
-        clock.tick(60)
+        frames.tick()
 
     # Stop music and quit if window is closed
     if music_loaded:
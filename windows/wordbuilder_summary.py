@@ -1,6 +1,12 @@
 import pygame
 import sys
 import os
+from scene_router import navigate
+from session_context import get_session
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
+from dirty_rects import DirtyRenderer
 
 # Constants
 SCREEN_WIDTH = 800
@@ -48,9 +54,9 @@ def show_summary(screen, game_data):
         pygame.mixer.music.play(-1)  # -1 means loop indefinitely
 
     # Prepare fonts
-    big_font = pygame.font.SysFont('Arial', 48, bold=True)
-    medium_font = pygame.font.SysFont('Arial', 32)
-    font = pygame.font.SysFont('Arial', 24)
+    big_font = get_font('Arial', 48, bold=True)
+    medium_font = get_font('Arial', 32)
+    font = get_font('Arial', 24)
 
     # Calculate star rating based on score
     if game_data['score'] >= 50:
@@ -87,10 +93,13 @@ def show_summary(screen, game_data):
     # Main loop for the summary screen
     summary_running = True
     action = None
+    frames = FrameScheduler()
+    renderer = DirtyRenderer(screen)
 
     while summary_running:
         # Handle events
         for event in pygame.event.get():
+            renderer.handle_event(event)
             if event.type == pygame.QUIT:
                 return "quit"
             # Check for button clicks
@@ -106,22 +115,18 @@ def show_summary(screen, game_data):
                         # Simply run next game and quit
                         if music_loaded:
                             pygame.mixer.music.stop()
-                        pygame.quit()
-                        os.system(f"{sys.executable} englishpro_instructions.py")
+                        navigate("englishpro_instructions.py")
                         sys.exit()
 
+        if not renderer.begin_frame():
+            frames.tick()
+            continue
+
         # Draw background with gradient
-        for y in range(SCREEN_HEIGHT):
-            # Create a gradient from dark blue to light blue
-            color = (
-                int(DARK_BLUE[0] + (LIGHT_BLUE[0] - DARK_BLUE[0]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[1] + (LIGHT_BLUE[1] - DARK_BLUE[1]) * y / SCREEN_HEIGHT),
-                int(DARK_BLUE[2] + (LIGHT_BLUE[2] - DARK_BLUE[2]) * y / SCREEN_HEIGHT)
-            )
-            pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+        screen.blit(get_gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (DARK_BLUE, LIGHT_BLUE)), (0, 0))
 
         # Title
-        title_text = big_font.render("Word Builder Complete!", True, WHITE)
+        title_text = render_text(big_font, "Word Builder Complete!", True, WHITE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 70))
 
         # Add a fancy box around the title
@@ -137,7 +142,7 @@ def show_summary(screen, game_data):
         screen.blit(title_text, title_rect)
 
         # Performance message
-        performance_text = medium_font.render(performance_msg, True, WHITE)
+        performance_text = render_text(medium_font, performance_msg, True, WHITE)
         screen.blit(performance_text,
                     (SCREEN_WIDTH // 2 - performance_text.get_width() // 2, 130))
 
@@ -177,7 +182,7 @@ def show_summary(screen, game_data):
         pygame.draw.rect(screen, BLACK, summary_box, width=2, border_radius=10)
 
         # Summary heading
-        summary_heading = medium_font.render("Game Summary", True, BLACK)
+        summary_heading = render_text(medium_font, "Game Summary", True, BLACK)
         screen.blit(summary_heading,
                     (SCREEN_WIDTH // 2 - summary_heading.get_width() // 2, 240))
 
@@ -190,28 +195,28 @@ def show_summary(screen, game_data):
         y_pos = 300
 
         # Final score
-        final_score_text = font.render(f"Final Score: {game_data['score']}", True, BLACK)
+        final_score_text = render_text(font, f"Final Score: {game_data['score']}", True, BLACK)
         screen.blit(final_score_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Words solved
-        words_text = font.render(f"Words Solved: {game_data['words_solved']}", True, BLACK)
+        words_text = render_text(font, f"Words Solved: {game_data['words_solved']}", True, BLACK)
         screen.blit(words_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Hints used
-        hints_text = font.render(f"Hints Used: {'Yes' if game_data['hints_used'] else 'No'}", True, BLACK)
+        hints_text = render_text(font, f"Hints Used: {'Yes' if game_data['hints_used'] else 'No'}", True, BLACK)
         screen.blit(hints_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Time taken
-        time_text = font.render(f"Time Played: {game_data['time']} seconds", True, BLACK)
+        time_text = render_text(font, f"Time Played: {game_data['time']} seconds", True, BLACK)
         screen.blit(time_text, (summary_box.left + 30, y_pos))
         y_pos += line_height
 
         # Bonus info
         if 'bonus' in game_data:
-            bonus_text = font.render(f"Bonus Points: {game_data['bonus']}", True, BLACK)
+            bonus_text = render_text(font, f"Bonus Points: {game_data['bonus']}", True, BLACK)
             screen.blit(bonus_text, (summary_box.left + 30, y_pos))
             y_pos += line_height
 
@@ -221,12 +226,12 @@ def show_summary(screen, game_data):
         pygame.draw.rect(screen, GREEN, continue_rect, border_radius=10)
         pygame.draw.rect(screen, BLACK, continue_rect, width=2, border_radius=10)
 
-        continue_text = font.render("Continue", True, BLACK)
+        continue_text = render_text(font, "Continue", True, BLACK)
         continue_text_rect = continue_text.get_rect(center=continue_rect.center)
         screen.blit(continue_text, continue_text_rect)
 
-        pygame.display.flip()
-        pygame.time.Clock().tick(60)
+        renderer.present()
+        frames.tick()
 
     return action
 
@@ -238,6 +243,8 @@ def save_game_data(game_data):
     Parameters:
     game_data (dict): Dictionary containing game statistics
     """
+    get_session().record_result("Word Builder", game_data)
+
     try:
         # Create a more detailed data file for the final summary to use
         with open("word_builder_data.txt", "w") as f:
@@ -1,7 +1,10 @@
 import pygame
 import random
 import sys
-import os
+from scene_router import navigate
+from background_cache import get_gradient
+from text_cache import get_font, render_text
+from frame_scheduler import FrameScheduler
 
 # Initialize pygame
 pygame.init()
@@ -27,20 +30,12 @@ COLORS = {
 # Game setup
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Word Builder Game - Level 3")
-font = pygame.font.SysFont('Arial', 36)
-small_font = pygame.font.SysFont("Arial", 24, bold=True)
-clock = pygame.time.Clock()
+font = get_font('Arial', 36)
+small_font = get_font("Arial", 24, bold=True)
+frames = FrameScheduler(30)
 
 # Background - Create a gradient background similar to your other games
-background_img = pygame.Surface((WIDTH, HEIGHT))
-for y in range(HEIGHT):
-    # Create a gradient from dark blue to light blue
-    color = (
-        int(COLORS["dark_blue"][0] + (COLORS["light_blue"][0] - COLORS["dark_blue"][0]) * y / HEIGHT),
-        int(COLORS["dark_blue"][1] + (COLORS["light_blue"][1] - COLORS["dark_blue"][1]) * y / HEIGHT),
-        int(COLORS["dark_blue"][2] + (COLORS["light_blue"][2] - COLORS["dark_blue"][2]) * y / HEIGHT)
-    )
-    pygame.draw.line(background_img, color, (0, y), (WIDTH, y))
+background_img = get_gradient((WIDTH, HEIGHT), (COLORS["dark_blue"], COLORS["light_blue"]))
 
 
 # Sound setup
@@ -362,7 +357,7 @@ class GameUI:
         pygame.draw.rect(screen, color, rect, border_radius=10)
         pygame.draw.rect(screen, COLORS["black"], rect, width=2, border_radius=10)
 
-        text_surf = small_font.render(text, True, text_color)
+        text_surf = render_text(small_font, text, True, text_color)
         text_x = rect.x + (rect.width - text_surf.get_width()) // 2
         text_y = rect.y + (rect.height - text_surf.get_height()) // 2
         screen.blit(text_surf, (text_x, text_y))
@@ -370,7 +365,7 @@ class GameUI:
     def draw_letters(self, letters, positions):
         # """Draw letter boxes on screen"""
         for i, letter in enumerate(letters):
-            text = font.render(letter.upper(), True, COLORS["white"])
+            text = render_text(font, letter.upper(), True, COLORS["white"])
             rect = text.get_rect(center=positions[i])
 
             # Draw a rounded rectangle for the letter background
@@ -404,21 +399,21 @@ class GameUI:
         time_box = pygame.Rect(10, 70, 180, 40)
         pygame.draw.rect(screen, (0, 0, 100, 180), time_box, border_radius=10)
         pygame.draw.rect(screen, COLORS["black"], time_box, width=2, border_radius=10)
-        time_text = small_font.render(f"Time Left: {self.game.get_time_left()}s", True, COLORS["white"])
+        time_text = render_text(small_font, f"Time Left: {self.game.get_time_left()}s", True, COLORS["white"])
         screen.blit(time_text, (time_box.x + 10, time_box.y + 10))
 
         # Category box
         cat_box = pygame.Rect(10, 10, 300, 40)
         pygame.draw.rect(screen, (0, 0, 100, 180), cat_box, border_radius=10)
         pygame.draw.rect(screen, COLORS["black"], cat_box, width=2, border_radius=10)
-        cat_text = small_font.render(f"Category: {self.game.selected_category}", True, COLORS["white"])
+        cat_text = render_text(small_font, f"Category: {self.game.selected_category}", True, COLORS["white"])
         screen.blit(cat_text, (cat_box.x + 10, cat_box.y + 10))
 
         # Score box
         score_box = pygame.Rect(320, 10, 300, 40)
         pygame.draw.rect(screen, (0, 0, 100, 180), score_box, border_radius=10)
         pygame.draw.rect(screen, COLORS["black"], score_box, width=2, border_radius=10)
-        score_text = small_font.render(f"Score: {self.game.score} | Words: {self.game.words_solved}", True,
+        score_text = render_text(small_font, f"Score: {self.game.score} | Words: {self.game.words_solved}", True,
                                        COLORS["white"])
         screen.blit(score_text, (score_box.x + 10, score_box.y + 10))
 
@@ -431,7 +426,7 @@ class GameUI:
         self.draw_letters(self.game.shuffled_letters, self.game.letter_positions)
 
         # Draw selected letters
-        selected_text = font.render(''.join(self.game.selected_letters).upper(), True, COLORS["black"])
+        selected_text = render_text(font, ''.join(self.game.selected_letters).upper(), True, COLORS["black"])
         screen.blit(selected_text, (WIDTH // 2 - selected_text.get_width() // 2, HEIGHT // 4))
 
         # Draw buttons
@@ -441,7 +436,7 @@ class GameUI:
         # Draw hint if showing
         if self.game.showing_hint:
             hint_text = f"Hint: {HINTS.get(self.game.current_word, 'No hint available.')}"
-            hint_render = small_font.render(hint_text, True, COLORS["black"])
+            hint_render = render_text(small_font, hint_text, True, COLORS["black"])
 
             # Create a background for the hint box - styled like your other game elements
             hint_box_width = hint_render.get_width() + 20
@@ -465,7 +460,7 @@ class GameUI:
         screen.blit(background_img, (0, 0))
 
         # Create a fancy box for the game over message
-        message_text = font.render(message, True, COLORS["red"])
+        message_text = render_text(font, message, True, COLORS["red"])
         message_rect = message_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 30))
 
         # Draw a gold box around the message
@@ -485,7 +480,7 @@ class GameUI:
         self.draw_button(continue_button, COLORS["green"], "Continue", COLORS["white"])
 
         # Add message about continuing
-        next_game_text = small_font.render("Continue to summary", True, COLORS["white"])
+        next_game_text = render_text(small_font, "Continue to summary", True, COLORS["white"])
         screen.blit(next_game_text, (WIDTH // 2 - next_game_text.get_width() // 2, HEIGHT // 2 + 120))
 
         # Play game over sound
@@ -515,6 +510,7 @@ class GameUI:
         # Wait for continue button click
         waiting = True
         while waiting:
+            frames.tick()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
@@ -522,8 +518,7 @@ class GameUI:
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if continue_button.collidepoint(event.pos):
                         # Launch summary screen
-                        pygame.quit()
-                        os.system(f"{sys.executable} wordbuilder_summary.py")
+                        navigate("wordbuilder_summary.py")
                         sys.exit()
 
 
@@ -545,6 +540,7 @@ def main():
         game.update_distractions()
 
         # Draw game screen
+        frames.mark_draw()
         ui.draw_game_screen()
 
         # Check if time's up
@@ -580,16 +576,16 @@ def main():
 
                         # Show correct message
                         screen.blit(background_img, (0, 0))
-                        cat_text = small_font.render(f"Category: {game.selected_category}", True, COLORS["white"])
-                        score_text = small_font.render(f"Score: {game.score} | Words Solved: {game.words_solved}", True,
+                        cat_text = render_text(small_font, f"Category: {game.selected_category}", True, COLORS["white"])
+                        score_text = render_text(small_font, f"Score: {game.score} | Words Solved: {game.words_solved}", True,
                                                        COLORS["white"])
                         screen.blit(cat_text, (10, 10))
                         screen.blit(score_text, (10, 40))
 
-                        selected_text = font.render(''.join(game.selected_letters).upper(), True, COLORS["black"])
+                        selected_text = render_text(font, ''.join(game.selected_letters).upper(), True, COLORS["black"])
                         screen.blit(selected_text, (WIDTH // 2 - selected_text.get_width() // 2, HEIGHT // 4))
 
-                        correct_text = font.render("Correct!", True, COLORS["green"])
+                        correct_text = render_text(font, "Correct!", True, COLORS["green"])
                         screen.blit(correct_text, (WIDTH // 2 - correct_text.get_width() // 2, HEIGHT // 2))
 
                         pygame.display.flip()
@@ -631,7 +627,8 @@ def main():
                     sound_manager.toggle_music()
 
         pygame.display.flip()
-        clock.tick(30)
+        # Distractions move every frame
+        frames.tick(animating=bool(game.distractions))
 
     # Clean up and prepare for the next game
     if sound_manager.music_playing: